@@ -2,6 +2,12 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# streamlit puts dashboard/ on the path; add the repo root for src/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage import load_frame
 
 st.set_page_config(
     page_title="Quant Portfolio Optimization Dashboard",
@@ -25,6 +31,14 @@ def load_csv(filename):
         return None
 
 
+def load_dataset(name):
+    # Typed Parquet (or CSV fallback) written through src.storage
+    try:
+        return load_frame(name, base_dir=DATA_PATH).reset_index()
+    except FileNotFoundError:
+        return None
+
+
 # -------------------------------------------------
 # Portfolio Weights Section
 # -------------------------------------------------
@@ -103,13 +117,10 @@ st.markdown("---")
 # -------------------------------------------------
 st.header("📊 Backtest Cumulative Performance")
 
-cumulative = load_csv("backtest_cumulative.csv")
+cumulative = load_dataset("backtest_cumulative")
 
 if cumulative is not None:
 
-    if "Date" in cumulative.columns:
-        cumulative["Date"] = pd.to_datetime(cumulative["Date"])
-
     fig2, ax2 = plt.subplots()
 
     for col in cumulative.columns:
@@ -134,26 +145,30 @@ st.markdown("---")
 # -------------------------------------------------
 st.header("🔮 Forecast Results")
 
-lstm = load_csv("tsla_lstm_forecast.csv")
-arima = load_csv("tsla_arima_forecast.csv")
+lstm = load_csv("tsla_lstm_forecast_with_intervals.csv")
+arima = load_csv("tsla_arima_forecast_with_intervals.csv")
 
 if lstm is not None or arima is not None:
 
     fig3, ax3 = plt.subplots()
 
     if lstm is not None:
-        if "Date" in lstm.columns:
-            lstm["Date"] = pd.to_datetime(lstm["Date"])
-            ax3.plot(lstm["Date"], lstm["Forecast"], label="LSTM Forecast")
-        else:
-            ax3.plot(lstm["Forecast"], label="LSTM Forecast")
+        ax3.plot(lstm["forecast"], label="LSTM Forecast")
 
     if arima is not None:
-        if "Date" in arima.columns:
-            arima["Date"] = pd.to_datetime(arima["Date"])
-            ax3.plot(arima["Date"], arima["Forecast"], label="ARIMA Forecast")
-        else:
-            ax3.plot(arima["Forecast"], label="ARIMA Forecast")
+        ax3.plot(arima["forecast"], label="ARIMA Forecast")
+
+        # Fan chart bands written by run_forecasting (lower_<pct>/upper_<pct>)
+        for col in arima.columns:
+            if col.startswith("lower_") and col != "lower_bound":
+                level = col[len("lower_"):]
+                ax3.fill_between(
+                    arima.index,
+                    arima[col],
+                    arima[f"upper_{level}"],
+                    color="tab:orange",
+                    alpha=0.15
+                )
 
     ax3.set_title("Forecast Comparison")
     ax3.legend()
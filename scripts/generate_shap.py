@@ -3,10 +3,10 @@
 import os
 import shap
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import tensorflow as tf
 
+from src.storage import load_frame
 from src.train_lstm import prepare_data
 
 
@@ -14,7 +14,6 @@ from src.train_lstm import prepare_data
 # Configuration
 # ============================================================
 
-DATA_PATH = "data/processed/historical_prices.csv"
 MODEL_PATH = "models/lstm_model.h5"
 OUTPUT_DIR = "reports/figures"
 WINDOW_SIZE = 60  # CHANGED: Match the model's expected input shape
@@ -34,14 +33,10 @@ print("=" * 60)
 
 print("\n1. Loading historical price data...")
 
-df = pd.read_csv(
-    DATA_PATH,
-    parse_dates=["Date"],
-    index_col="Date"
-)
+df = load_frame("historical_prices")
 
 if "TSLA" not in df.columns:
-    raise ValueError("TSLA column not found in historical_prices.csv")
+    raise ValueError("TSLA column not found in historical_prices")
 
 # Use RETURNS (professional finance practice)
 series = df["TSLA"].pct_change().dropna()
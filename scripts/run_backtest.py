@@ -1,14 +1,12 @@
 import pandas as pd
 from src.backtest import backtest
+from src.reporting import BacktestReporter
+from src.storage import load_frame, save_frame
 
 # --------------------------------------------------
 # Load returns
 # --------------------------------------------------
-returns = pd.read_csv(
-    "data/processed/daily_returns.csv",
-    index_col="Date",
-    parse_dates=True
-)
+returns = load_frame("daily_returns")
 
 # --------------------------------------------------
 # Load portfolio weights from file (production-safe)
@@ -33,31 +31,36 @@ weights_benchmark = {
 # --------------------------------------------------
 # Run backtest using src module
 # --------------------------------------------------
+# CSVs and the figure are written on a background thread
+reporter = BacktestReporter(mode="background")
+
 results = backtest(
     returns=returns,
     weights=weights_strategy,
     benchmark_weights=weights_benchmark,
     transaction_cost=0.001,
-    save_results=True
+    save_results=True,
+    rebalance="monthly",
+    reporter=reporter
 )
 
 # --------------------------------------------------
 # Save combined cumulative file for dashboard
 # --------------------------------------------------
 cumulative_df = pd.DataFrame({
-    "Date": results["strategy_cumulative"].index,
-    "Strategy": results["strategy_cumulative"].values,
-    "Benchmark": results["benchmark_cumulative"].values
+    "Strategy": results["strategy_cumulative"],
+    "Benchmark": results["benchmark_cumulative"]
 })
 
-cumulative_df.to_csv(
-    "data/processed/backtest_cumulative.csv",
-    index=False
-)
+cumulative_df.index.name = "Date"
+
+save_frame(cumulative_df, "backtest_cumulative")
+
+reporter.close()
 
 print("Backtest complete.")
 print("Files saved:")
 print("data/processed/backtest_strategy.csv")
 print("data/processed/backtest_benchmark.csv")
-print("data/processed/backtest_cumulative.csv")
+print("data/processed/backtest_cumulative.parquet")
 print("reports/figures/backtest_cumulative.png")
@@ -1,29 +1,28 @@
-from src.data_loader import download_price_data
+from src.price_store import PriceStore
 from src.preprocessing import clean_price_data, compute_returns
-from src.risk_metrics import compute_risk_metrics
+from src.storage import save_frame
 
 
 def run():
 
     tickers = ["TSLA", "BND", "SPY"]
 
-    data = download_price_data(
-        tickers,
-        "2015-01-01",
-        "2026-01-15"
-    )
+    start, end = "2015-01-01", "2026-01-15"
 
-    clean_data = clean_price_data(data)
+    # Only dates missing from the local store are downloaded
+    store = PriceStore("data/prices.sqlite")
 
-    returns = compute_returns(clean_data)
+    store.update(tickers, start, end)
 
-    metrics = compute_risk_metrics(returns)
+    data = store.load(tickers, start, end)
 
-    clean_data.to_csv("data/processed/historical_prices.csv")
+    clean_data = clean_price_data(data)
+
+    returns = compute_returns(clean_data)
 
-    returns.to_csv("data/processed/daily_returns.csv")
+    save_frame(clean_data, "historical_prices")
 
-    metrics.to_csv("data/processed/risk_metrics.csv")
+    save_frame(returns, "daily_returns")
 
     print("Pipeline complete.")
 
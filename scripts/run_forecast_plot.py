@@ -2,15 +2,14 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import os
 
+from src.storage import load_frame
+
 # Load historical data
-tsla = pd.read_csv("data/processed/historical_prices.csv")
+tsla = load_frame("historical_prices", columns=["TSLA"])
 
 # Load ARIMA forecast
 arima = pd.read_csv("data/processed/tsla_arima_forecast_with_intervals.csv")
 
-# Convert Date column to datetime
-tsla["Date"] = pd.to_datetime(tsla["Date"])
-
 # Create forecast index
 forecast_index = range(len(tsla), len(tsla) + len(arima))
 
@@ -36,16 +35,38 @@ plt.plot(
     color="blue"
 )
 
-# Confidence intervals
-plt.fill_between(
-    forecast_index,
-    arima["lower_bound"],
-    arima["upper_bound"],
-    color="blue",
-    alpha=0.2,
-    label="Confidence Interval"
+# Confidence intervals: one shaded band per fan chart level when
+# available, widest first so the narrower bands stack on top
+fan_levels = sorted(
+    (col[len("lower_"):] for col in arima.columns
+     if col.startswith("lower_") and col != "lower_bound"),
+    key=float,
+    reverse=True
 )
 
+if fan_levels:
+
+    for level in fan_levels:
+        plt.fill_between(
+            forecast_index,
+            arima[f"lower_{level}"],
+            arima[f"upper_{level}"],
+            color="blue",
+            alpha=0.15,
+            label=f"{level}% Interval"
+        )
+
+else:
+
+    plt.fill_between(
+        forecast_index,
+        arima["lower_bound"],
+        arima["upper_bound"],
+        color="blue",
+        alpha=0.2,
+        label="Confidence Interval"
+    )
+
 # Labels
 plt.title("TSLA Price Forecast with Confidence Intervals")
 plt.xlabel("Time Step")
@@ -1,6 +1,14 @@
+import os
 import pandas as pd
 from src.data_loader import load_data, get_tsla_close
-from src.arima_forecaster import train_arima, forecast_arima_with_intervals
+from src.arima_forecaster import (
+    train_arima,
+    load_arima,
+    update_arima,
+    forecast_arima_with_intervals,
+    FAN_LEVELS
+)
+from src.train_arima import save_arima
 
 from sklearn.preprocessing import MinMaxScaler
 from src.lstm_forecaster import bootstrap_lstm_forecast
@@ -16,11 +24,45 @@ tsla = get_tsla_close(df)
 
 print("Running ARIMA forecast...")
 
-arima_model = train_arima(tsla)
+ARIMA_MODEL_PATH = "models/arima_model.pkl"
+
+# The rolled-forward model is kept apart from the trained one, so the
+# trained model stays what run_train_models wrote; a retrained model
+# (newer than the rolled one) restarts the roll from it
+ROLLED_MODEL_PATH = "models/arima_model_rolled.pkl"
+
+if os.path.exists(ROLLED_MODEL_PATH) and (
+    not os.path.exists(ARIMA_MODEL_PATH)
+    or os.path.getmtime(ROLLED_MODEL_PATH) >= os.path.getmtime(ARIMA_MODEL_PATH)
+):
+    base_model_path = ROLLED_MODEL_PATH
+
+elif os.path.exists(ARIMA_MODEL_PATH):
+    base_model_path = ARIMA_MODEL_PATH
+
+else:
+    base_model_path = None
+
+if base_model_path is not None:
+
+    # Roll the persisted model forward; parameters are re-estimated
+    # only once a month of new bars has accumulated
+    arima_model = update_arima(
+        load_arima(base_model_path),
+        tsla,
+        refit_every=21
+    )
+
+else:
+
+    arima_model = train_arima(tsla)
+
+save_arima(arima_model, ROLLED_MODEL_PATH)
 
 arima_forecast = forecast_arima_with_intervals(
     arima_model,
-    steps=252
+    steps=252,
+    levels=FAN_LEVELS
 )
 
 arima_forecast.to_csv(
@@ -47,8 +89,10 @@ lstm_forecast = bootstrap_lstm_forecast(
     model_path="models/lstm_tsla_model.h5",
     scaled_data=scaled_data,
     scaler=scaler,
-    steps=126,
-    n_simulations=20
+    steps=252,
+    n_simulations=1000,
+    batched=True,
+    random_state=42
 )
 
 lstm_forecast.to_csv(
@@ -0,0 +1,160 @@
+import argparse
+
+from src.pipeline import Pipeline, Stage
+
+
+PROCESSED = "data/processed"
+
+PRICES = f"{PROCESSED}/historical_prices.parquet"
+RETURNS = f"{PROCESSED}/daily_returns.parquet"
+WEIGHTS = f"{PROCESSED}/portfolio_weights.csv"
+
+FIGURES = "reports/figures"
+
+
+# --------------------------------------------------
+# Stages: each script with the files it reads and writes
+# --------------------------------------------------
+STAGES = [
+
+    # Downloads new prices, so it runs every time; stages below it are
+    # skipped when the processed datasets come out unchanged
+    Stage(
+        "data",
+        "scripts.run_data_pipeline",
+        outputs=[PRICES, RETURNS],
+        always_run=True
+    ),
+
+    Stage(
+        "train_models",
+        "scripts.run_train_models",
+        inputs=[PRICES],
+        outputs=[
+            "models/arima_model.pkl",
+            "models/lstm_model.h5",
+            "models/lstm_model_scaler.pkl",
+            "models/lstm_model_info.pkl"
+        ]
+    ),
+
+    # Also reads its own rolled ARIMA model from the previous run; it is
+    # not an input, or every run would invalidate the next one
+    Stage(
+        "forecasting",
+        "scripts.run_forecasting",
+        inputs=[PRICES, "models/arima_model.pkl", "models/lstm_tsla_model.h5"],
+        outputs=[
+            "models/arima_model_rolled.pkl",
+            f"{PROCESSED}/tsla_arima_forecast_with_intervals.csv",
+            f"{PROCESSED}/tsla_lstm_forecast_with_intervals.csv"
+        ]
+    ),
+
+    Stage(
+        "shap",
+        "scripts.generate_shap",
+        inputs=[PRICES, "models/lstm_model.h5"],
+        outputs=[
+            f"{FIGURES}/shap_summary.png",
+            f"{FIGURES}/shap_feature_importance.png"
+        ]
+    ),
+
+    Stage(
+        "optimize_portfolio",
+        "scripts.run_optimize_portfolio",
+        outputs=[WEIGHTS]
+    ),
+
+    Stage(
+        "backtest",
+        "scripts.run_backtest",
+        inputs=[RETURNS, WEIGHTS],
+        outputs=[
+            f"{PROCESSED}/backtest_strategy.csv",
+            f"{PROCESSED}/backtest_benchmark.csv",
+            f"{PROCESSED}/backtest_metrics.csv",
+            f"{PROCESSED}/backtest_cumulative.parquet",
+            f"{FIGURES}/backtest_cumulative.png"
+        ]
+    ),
+
+    Stage(
+        "risk_metrics",
+        "scripts.run_risk_metrics",
+        inputs=[RETURNS],
+        outputs=[f"{PROCESSED}/risk_metrics.parquet"]
+    ),
+
+    Stage(
+        "portfolio_risk",
+        "scripts.run_portfolio_risk",
+        inputs=[RETURNS, WEIGHTS],
+        outputs=[f"{PROCESSED}/portfolio_risk.parquet"]
+    ),
+
+    Stage(
+        "simulation",
+        "scripts.run_simulation",
+        inputs=[RETURNS, WEIGHTS],
+        outputs=[f"{PROCESSED}/simulation_quantiles.parquet"]
+    ),
+
+    Stage(
+        "walk_forward",
+        "scripts.run_walk_forward",
+        inputs=[RETURNS],
+        outputs=[
+            f"{PROCESSED}/walk_forward_cumulative.parquet",
+            f"{PROCESSED}/walk_forward_weights.parquet"
+        ]
+    ),
+
+    Stage(
+        "resampled_optimization",
+        "scripts.run_resampled_optimization",
+        inputs=[RETURNS],
+        outputs=[f"{PROCESSED}/portfolio_weights_resampled.csv"]
+    )
+]
+
+
+def run(argv=None):
+
+    # Usage: python -m scripts.run_pipeline [STAGE ...] [--force [STAGE ...]]
+    parser = argparse.ArgumentParser(description="Run the pipeline stages")
+
+    parser.add_argument("targets", nargs="*", help="stages to bring up to date")
+    parser.add_argument("--force", nargs="*", help="rerun these stages (all if empty)")
+    parser.add_argument("--workers", type=int, help="stages run at the same time")
+    parser.add_argument("--dry-run", action="store_true", help="only report")
+
+    args = parser.parse_args(argv)
+
+    if args.force is None:
+        force = False
+    else:
+        force = args.force or True
+
+    pipeline = Pipeline(STAGES)
+
+    status = pipeline.run(
+        targets=args.targets or None,
+        force=force,
+        max_workers=args.workers,
+        dry_run=args.dry_run
+    )
+
+    for name, state in status.items():
+        print(f"{name:<24}{state}")
+
+    for name, error in pipeline.errors.items():
+        print(f"{name} failed: {error}")
+
+    return 1 if pipeline.errors else 0
+
+
+if __name__ == "__main__":
+
+    raise SystemExit(run())
@@ -0,0 +1,30 @@
+import pandas as pd
+from src.portfolio_risk import portfolio_var
+from src.storage import load_frame, save_frame
+
+# --------------------------------------------------
+# Load returns and optimized weights
+# --------------------------------------------------
+returns = load_frame("daily_returns")
+
+weights_df = pd.read_csv("data/processed/portfolio_weights.csv")
+
+weights = dict(zip(weights_df.Asset, weights_df.Weight))
+
+# --------------------------------------------------
+# Portfolio VaR / CVaR by method and confidence level
+# --------------------------------------------------
+risk = portfolio_var(
+    returns,
+    weights,
+    confidence_levels=(0.95, 0.99),
+    n_paths=100_000,
+    random_state=42
+)
+
+risk.index.name = "Method"
+
+save_frame(risk, "portfolio_risk", datetime_index=False)
+
+print(risk)
+print("Portfolio risk saved.")
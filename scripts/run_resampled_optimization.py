@@ -0,0 +1,43 @@
+import pandas as pd
+from src.resampling import resampled_optimize
+from src.storage import load_frame
+
+
+def run():
+
+    # --------------------------------------------------
+    # Load returns
+    # --------------------------------------------------
+    returns = load_frame("daily_returns")
+
+    # --------------------------------------------------
+    # Average max-Sharpe weights over block-bootstrap resamples
+    # --------------------------------------------------
+    result = resampled_optimize(
+        returns,
+        n_resamples=1000,
+        block_size=21,
+        confidence=0.9,
+        random_state=42
+    )
+
+    # --------------------------------------------------
+    # Save weights with their 90% intervals
+    # --------------------------------------------------
+    df = pd.DataFrame({
+        "Asset": result["weights"].index,
+        "Weight": result["weights"].values,
+        "Lower": result["lower"].values,
+        "Upper": result["upper"].values
+    })
+
+    df.to_csv("data/processed/portfolio_weights_resampled.csv", index=False)
+
+    print("Resampled portfolio weights saved.")
+    print(df)
+
+
+# Worker processes are spawned and re-import this module
+if __name__ == "__main__":
+
+    run()
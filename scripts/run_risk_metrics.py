@@ -1,16 +1,10 @@
-import pandas as pd
 from src.risk_metrics import compute_risk_metrics
+from src.storage import load_frame, save_frame
 
-returns = pd.read_csv(
-    "data/processed/daily_returns.csv",
-    index_col="Date",
-    parse_dates=True
-)
+returns = load_frame("daily_returns")
 
 metrics = compute_risk_metrics(returns)
 
-metrics.to_csv(
-    "data/processed/risk_metrics.csv"
-)
+save_frame(metrics, "risk_metrics", datetime_index=False)
 
 print("Risk metrics saved.")
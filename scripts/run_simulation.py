@@ -0,0 +1,47 @@
+import pandas as pd
+from src.simulation import simulate_portfolio
+from src.storage import load_frame, save_frame
+
+
+def run():
+
+    # --------------------------------------------------
+    # Load returns and optimized weights
+    # --------------------------------------------------
+    returns = load_frame("daily_returns")
+
+    weights_df = pd.read_csv("data/processed/portfolio_weights.csv")
+
+    weights = dict(zip(weights_df.Asset, weights_df.Weight))
+
+    # --------------------------------------------------
+    # One-year stationary-bootstrap simulation
+    # --------------------------------------------------
+    result = simulate_portfolio(
+        returns,
+        weights,
+        n_paths=100_000,
+        horizon=252,
+        method="stationary",
+        block_size=21,
+        random_state=42
+    )
+
+    quantiles = pd.DataFrame({
+        "Terminal Wealth": result["terminal_wealth"],
+        "Max Drawdown": result["max_drawdown"]
+    })
+
+    quantiles.index.name = "Quantile"
+
+    save_frame(quantiles, "simulation_quantiles", datetime_index=False)
+
+    print(quantiles)
+    print(result["summary"])
+    print("Simulation quantiles saved.")
+
+
+# Worker processes are spawned and re-import this module
+if __name__ == "__main__":
+
+    run()
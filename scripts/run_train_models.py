@@ -4,7 +4,7 @@ from src.preprocessing import split_time_series
 
 from src.train_arima import train_arima, save_arima
 
-from src.train_lstm import prepare_data, build_model, save_scaler
+from src.train_lstm import prepare_dataset, build_model, save_model_and_info
 
 
 print("Loading data...")
@@ -25,15 +25,27 @@ save_arima(arima)
 
 print("Training LSTM...")
 
-X, y, scaler = prepare_data(train)
+WINDOW_SIZE = 60
 
-save_scaler(scaler)
+dataset, scaler = prepare_dataset(
+    train,
+    window=WINDOW_SIZE,
+    batch_size=64,
+    shuffle_buffer=1024,
+    cache=True,
+    seed=42
+)
 
 lstm = build_model()
 
-lstm.fit(X, y, epochs=10)
+lstm.fit(dataset, epochs=10)
 
-lstm.save("models/lstm_model.h5")
+save_model_and_info(
+    lstm,
+    scaler,
+    window_size=WINDOW_SIZE,
+    filepath="models/lstm_model"
+)
 
 
 print("Training complete.")
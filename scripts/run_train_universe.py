@@ -0,0 +1,44 @@
+import sys
+
+from src.data_loader import load_data
+
+from src.preprocessing import split_time_series
+
+from src.train_universe import train_universe
+
+
+def run():
+
+    # Usage: python -m scripts.run_train_universe [TICKER ...]
+    tickers = sys.argv[1:] or None
+
+
+    print("Loading data...")
+
+    df = load_data()
+
+    train, test = split_time_series(df)
+
+
+    print(f"Training models for {len(tickers or train.columns)} tickers...")
+
+    results = train_universe(
+        train,
+        tickers=tickers,
+        output_dir="models",
+        threads_per_worker=1
+    )
+
+    failed = [t for t, entry in results.items() if entry["status"] != "ok"]
+
+    print("Training complete.")
+    print("Registry saved to models/registry.json")
+
+    if failed:
+        print(f"Failed tickers: {', '.join(failed)}")
+
+
+# Worker processes are spawned and re-import this module
+if __name__ == "__main__":
+
+    run()
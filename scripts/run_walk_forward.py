@@ -0,0 +1,42 @@
+from src.storage import load_frame, save_frame
+from src.walk_forward import walk_forward_backtest
+
+
+def run():
+
+    # --------------------------------------------------
+    # Load returns
+    # --------------------------------------------------
+    returns = load_frame("daily_returns")
+
+    # --------------------------------------------------
+    # Re-optimize on a rolling year, trade the next month
+    # --------------------------------------------------
+    results = walk_forward_backtest(
+        returns,
+        train_window=252,
+        test_window=21,
+        transaction_cost=0.001
+    )
+
+    # --------------------------------------------------
+    # Save out-of-sample results
+    # --------------------------------------------------
+    cumulative = results["strategy_cumulative"].rename("Walk-Forward").to_frame()
+
+    cumulative.index.name = "Date"
+
+    save_frame(cumulative, "walk_forward_cumulative")
+
+    save_frame(results["fold_weights"], "walk_forward_weights")
+
+    print(results["metrics"])
+    print("Files saved:")
+    print("data/processed/walk_forward_cumulative.parquet")
+    print("data/processed/walk_forward_weights.parquet")
+
+
+# Worker processes are spawned and re-import this module
+if __name__ == "__main__":
+
+    run()
@@ -1,30 +1,152 @@
+import pickle
+
+import numpy as np
 import pandas as pd
+from scipy.stats import norm
 from statsmodels.tsa.arima.model import ARIMA
 
+from src.arima_selection import select_arima_order
+
+
+# Confidence levels of the forecast fan chart bands
+FAN_LEVELS = (0.5, 0.8, 0.95, 0.99)
+
 
 def train_arima(series, order=(5,1,0)):
     """
     Train ARIMA model
+
+    order = (p, d, q) or "auto" to select it by AIC grid search
     """
+    if order == "auto":
+        order, _ = select_arima_order(series)
+
     model = ARIMA(series, order=order)
     fitted_model = model.fit()
+    fitted_model.estimated_nobs = fitted_model.nobs
     return fitted_model
 
 
-def forecast_arima_with_intervals(model, steps=252, alpha=0.05):
+def load_arima(path="models/arima_model.pkl"):
+    """
+    Load a fitted ARIMA model saved by train_arima.save_arima
+    """
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def update_arima(model, series, refit_every=21):
+    """
+    Roll a fitted ARIMA model forward to the end of `series`
+
+    series = full history; its first model.nobs points must be the data
+             the model has already seen
+    refit_every = re-estimate parameters once this many observations have
+                  accumulated since the last estimation (None = never)
+
+    New observations are run through the state-space filter with the
+    existing parameters, which costs milliseconds instead of a full MLE fit.
+    """
+    nobs = int(model.nobs)
+
+    if len(series) < nobs:
+        raise ValueError(
+            f"Series has {len(series)} observations, model has seen {nobs}"
+        )
+
+    new_obs = series.iloc[nobs:] if isinstance(series, pd.Series) else series[nobs:]
+
+    if len(new_obs) == 0:
+        return model
+
+    # Models fit on a date index without a frequency are indexed by
+    # position internally, so they can only be extended with raw values
+    if not getattr(model.model, "_index_dates", False):
+        new_obs = np.asarray(new_obs, dtype=float)
+
+    estimated_nobs = getattr(model, "estimated_nobs", nobs)
+
+    if refit_every is not None and nobs + len(new_obs) - estimated_nobs >= refit_every:
+
+        # Warm-start the re-estimation from the current parameters
+        updated = model.append(
+            new_obs,
+            refit=True,
+            fit_kwargs={"start_params": model.params}
+        )
+        updated.estimated_nobs = updated.nobs
+
+    else:
+
+        updated = model.append(new_obs)
+        updated.estimated_nobs = estimated_nobs
+
+    return updated
+
+
+def _interval_bands(mean, se, levels):
+    """
+    Lower/upper bounds for every confidence level in one vectorized step
+
+    Returns two (steps, n_levels) arrays
+    """
+    z = norm.ppf(0.5 + np.asarray(levels, dtype=float) / 2)
+
+    half_width = se[:, np.newaxis] * z[np.newaxis, :]
+
+    return mean[:, np.newaxis] - half_width, mean[:, np.newaxis] + half_width
+
+
+def forecast_arima_with_intervals(model, steps=252, alpha=0.05, levels=None):
     """
     Forecast future values with confidence intervals
 
     steps = forecast horizon (252 trading days = 1 year)
     alpha = significance level (0.05 = 95% confidence interval)
+    levels = optional extra confidence levels, e.g. FAN_LEVELS, added as
+             lower_<pct>/upper_<pct> fan chart columns
+
+    The predicted mean and standard errors are computed once; every band
+    is derived from them analytically.
     """
 
     forecast_result = model.get_forecast(steps=steps)
 
+    predicted_mean = forecast_result.predicted_mean
+
+    mean = np.asarray(predicted_mean, dtype=float)
+    se = np.asarray(forecast_result.se_mean, dtype=float)
+
+    levels = [] if levels is None else list(levels)
+
+    lower, upper = _interval_bands(mean, se, [1 - alpha] + levels)
+
     forecast_df = pd.DataFrame({
-        "forecast": forecast_result.predicted_mean,
-        "lower_bound": forecast_result.conf_int(alpha=alpha).iloc[:, 0],
-        "upper_bound": forecast_result.conf_int(alpha=alpha).iloc[:, 1]
-    })
+        "forecast": mean,
+        "lower_bound": lower[:, 0],
+        "upper_bound": upper[:, 0]
+    }, index=predicted_mean.index)
+
+    for i, level in enumerate(levels, start=1):
+
+        pct = f"{level * 100:g}"
+
+        forecast_df[f"lower_{pct}"] = lower[:, i]
+        forecast_df[f"upper_{pct}"] = upper[:, i]
 
     return forecast_df
+
+
+def forecast_arima_fan(model, steps=252, levels=FAN_LEVELS):
+    """
+    Fan chart forecast: central bands for several confidence levels
+
+    Returns forecast plus lower_<pct>/upper_<pct> columns per level
+    """
+
+    return forecast_arima_with_intervals(
+        model,
+        steps=steps,
+        alpha=1 - max(levels),
+        levels=levels
+    )
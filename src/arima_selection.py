@@ -0,0 +1,311 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import warnings
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
+from statsmodels.tsa.arima.model import ARIMA
+
+from src.evaluate import evaluate_model
+
+
+# (series hash, order, stage) -> fit summary, shared by every call in
+# this process and optionally persisted to disk
+_FIT_CACHE = {}
+
+
+def series_hash(series):
+    """
+    Content hash of a series' values, used as the memoization key
+    """
+
+    values = np.ascontiguousarray(np.asarray(series, dtype=float))
+
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+def _fit_information_criteria(values, order):
+    """
+    Fit one candidate order and report AIC/BIC and convergence
+    """
+
+    result = {"aic": np.nan, "bic": np.nan, "converged": False, "error": None}
+
+    with warnings.catch_warnings(record=True) as caught:
+
+        warnings.simplefilter("always")
+
+        try:
+            fitted = ARIMA(values, order=order).fit()
+        except Exception as e:
+            result["error"] = str(e)
+            return result
+
+    converged = fitted.mle_retvals.get("converged", True) and not any(
+        issubclass(w.category, ConvergenceWarning) for w in caught
+    )
+
+    result.update(
+        aic=float(fitted.aic),
+        bic=float(fitted.bic),
+        converged=bool(converged)
+    )
+
+    return result
+
+
+def _out_of_sample_rmse(values, order, test_size):
+    """
+    Refit on all but the last test_size points and score the forecast
+    """
+
+    train, test = values[:-test_size], values[-test_size:]
+
+    with warnings.catch_warnings():
+
+        warnings.simplefilter("ignore")
+
+        try:
+            fitted = ARIMA(train, order=order).fit()
+        except Exception:
+            return np.nan
+
+    forecast = fitted.forecast(steps=test_size)
+
+    return float(evaluate_model(test, forecast)["RMSE"])
+
+
+@contextmanager
+def _executor(max_workers):
+    """
+    Spawn process pool shared by every wave and stage, or None for
+    in-process fits
+    """
+
+    if max_workers == 1:
+        yield None
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        yield executor
+
+
+def _run_stage(func, values, orders, executor, extra_args=()):
+    """
+    Yield (order, result) as candidate fits complete
+    """
+
+    if executor is None or len(orders) <= 1:
+
+        for order in orders:
+            yield order, func(values, order, *extra_args)
+
+        return
+
+    futures = {
+        executor.submit(func, values, order, *extra_args): order
+        for order in orders
+    }
+
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _load_cache(cache_path):
+
+    if cache_path and os.path.exists(cache_path):
+
+        with open(cache_path) as f:
+            _FIT_CACHE.update(json.load(f))
+
+
+def _save_cache(cache_path):
+
+    if cache_path:
+
+        with open(cache_path, "w") as f:
+            json.dump(_FIT_CACHE, f)
+
+
+def select_arima_order(
+    series,
+    p_values=range(0, 6),
+    d_values=(0, 1),
+    q_values=range(0, 3),
+    criterion="aic",
+    test_size=None,
+    prune_delta=10.0,
+    max_workers=None,
+    cache_path=None
+):
+    """
+    Grid-search ARIMA (p, d, q) orders
+
+    Parameters:
+    series: price series to model
+    p_values, d_values, q_values: candidate grid
+    criterion: "aic", "bic" or "rmse" (out-of-sample, needs test_size)
+    test_size: hold-out length for the out-of-sample RMSE stage
+    prune_delta: candidates are fitted in waves of increasing p + q; an
+                 order is only fitted if a simpler neighbour ((p-1, d, q)
+                 or (p, d, q-1)) is within prune_delta of the best AIC/BIC
+                 so far, and candidates trailing the best by more than
+                 this skip the RMSE stage (np.inf fits the whole grid)
+    max_workers: worker processes for candidate fits (1 = in process)
+    cache_path: optional JSON file persisting fits across runs
+
+    Returns:
+    tuple: (best order, DataFrame of every candidate sorted best first)
+    """
+
+    if criterion not in ("aic", "bic", "rmse"):
+        raise ValueError(f"Unknown criterion: {criterion}")
+
+    if criterion == "rmse" and not test_size:
+        raise ValueError("criterion='rmse' requires test_size")
+
+    values = np.asarray(series, dtype=float)
+
+    key_prefix = series_hash(values)
+
+    ic = "aic" if criterion == "rmse" else criterion
+
+    grid = set(itertools.product(p_values, d_values, q_values))
+
+    # Waves of increasing complexity p + q
+    waves = {}
+
+    for order in sorted(grid):
+        waves.setdefault(order[0] + order[2], []).append(order)
+
+    _load_cache(cache_path)
+
+    def cache_key(order, stage):
+        return f"{key_prefix}:{order[0]},{order[1]},{order[2]}:{stage}"
+
+    with _executor(max_workers) as executor:
+
+        # -----------------------------------
+        # Stage 1: information criteria, one wave at a time
+        # -----------------------------------
+        fits = {}
+
+        best_ic = np.inf
+
+        def promising(order):
+            """
+            True if the order has no simpler neighbour in the grid, or one of
+            them was fitted and is within prune_delta of the running best
+            """
+
+            p, d, q = order
+
+            parents = [
+                parent for parent in ((p - 1, d, q), (p, d, q - 1))
+                if parent in grid
+            ]
+
+            if not parents:
+                return True
+
+            return any(
+                parent in fits
+                and fits[parent]["converged"]
+                and fits[parent][ic] <= best_ic + prune_delta
+                for parent in parents
+            )
+
+        for complexity in sorted(waves):
+
+            wave = [order for order in waves[complexity] if promising(order)]
+
+            pending = []
+
+            for order in wave:
+
+                cached = _FIT_CACHE.get(cache_key(order, "ic"))
+
+                if cached is not None:
+                    fits[order] = cached
+                else:
+                    pending.append(order)
+
+            for order, result in _run_stage(
+                _fit_information_criteria, values, pending, executor
+            ):
+
+                fits[order] = result
+
+                _FIT_CACHE[cache_key(order, "ic")] = result
+
+            for order in wave:
+                if fits[order]["converged"]:
+                    best_ic = min(best_ic, fits[order][ic])
+
+        skipped = {
+            "aic": np.nan, "bic": np.nan, "converged": False, "error": None
+        }
+
+        rows = [
+            {"order": order, **fits.get(order, skipped), "fitted": order in fits}
+            for order in sorted(grid, key=lambda order: (sum(order), order))
+        ]
+
+        results = pd.DataFrame(rows)
+
+        # Drop skipped or non-converged fits and those clearly behind the best
+        results["pruned"] = ~results["converged"] | (
+            results[ic] > best_ic + prune_delta
+        )
+
+        # -----------------------------------
+        # Stage 2: out-of-sample RMSE on survivors
+        # -----------------------------------
+        results["rmse"] = np.nan
+
+        if test_size:
+
+            survivors = list(results.loc[~results["pruned"], "order"])
+
+            rmse = {}
+
+            pending = []
+
+            for order in survivors:
+
+                cached = _FIT_CACHE.get(cache_key(order, f"rmse{test_size}"))
+
+                if cached is not None:
+                    rmse[order] = cached
+                else:
+                    pending.append(order)
+
+            for order, value in _run_stage(
+                _out_of_sample_rmse, values, pending, executor, (test_size,)
+            ):
+
+                rmse[order] = value
+
+                _FIT_CACHE[cache_key(order, f"rmse{test_size}")] = value
+
+            results["rmse"] = [rmse.get(order, np.nan) for order in results["order"]]
+
+    _save_cache(cache_path)
+
+    results = results.sort_values(
+        ["pruned", criterion], na_position="last"
+    ).reset_index(drop=True)
+
+    if results["pruned"].all():
+        raise ValueError("No ARIMA candidate converged")
+
+    return tuple(results.loc[0, "order"]), results
@@ -1,154 +1,415 @@
 import numpy as np
 import pandas as pd
-import os
-import matplotlib.pyplot as plt
 
+from src.jit import njit
+from src.reporting import BacktestReporter
+from src.risk_metrics import risk_metrics_array
 
-def backtest(
+
+# Rows per rebalancing period when the index carries no dates
+_PERIOD_ROWS = {"daily": 1, "weekly": 5, "monthly": 21}
+
+_PERIOD_FREQ = {"weekly": "W", "monthly": "M"}
+
+
+def performance_metrics(cumulative, names=None):
+    """
+    Backtest metrics for each column of a (T, K) cumulative value array
+
+    Computed for all K curves at once by the shared risk engine
+    (src.risk_metrics); drawdowns are measured from the first value.
+
+    Returns:
+    DataFrame: one row per curve (names), one column per metric
+    """
+
+    values = np.asarray(cumulative, dtype=np.float64)
+
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+
+    metrics = risk_metrics_array(values[1:] / values[:-1] - 1)
+
+    return pd.DataFrame({
+        "Total Return": values[-1] - 1,
+        "Annualized Return": metrics["Annual Return"],
+        "Annualized Volatility": metrics["Volatility"],
+        "Sharpe Ratio": np.where(
+            metrics["Volatility"] != 0, metrics["Sharpe Ratio"], np.nan
+        ),
+        "Max Drawdown": metrics["Max Drawdown"]
+    }, index=names)
+
+
+def batch_backtest(
     returns: pd.DataFrame,
-    weights: dict,
-    benchmark_weights: dict = None,
-    transaction_cost: float = 0.001,
-    save_results: bool = True
+    weights,
+    names=None,
+    transaction_cost: float = 0.001
 ):
+    """
+    Backtest K static weight vectors in one call
 
-    # Ensure correct order
-    weights_array = np.array([weights[col] for col in returns.columns])
+    Parameters:
+    returns: DataFrame of asset returns (rows = days)
+    weights: (K, n_assets) array in returns.columns order, or a DataFrame
+             whose columns are asset names (its index names the rows)
+    names: optional labels for the K strategies
+    transaction_cost: same cost model as backtest() without rebalancing
 
-    # Compute strategy returns
-    strategy_returns = returns.dot(weights_array)
+    All K strategy return series come from a single matmul; nothing is
+    built per strategy.
 
-    # Transaction cost modeling
-    turnover = np.sum(np.abs(weights_array))
-    strategy_returns = strategy_returns - turnover * transaction_cost / 252
+    Returns:
+    dict: returns and cumulative as (T, K) arrays, metrics as a DataFrame
+          with the backtest_metrics.csv columns
+    """
 
-    # Cumulative performance
-    strategy_cumulative = (1 + strategy_returns).cumprod()
+    if isinstance(weights, pd.DataFrame):
 
-    results = {
-        "strategy_returns": strategy_returns,
-        "strategy_cumulative": strategy_cumulative
+        if names is None:
+            names = list(weights.index)
+
+        weights = weights.reindex(columns=returns.columns).fillna(0.0)
+
+    W = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+
+    R = returns.to_numpy(dtype=np.float64)
+
+    strategy_returns = R @ W.T
+
+    strategy_returns -= np.abs(W).sum(axis=1) * transaction_cost / 252
+
+    cumulative = np.cumprod(1 + strategy_returns, axis=0)
+
+    return {
+        "returns": strategy_returns,
+        "cumulative": cumulative,
+        "metrics": performance_metrics(cumulative, names=names)
     }
 
-    # Benchmark comparison
-    if benchmark_weights is not None:
 
-        benchmark_array = np.array(
-            [benchmark_weights[col] for col in returns.columns]
-        )
+def rebalance_schedule(index, frequency):
+    """
+    Boolean mask of the rows on which the portfolio is rebalanced
 
-        benchmark_returns = returns.dot(benchmark_array)
+    Rebalancing happens before the row's return is earned, on the first
+    row of each calendar period. The first row is always True (initial
+    allocation). frequency = "daily", "weekly", "monthly" or None.
+    """
 
-        benchmark_cumulative = (1 + benchmark_returns).cumprod()
+    n = len(index)
 
-        results["benchmark_returns"] = benchmark_returns
-        results["benchmark_cumulative"] = benchmark_cumulative
+    mask = np.zeros(n, dtype=bool)
 
-    # -----------------------------------
-    # Save results and automated reporting
-    # -----------------------------------
-    if save_results:
+    if n == 0:
+        return mask
 
-        os.makedirs("data/processed", exist_ok=True)
-        os.makedirs("reports/figures", exist_ok=True)
+    if frequency is None:
+        pass
 
-        # Save cumulative returns
-        strategy_cumulative.to_csv(
-            "data/processed/backtest_strategy.csv"
-        )
+    elif frequency not in _PERIOD_ROWS:
+        raise ValueError(f"Unknown rebalance frequency: {frequency}")
+
+    elif frequency == "daily":
+        mask[:] = True
+
+    elif isinstance(index, pd.DatetimeIndex):
+        periods = index.to_period(_PERIOD_FREQ[frequency]).asi8
+        mask[1:] = periods[1:] != periods[:-1]
+
+    else:
+        mask[::_PERIOD_ROWS[frequency]] = True
 
-        if benchmark_weights is not None:
+    mask[0] = True
 
-            benchmark_cumulative.to_csv(
-                "data/processed/backtest_benchmark.csv"
-            )
+    return mask
 
-        # -----------------------------------
-        # Compute performance metrics
-        # -----------------------------------
 
-        def compute_metrics(values):
+def _target_weights(returns, weights):
+    """
+    (T, N) target weight matrix and mask of rows where targets change
+    """
+
+    columns = returns.columns
+
+    if isinstance(weights, pd.DataFrame):
+
+        # Each row applies from its date until the next row
+        aligned = weights.reindex(columns=columns).fillna(0.0)
+
+        targets = aligned.reindex(returns.index, method="ffill").fillna(0.0)
+
+        changes = returns.index.isin(aligned.index)
+
+        return targets.to_numpy(dtype=np.float64), changes
+
+    row = np.array([weights[col] for col in columns], dtype=np.float64)
+
+    targets = np.broadcast_to(row, (len(returns), len(columns)))
+
+    return targets, np.zeros(len(returns), dtype=bool)
+
+
+@njit
+def _rebalance_kernel(
+    R,
+    targets,
+    scheduled,
+    threshold,
+    transaction_cost,
+    stop_loss,
+    drawdown_limit,
+    derisk_fraction
+):
+    """
+    Daily holdings / cash / cost recursion
+
+    Takes contiguous float64 arrays; optional features are disabled by
+    passing a value <= 0. Compiled by numba when available, otherwise
+    runs as NumPy code with one vector step per day.
+    """
 
-            returns = values.pct_change().dropna()
+    n_days, n_assets = R.shape
 
-            total_return = values.iloc[-1] - 1
+    port_returns = np.empty(n_days)
+    turnover = np.zeros(n_days)
+    holdings_history = np.empty((n_days, n_assets))
 
-            ann_return = returns.mean() * 252
+    # Start fully in cash
+    holdings = np.zeros(n_assets)
 
-            ann_vol = returns.std() * np.sqrt(252)
+    # Price relative of each asset since the last rebalance
+    relative = np.ones(n_assets)
+    stopped = np.zeros(n_assets, dtype=np.bool_)
 
-            sharpe = (
-                ann_return / ann_vol if ann_vol != 0 else np.nan
-            )
+    wealth = 1.0
+    peak = 1.0
+    scale = 1.0
 
-            max_dd = (
-                values / values.cummax() - 1
-            ).min()
+    for t in range(n_days):
 
-            return {
-                "Total Return": total_return,
-                "Annualized Return": ann_return,
-                "Annualized Volatility": ann_vol,
-                "Sharpe Ratio": sharpe,
-                "Max Drawdown": max_dd
-            }
+        breached = drawdown_limit > 0 and wealth / peak - 1.0 <= -drawdown_limit
 
-        metrics_strategy = compute_metrics(
-            strategy_cumulative
+        target = targets[t] * scale
+
+        for i in range(n_assets):
+            if stopped[i]:
+                target[i] = 0.0
+
+        rebalance = scheduled[t]
+
+        if not rebalance and threshold > 0:
+            rebalance = np.max(np.abs(target - holdings)) > threshold
+
+        if rebalance:
+
+            # Re-enter stopped assets; stay de-risked while in drawdown
+            scale = derisk_fraction if breached else 1.0
+            target = targets[t] * scale
+
+            turnover[t] = np.sum(np.abs(target - holdings))
+            holdings = target.copy()
+
+            relative[:] = 1.0
+            stopped[:] = False
+
+        else:
+
+            if stop_loss > 0:
+
+                sell = (relative <= 1.0 - stop_loss) & (holdings != 0.0)
+
+                turnover[t] += np.sum(np.abs(holdings[sell]))
+                holdings[sell] = 0.0
+                stopped = stopped | sell
+
+            if breached and scale == 1.0:
+
+                scale = derisk_fraction
+
+                turnover[t] += (1.0 - scale) * np.sum(np.abs(holdings))
+                holdings = holdings * scale
+
+        holdings_history[t] = holdings
+
+        grown = holdings * (1.0 + R[t])
+
+        gross = np.sum(grown) - np.sum(holdings)
+
+        port_returns[t] = (1.0 - turnover[t] * transaction_cost) * (1.0 + gross) - 1.0
+
+        wealth *= 1.0 + port_returns[t]
+        peak = max(peak, wealth)
+
+        relative = relative * (1.0 + R[t])
+
+        # Drifted weights for the next day
+        holdings = grown / (1.0 + gross)
+
+    return port_returns, turnover, holdings_history
+
+
+def rebalance_backtest(
+    returns: pd.DataFrame,
+    weights,
+    rebalance: str = "monthly",
+    threshold: float = None,
+    transaction_cost: float = 0.001,
+    stop_loss: float = None,
+    drawdown_limit: float = None,
+    derisk_fraction: float = 0.5
+):
+    """
+    Backtest with drifting holdings and explicit rebalancing
+
+    Parameters:
+    returns: DataFrame of asset returns (rows = days)
+    weights: dict of static target weights, or DataFrame of target weights
+             indexed by date; each row applies from its date onwards and
+             triggers a rebalance on that date
+    rebalance: calendar schedule "daily", "weekly", "monthly" or None
+    threshold: also rebalance when any drifted weight is more than this
+               away from its target
+    transaction_cost: cost per unit of traded weight
+    stop_loss: sell an asset to cash once it has fallen this fraction
+               since the last rebalance; it re-enters at the next one
+    drawdown_limit: scale holdings to derisk_fraction once the portfolio
+                    drawdown reaches this level, until a rebalance after
+                    the drawdown has recovered
+    derisk_fraction: exposure kept while de-risked
+
+    Weights that sum to less than one leave the rest in cash. Costs are
+    charged on the turnover measured at every trade.
+
+    Returns:
+    dict: strategy_returns, strategy_cumulative, turnover and weights
+          (holdings at the start of each day, after trading)
+    """
+
+    # Extract contiguous float64 arrays once for the kernel
+    R = np.ascontiguousarray(returns.to_numpy(dtype=np.float64))
+
+    targets, changes = _target_weights(returns, weights)
+
+    targets = np.ascontiguousarray(targets, dtype=np.float64)
+
+    scheduled = rebalance_schedule(returns.index, rebalance) | changes
+
+    port_returns, turnover, holdings_history = _rebalance_kernel(
+        R,
+        targets,
+        scheduled,
+        -1.0 if threshold is None else float(threshold),
+        float(transaction_cost),
+        -1.0 if stop_loss is None else float(stop_loss),
+        -1.0 if drawdown_limit is None else float(drawdown_limit),
+        float(derisk_fraction)
+    )
+
+    strategy_returns = pd.Series(port_returns, index=returns.index)
+
+    return {
+        "strategy_returns": strategy_returns,
+        "strategy_cumulative": (1 + strategy_returns).cumprod(),
+        "turnover": pd.Series(turnover, index=returns.index),
+        "weights": pd.DataFrame(
+            holdings_history, index=returns.index, columns=returns.columns
         )
+    }
+
 
-        metrics_df = pd.DataFrame(
-            [metrics_strategy],
-            index=["Strategy"]
+def backtest(
+    returns: pd.DataFrame,
+    weights: dict,
+    benchmark_weights: dict = None,
+    transaction_cost: float = 0.001,
+    save_results: bool = True,
+    rebalance: str = None,
+    threshold: float = None,
+    reporter: BacktestReporter = None
+):
+    """
+    Backtest a portfolio against an optional benchmark
+
+    With rebalance/threshold unset, weights are held fixed every day and
+    costs are charged as an annual turnover of sum(|w|). Otherwise the
+    strategy runs through rebalance_backtest with drifting holdings and
+    costs on measured turnover.
+
+    Returns, cumulative curves and results["metrics"] are pure in-memory
+    compute. With save_results=True they are handed to `reporter`
+    (default: a synchronous BacktestReporter); pass
+    BacktestReporter("background") to write off the calling thread.
+    """
+
+    if rebalance is not None or threshold is not None:
+
+        results = rebalance_backtest(
+            returns,
+            weights,
+            rebalance=rebalance,
+            threshold=threshold,
+            transaction_cost=transaction_cost
         )
 
-        if benchmark_weights is not None:
+        strategy_cumulative = results["strategy_cumulative"]
 
-            metrics_benchmark = compute_metrics(
-                benchmark_cumulative
-            )
+    else:
 
-            metrics_df.loc["Benchmark"] = metrics_benchmark
+        # Ensure correct order
+        weights_array = np.array([weights[col] for col in returns.columns])
 
-        # Save metrics automatically
-        metrics_df.to_csv(
-            "data/processed/backtest_metrics.csv"
-        )
+        # Compute strategy returns
+        strategy_returns = returns.dot(weights_array)
+
+        # Transaction cost modeling
+        turnover = np.sum(np.abs(weights_array))
+        strategy_returns = strategy_returns - turnover * transaction_cost / 252
+
+        # Cumulative performance
+        strategy_cumulative = (1 + strategy_returns).cumprod()
 
-        # -----------------------------------
-        # Plot cumulative performance
-        # -----------------------------------
+        results = {
+            "strategy_returns": strategy_returns,
+            "strategy_cumulative": strategy_cumulative
+        }
 
-        plt.figure(figsize=(12, 6))
+    # Benchmark comparison
+    if benchmark_weights is not None:
 
-        plt.plot(
-            strategy_cumulative,
-            label="Strategy"
+        benchmark_array = np.array(
+            [benchmark_weights[col] for col in returns.columns]
         )
 
-        if benchmark_weights is not None:
+        benchmark_returns = returns.dot(benchmark_array)
 
-            plt.plot(
-                benchmark_cumulative,
-                label="Benchmark"
-            )
+        benchmark_cumulative = (1 + benchmark_returns).cumprod()
 
-        plt.title("Portfolio Backtest")
+        results["benchmark_returns"] = benchmark_returns
+        results["benchmark_cumulative"] = benchmark_cumulative
 
-        plt.xlabel("Date")
+    # Metrics are always computed in memory
+    labels = ["Strategy"]
+    curves = [strategy_cumulative.to_numpy()]
 
-        plt.ylabel("Portfolio Value")
+    if benchmark_weights is not None:
+        labels.append("Benchmark")
+        curves.append(benchmark_cumulative.to_numpy())
 
-        plt.legend()
+    results["metrics"] = performance_metrics(
+        np.column_stack(curves),
+        names=labels
+    )
 
-        plt.grid(True)
+    # -----------------------------------
+    # Hand off to the reporting sink (CSVs + figure)
+    # -----------------------------------
+    if save_results:
 
-        plt.savefig(
-            "reports/figures/backtest_cumulative.png",
-            dpi=300,
-            bbox_inches="tight"
-        )
+        if reporter is None:
+            reporter = BacktestReporter()
 
-        plt.close()
+        reporter.submit(results)
 
     return results
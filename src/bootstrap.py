@@ -0,0 +1,60 @@
+"""
+Vectorized bootstrap index generation for resampling returns
+
+Each generator draws the row indices of all samples at once; index
+arrays are applied to a returns matrix with fancy indexing.
+"""
+
+import numpy as np
+
+
+def block_bootstrap_indices(n_obs, n_samples, block_size=21, rng=None, length=None):
+    """
+    Row indices of moving-block bootstrap samples, shape (n_samples, length)
+
+    Each sample concatenates randomly placed blocks of block_size
+    consecutive rows (keeping short-range autocorrelation), generated for
+    all samples at once. length defaults to n_obs.
+    """
+
+    rng = np.random.default_rng(rng)
+
+    length = n_obs if length is None else length
+
+    block_size = min(block_size, n_obs)
+
+    n_blocks = -(-length // block_size)
+
+    starts = rng.integers(0, n_obs - block_size + 1, size=(n_samples, n_blocks))
+
+    indices = starts[:, :, None] + np.arange(block_size)
+
+    return indices.reshape(n_samples, -1)[:, :length]
+
+
+def stationary_bootstrap_indices(n_obs, n_samples, block_size=21, rng=None, length=None):
+    """
+    Row indices of stationary (Politis-Romano) bootstrap samples
+
+    Blocks have geometric lengths with mean block_size and wrap around
+    the end of the sample. Fully vectorized: each position either starts
+    a new block at a random row or continues the previous one.
+    """
+
+    rng = np.random.default_rng(rng)
+
+    length = n_obs if length is None else length
+
+    new_block = rng.random((n_samples, length)) < 1.0 / block_size
+    new_block[:, 0] = True
+
+    starts = rng.integers(0, n_obs, size=(n_samples, length))
+
+    steps = np.arange(length)
+
+    # Position where the current block started, and its first row
+    block_start = np.maximum.accumulate(np.where(new_block, steps, 0), axis=1)
+
+    first_row = np.take_along_axis(starts, block_start, axis=1)
+
+    return (first_row + steps - block_start) % n_obs
@@ -0,0 +1,231 @@
+"""
+Closed-form and active-set solvers for small mean-variance problems
+
+Without custom constraints the optimizer's problems reduce to
+
+    minimize y' S y  subject to  a' y = 1  (and y >= 0 if long-only)
+
+with a = 1 for minimum variance and a = mu - rf for max Sharpe (then
+w = y / sum(y)). Unconstrained, y = S^-1 a / (a' S^-1 a); long-only, a
+primal active-set method solves the same system on the free assets.
+For a handful of assets each solve is a few small linear solves instead
+of a conic solver call.
+"""
+
+import numpy as np
+
+from src.frontier import (
+    NO_EXCESS_RETURN,
+    ParametricFrontier,
+    align_expected_returns,
+    clean_weights
+)
+from src.risk_models import FactorCovariance
+
+
+FAST_PATH_MAX_ASSETS = 25
+
+# Smallest eigenvalue relative to the largest for the fast path
+MIN_CONDITION_RATIO = 1e-10
+
+
+def _equality_qp(S, a, free):
+    """
+    argmin y'Sy s.t. a'y = 1 with y = 0 outside the free set
+    """
+
+    y = np.zeros(len(a))
+
+    z = np.linalg.solve(S[np.ix_(free, free)], a[free])
+
+    y[free] = z / (a[free] @ z)
+
+    return y
+
+
+def active_set_qp(S, a, tol=1e-12, max_iter=None):
+    """
+    Solve min y'Sy s.t. a'y = 1, y >= 0 by a primal active-set method
+
+    Starts from the single asset with the best a_i / sigma_i, then adds
+    the asset with the most negative KKT multiplier or drops the one that
+    blocks the step, until the KKT conditions hold.
+
+    Returns:
+    ndarray: optimal y
+    """
+
+    S = np.asarray(S, dtype=np.float64)
+    a = np.asarray(a, dtype=np.float64)
+
+    n = len(a)
+
+    if not (a > 0).any():
+        raise ValueError("No feasible point with a'y = 1 and y >= 0")
+
+    score = np.where(a > 0, a / np.sqrt(np.diag(S)), -np.inf)
+
+    start = int(np.argmax(score))
+
+    y = np.zeros(n)
+    y[start] = 1.0 / a[start]
+
+    free = np.zeros(n, dtype=bool)
+    free[start] = True
+
+    for _ in range(max_iter or 10 * n + 10):
+
+        target = _equality_qp(S, a, free)
+
+        if (target[free] >= -tol).all():
+
+            y = np.clip(target, 0.0, None)
+
+            # KKT: S y = gamma a + nu with nu >= 0 on the fixed assets
+            gradient = S @ y
+            gamma = gradient[free] @ a[free] / (a[free] @ a[free])
+            nu = gradient - gamma * a
+            nu[free] = 0.0
+
+            scale = max(1.0, np.abs(gradient).max())
+
+            if nu.min() >= -1e-10 * scale:
+                return y
+
+            free[int(np.argmin(nu))] = True
+
+        else:
+
+            # Step towards target until the first free weight hits zero
+            blocking = free & (target < -tol)
+
+            ratios = y[blocking] / (y[blocking] - target[blocking])
+
+            step = ratios.min()
+
+            y = y + step * (target - y)
+
+            leaving = np.flatnonzero(blocking)[np.argmin(ratios)]
+
+            free[leaving] = False
+            y[leaving] = 0.0
+
+    raise RuntimeError("Active-set method did not converge")
+
+
+def min_variance_weights(S, long_only=True):
+    """
+    Minimum variance weights (sum to one)
+    """
+
+    ones = np.ones(len(S))
+
+    if long_only:
+        return active_set_qp(S, ones)
+
+    S = np.asarray(S, dtype=np.float64)
+
+    return _equality_qp(S, ones, np.ones(len(S), dtype=bool))
+
+
+def tangency_weights(mu, S, risk_free_rate=0.02, long_only=True):
+    """
+    Max-Sharpe (tangency) weights (sum to one)
+    """
+
+    excess = np.asarray(mu, dtype=np.float64) - risk_free_rate
+
+    if not (excess > 0).any():
+        raise ValueError(NO_EXCESS_RETURN)
+
+    if long_only:
+        y = active_set_qp(S, excess)
+    else:
+        S = np.asarray(S, dtype=np.float64)
+
+        y = np.linalg.solve(S, excess)
+
+        if y.sum() <= 0:
+            raise ValueError("Tangency portfolio has non-positive net exposure")
+
+    return y / y.sum()
+
+
+def fast_path_applies(S, weight_bounds, n_assets):
+    """
+    True for small, well-conditioned dense problems with no constraints
+    beyond the budget and (optionally) long-only bounds
+    """
+
+    if (
+        isinstance(S, FactorCovariance)
+        or n_assets > FAST_PATH_MAX_ASSETS
+        or tuple(weight_bounds) not in ((0, 1), (0, None), (None, None))
+    ):
+        return False
+
+    # Degenerate risk (e.g. constant returns) is left to the conic solver
+    eigenvalues = np.linalg.eigvalsh(np.asarray(S, dtype=np.float64))
+
+    return bool(
+        eigenvalues[-1] > 0
+        and eigenvalues[0] > MIN_CONDITION_RATIO * eigenvalues[-1]
+    )
+
+
+class ClosedFormFrontier:
+    """
+    Drop-in for ParametricFrontier's max_sharpe / min_volatility /
+    clean_weights on small, unconstrained or long-only problems
+
+    A singular covariance or a non-converging active set hands the solve
+    to a ParametricFrontier built on first use.
+    """
+
+    def __init__(self, mu, S, weight_bounds=(0, 1)):
+
+        mu = align_expected_returns(mu, S)
+
+        self.assets = list(mu.index)
+        self.mu = mu.to_numpy(dtype=np.float64)
+        self.S = np.asarray(S, dtype=np.float64)
+        self.weight_bounds = weight_bounds
+        self.long_only = weight_bounds[0] is not None
+        self.weights = None
+
+        self._inputs = (mu, S)
+        self._conic = None
+
+    def _conic_frontier(self):
+
+        if self._conic is None:
+            self._conic = ParametricFrontier(*self._inputs, self.weight_bounds)
+
+        return self._conic
+
+    def max_sharpe(self, risk_free_rate=0.02):
+
+        try:
+            self.weights = tangency_weights(
+                self.mu, self.S, risk_free_rate, self.long_only
+            )
+        except (np.linalg.LinAlgError, RuntimeError):
+            conic = self._conic_frontier()
+            conic.max_sharpe(risk_free_rate)
+            self.weights = conic.weights
+
+        return self.clean_weights()
+
+    def min_volatility(self):
+
+        try:
+            self.weights = min_variance_weights(self.S, self.long_only)
+        except (np.linalg.LinAlgError, RuntimeError):
+            conic = self._conic_frontier()
+            conic.min_volatility()
+            self.weights = conic.weights
+
+        return self.clean_weights()
+
+    def clean_weights(self, cutoff=1e-4, rounding=5):
+        return clean_weights(self.assets, self.weights, cutoff, rounding)
@@ -1,12 +1,14 @@
 import pandas as pd
 import yfinance as yf
 
+from src.storage import load_frame
+
 
 # =========================
 # DOWNLOAD DATA
 # =========================
 
-def download_price_data(tickers, start, end):
+def download_price_data(tickers, start, end, dropna=True):
 
     df = yf.download(
         tickers=tickers,
@@ -22,7 +24,8 @@ def download_price_data(tickers, start, end):
     else:
         df = df[["Close"]]
 
-    df = df.dropna()
+    if dropna:
+        df = df.dropna()
 
     return df
 
@@ -30,16 +33,11 @@ def download_price_data(tickers, start, end):
 # LOAD SAVED DATA
 # =========================
 
-def load_data():
-
-    
-    df = pd.read_csv("data/processed/historical_prices.csv", 
-        index_col=0, 
-        parse_dates=True, infer_datetime_format=True)
-    
+def load_data(columns=None):
 
-    # Force numeric (CRITICAL FIX)
-    df = df.apply(pd.to_numeric, errors="coerce")
+    # Typed Parquet read (CSV fallback is coerced to numeric);
+    # columns=["TSLA"] reads only that column
+    df = load_frame("historical_prices", columns=columns)
 
     df = df.dropna()
 
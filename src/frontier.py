@@ -0,0 +1,259 @@
+"""
+Parametrized efficient frontier
+
+The cvxpy problem is built and canonicalized once; every frontier point,
+max-Sharpe or min-volatility solve only updates parameter values and
+re-solves warm-started from the previous solution.
+"""
+
+import numpy as np
+import cvxpy as cp
+import pandas as pd
+
+from src.risk_models import FactorCovariance
+
+
+NO_EXCESS_RETURN = (
+    "at least one of the assets must have an expected return exceeding "
+    "the risk-free rate"
+)
+
+
+def clean_weights(assets, weights, cutoff=1e-4, rounding=5):
+    """
+    Weights dict with tiny weights zeroed and values rounded (as pypfopt)
+    """
+
+    weights = np.where(np.abs(weights) < cutoff, 0.0, weights)
+
+    return dict(zip(assets, np.round(weights, rounding).tolist()))
+
+
+def align_expected_returns(mu, S):
+    """
+    mu reordered to the covariance's assets (S.index, or the factor
+    model's assets); raises ValueError if the asset sets differ
+
+    A covariance without labels (ndarray) is taken to follow mu's order.
+    """
+
+    if isinstance(S, FactorCovariance):
+        assets = list(S.assets)
+    elif isinstance(S, pd.DataFrame):
+        assets = list(S.index)
+    else:
+        return mu
+
+    missing = [a for a in assets if a not in mu.index]
+    extra = [a for a in mu.index if a not in assets]
+
+    if missing or extra:
+        raise ValueError(
+            "mu and S cover different assets "
+            f"(missing from mu: {missing}, not in S: {extra})"
+        )
+
+    return mu.reindex(assets)
+
+
+def _risk_factors(S):
+    """
+    (G, sqrt_d) with S = G G' + diag(sqrt_d^2)
+    """
+
+    if isinstance(S, FactorCovariance):
+        return S.loadings.to_numpy(), np.sqrt(S.specific_var.to_numpy())
+
+    S = np.asarray(S, dtype=np.float64)
+
+    try:
+        G = np.linalg.cholesky(S)
+    except np.linalg.LinAlgError:
+        # Positive semidefinite: symmetric square root with clipped eigenvalues
+        eigenvalues, eigenvectors = np.linalg.eigh(S)
+        G = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    return G, None
+
+
+class ParametricFrontier:
+    """
+    Mean-variance frontier over one reusable cvxpy problem
+
+    mu = annualized expected returns (Series)
+    S = annualized covariance (DataFrame or FactorCovariance)
+    weight_bounds = (lower, upper) bounds on each weight
+
+    Solves, in homogenized form with w = y / t,
+
+        minimize    y' S y
+        subject to  sum(y) = t,  lower t <= y <= upper t,
+                    r' y >= kappa,  fix * t = fix
+
+    Efficient-return and min-volatility points fix t = 1 (fix = 1,
+    r = mu, kappa = target); max-Sharpe frees t (fix = 0, r = mu - rf,
+    kappa = 1).
+    """
+
+    def __init__(self, mu, S, weight_bounds=(0, 1), solver="CLARABEL", **solver_options):
+
+        mu = align_expected_returns(mu, S)
+
+        self.assets = list(mu.index)
+        self.mu = mu.to_numpy(dtype=np.float64)
+        self.solver = solver
+        self.solver_options = solver_options
+        self.weight_bounds = weight_bounds
+        self.weights = None
+
+        n = len(self.assets)
+        lower, upper = weight_bounds
+
+        G, sqrt_d = _risk_factors(S)
+
+        self._G = G
+        self._sqrt_d = sqrt_d
+
+        self._y = cp.Variable(n)
+        self._t = cp.Variable(nonneg=True)
+
+        self._r = cp.Parameter(n)
+        self._kappa = cp.Parameter()
+        self._fix = cp.Parameter(nonneg=True)
+
+        risk = cp.sum_squares(G.T @ self._y)
+
+        if sqrt_d is not None:
+            risk = risk + cp.sum_squares(cp.multiply(sqrt_d, self._y))
+
+        constraints = [
+            cp.sum(self._y) == self._t,
+            self._r @ self._y >= self._kappa,
+            self._fix * self._t == self._fix
+        ]
+
+        if lower is not None:
+            constraints.append(self._y >= lower * self._t)
+
+        if upper is not None:
+            constraints.append(self._y <= upper * self._t)
+
+        self._problem = cp.Problem(cp.Minimize(risk), constraints)
+
+    def _solve(self, r, kappa, fix_scale=True):
+
+        self._r.value = r
+        self._kappa.value = kappa
+        self._fix.value = 1.0 if fix_scale else 0.0
+
+        self._problem.solve(
+            solver=self.solver, warm_start=True, **self.solver_options
+        )
+
+        if (
+            self._problem.status not in ("optimal", "optimal_inaccurate")
+            or self._y.value is None
+            or self._t.value is None
+            or self._t.value <= 0
+        ):
+            raise ValueError(f"Solver status: {self._problem.status}")
+
+        self.weights = self._y.value / self._t.value
+
+        return self.weights
+
+    def portfolio_performance(self, weights=None, risk_free_rate=0.02):
+        """
+        (expected return, volatility, Sharpe ratio) of the weights
+        """
+
+        w = self.weights if weights is None else np.asarray(weights)
+
+        variance = np.sum((self._G.T @ w) ** 2)
+
+        if self._sqrt_d is not None:
+            variance += np.sum((self._sqrt_d * w) ** 2)
+
+        ret = float(self.mu @ w)
+        vol = float(np.sqrt(variance))
+
+        return ret, vol, (ret - risk_free_rate) / vol
+
+    def min_volatility(self):
+
+        # A return floor far below any portfolio's return never binds
+        floor = -1e3 * (np.abs(self.mu).max() + 1)
+
+        self._solve(self.mu, floor)
+
+        return self.clean_weights()
+
+    def efficient_return(self, target_return):
+
+        self._solve(self.mu, float(target_return))
+
+        return self.clean_weights()
+
+    def max_sharpe(self, risk_free_rate=0.02):
+
+        excess = self.mu - risk_free_rate
+
+        if not (excess > 0).any():
+            raise ValueError(NO_EXCESS_RETURN)
+
+        self._solve(excess, 1.0, fix_scale=False)
+
+        return self.clean_weights()
+
+    def clean_weights(self, cutoff=1e-4, rounding=5):
+        return clean_weights(self.assets, self.weights, cutoff, rounding)
+
+    def frontier(self, n_points=50, risk_free_rate=0.02):
+        """
+        Sweep target returns from the min-volatility portfolio to the
+        highest attainable return
+
+        Returns:
+        dict: returns, volatility, sharpe (arrays of length n_points) and
+              weights (DataFrame, one row per point)
+        """
+
+        self.min_volatility()
+
+        low = float(self.mu @ self.weights)
+
+        # Highest return within the bounds, by linear programming
+        w = cp.Variable(len(self.mu))
+        lower, upper = self.weight_bounds
+
+        constraints = [cp.sum(w) == 1]
+
+        if lower is not None:
+            constraints.append(w >= lower)
+
+        if upper is not None:
+            constraints.append(w <= upper)
+
+        cp.Problem(cp.Maximize(self.mu @ w), constraints).solve()
+
+        high = float(self.mu @ w.value)
+
+        # Keep the last target a hair inside the feasible set
+        targets = np.linspace(low, high - 1e-9 * max(1.0, abs(high)), n_points)
+
+        weights = np.empty((n_points, len(self.mu)))
+        rets = np.empty(n_points)
+        vols = np.empty(n_points)
+
+        for i, target in enumerate(targets):
+
+            weights[i] = self._solve(self.mu, float(target))
+
+            rets[i], vols[i], _ = self.portfolio_performance(weights[i])
+
+        return {
+            "returns": rets,
+            "volatility": vols,
+            "sharpe": (rets - risk_free_rate) / vols,
+            "weights": pd.DataFrame(weights, columns=self.assets)
+        }
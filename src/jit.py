@@ -0,0 +1,26 @@
+"""
+Optional numba JIT compilation
+
+Kernels decorated with njit are compiled by numba when it is installed
+and run as plain NumPy code otherwise.
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(func=None, **kwargs):
+    """
+    numba.njit with on-disk caching, or a no-op decorator without numba
+    """
+
+    kwargs.setdefault("cache", True)
+
+    def decorate(f):
+        return _numba_njit(**kwargs)(f) if NUMBA_AVAILABLE else f
+
+    return decorate if func is None else decorate(func)
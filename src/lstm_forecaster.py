@@ -1,13 +1,57 @@
 import numpy as np
 import pandas as pd
+import tensorflow as tf
 from tensorflow.keras.models import load_model
 
+from src.windowing import RollingWindow, sliding_windows
+
 
 def create_sequences(data, window_size=60):
-    X = []
-    for i in range(window_size, len(data)):
-        X.append(data[i-window_size:i])
-    return np.array(X)
+    return sliding_windows(data, window_size)
+
+
+def _simulate_paths_batched(
+    model,
+    scaled_data,
+    steps,
+    window_size,
+    n_simulations,
+    noise_std,
+    rng
+):
+    """
+    Advance all simulated paths together, one model call per step
+    """
+
+    # (n,) or (n, 1) input, e.g. straight from MinMaxScaler
+    tail = np.asarray(scaled_data, dtype=np.float32).reshape(-1)[-window_size:]
+
+    windows = RollingWindow(np.tile(tail, (n_simulations, 1)))
+
+    # Draw the bootstrap noise for every path and step at once
+    noise = rng.normal(
+        0, noise_std, size=(n_simulations, steps)
+    ).astype(np.float32)
+
+    simulations = np.empty((n_simulations, steps), dtype=np.float32)
+
+    # Call the model directly as a compiled graph: predict() adds
+    # per-call overhead and eager calls run the LSTM op by op
+    @tf.function(reduce_retracing=True)
+    def step_fn(batch):
+        return model(batch, training=False)
+
+    for step in range(steps):
+
+        pred = np.asarray(
+            step_fn(windows.values[:, :, np.newaxis])
+        ).reshape(n_simulations)
+
+        simulations[:, step] = pred + noise[:, step]
+
+        windows.push(simulations[:, step])
+
+    return simulations
 
 
 def bootstrap_lstm_forecast(
@@ -16,41 +60,66 @@ def bootstrap_lstm_forecast(
     scaler,
     steps=252,
     window_size=60,
-    n_simulations=100
+    n_simulations=100,
+    batched=False,
+    noise_std=0.01,
+    random_state=None
 ):
     """
     Bootstrap forecast intervals for LSTM
 
     n_simulations = number of simulated forecasts
+    batched = advance all simulations as one (n_simulations, window_size, 1)
+              tensor per step instead of one predict() call per path and step
+    noise_std = standard deviation of the bootstrap noise added to each step
+    random_state = seed or np.random.Generator for reproducible paths
     """
 
     model = load_model(model_path)
 
-    simulations = []
+    rng = np.random.default_rng(random_state)
+
+    if batched:
+
+        simulations = _simulate_paths_batched(
+            model,
+            scaled_data,
+            steps,
+            window_size,
+            n_simulations,
+            noise_std,
+            rng
+        )
+
+    else:
+
+        simulations = []
+
+        tail = np.asarray(scaled_data, dtype=np.float32).reshape(-1)[-window_size:]
 
-    for sim in range(n_simulations):
+        for sim in range(n_simulations):
 
-        input_seq = scaled_data[-window_size:].copy()
-        sim_forecast = []
+            input_seq = RollingWindow(tail)
+            sim_forecast = []
 
-        for _ in range(steps):
+            for _ in range(steps):
 
-            pred = model.predict(
-                input_seq.reshape(1, window_size, 1),
-                verbose=0
-            )[0, 0]
+                pred = model.predict(
+                    input_seq.values.reshape(1, window_size, 1),
+                    verbose=0
+                )[0, 0]
 
-            # Add small noise for bootstrap variation
-            noise = np.random.normal(0, 0.01)
-            pred = pred + noise
+                # Add small noise for bootstrap variation
+                noise = rng.normal(0, noise_std)
+                pred = pred + noise
 
-            sim_forecast.append(pred)
+                sim_forecast.append(pred)
 
-            input_seq = np.append(input_seq[1:], pred)
+                input_seq.push(pred)
 
-        simulations.append(sim_forecast)
+            simulations.append(sim_forecast)
 
-    simulations = np.array(simulations)
+        simulations = np.array(simulations)
 
     mean_forecast = simulations.mean(axis=0)
     lower_bound = np.percentile(simulations, 2.5, axis=0)
@@ -0,0 +1,558 @@
+"""
+Memoized DAG runner for the scripts/ pipeline
+
+Each Stage declares the files it reads and writes. Its cache key hashes
+the contents of its inputs, the source of its code (the script plus the
+src/ and scripts/ modules it imports, transitively) and its params.
+Outputs are stored in a content-addressed cache keyed by that hash, so
+a stage whose key is unchanged is skipped (or its outputs restored from
+the cache), and a stage whose outputs come out byte-identical leaves
+everything downstream of it cached. Stages whose inputs are ready run
+concurrently.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+CACHE_DIR = "data/.cache"
+
+LOCAL_PACKAGES = ("src", "scripts")
+
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class Stage:
+    """
+    One pipeline step
+
+    Parameters:
+    name: unique stage name
+    action: module name run as `python -m <action>`, or a callable
+    inputs: file paths the stage reads
+    outputs: file paths the stage writes
+    params: JSON-serializable settings that should invalidate the cache
+    always_run: run on every invocation (e.g. stages that download data);
+                downstream stages still skip when the outputs are unchanged
+    """
+
+    def __init__(
+        self,
+        name,
+        action,
+        inputs=(),
+        outputs=(),
+        params=None,
+        always_run=False
+    ):
+
+        self.name = name
+        self.action = action
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.params = params or {}
+        self.always_run = always_run
+
+    def source_file(self, root="."):
+
+        if callable(self.action):
+            return inspect.getsourcefile(self.action)
+
+        return _module_file(self.action, root)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def _module_file(module, root="."):
+    """
+    Path of a local module, or None if it is not part of this repo
+    """
+
+    base = os.path.join(root, *module.split("."))
+
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.exists(path):
+            return path
+
+    return None
+
+
+def _local_imports(path, root="."):
+    """
+    Local modules imported by a source file
+    """
+
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    modules = set()
+
+    for node in ast.walk(tree):
+
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+        else:
+            continue
+
+        for name in names:
+            if name.split(".")[0] in LOCAL_PACKAGES:
+                modules.add(name)
+
+    files = (_module_file(module, root) for module in modules)
+
+    return {f for f in files if f is not None}
+
+
+def code_digest(path, root="."):
+    """
+    Hash of a source file and every local module it imports, transitively
+    """
+
+    seen = set()
+    pending = [os.path.normpath(path)]
+
+    while pending:
+
+        current = pending.pop()
+
+        if current in seen:
+            continue
+
+        seen.add(current)
+
+        pending.extend(
+            os.path.normpath(p) for p in _local_imports(current, root)
+        )
+
+    digest = hashlib.sha256()
+
+    for current in sorted(seen):
+        digest.update(os.path.relpath(current, root).encode())
+        digest.update(file_digest(current).encode())
+
+    return digest.hexdigest()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    SHA-256 of a file's contents
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Content-addressed store of stage outputs
+
+    objects/ holds one file per distinct content (named by its SHA-256)
+    and manifests/ maps a stage key to the digests of its outputs. File
+    digests are memoized by (size, mtime) so unchanged files are not
+    re-read on every run.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+
+        self.root = root
+
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "manifests"), exist_ok=True)
+
+        self._stat_path = os.path.join(root, "digests.json")
+
+        self._digests = {}
+
+        if os.path.exists(self._stat_path):
+            with open(self._stat_path) as f:
+                self._digests = json.load(f)
+
+    def digest(self, path):
+        """
+        Content digest of a file, or None if it does not exist
+        """
+
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        signature = [stat.st_size, stat.st_mtime_ns]
+
+        entry = self._digests.get(path)
+
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        digest = file_digest(path)
+
+        # A file modified within the timestamp resolution could change
+        # again without changing its signature, so it is not memoized
+        if time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+            self._digests[path] = [signature, digest]
+
+        return digest
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def _manifest_path(self, key):
+        return os.path.join(self.root, "manifests", f"{key}.json")
+
+    def store(self, path):
+        """
+        Copy a file into the store and return its digest
+        """
+
+        digest = self.digest(path)
+
+        target = self._object_path(digest)
+
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+
+        return digest
+
+    def restore(self, digest, path):
+        """
+        Write the stored content `digest` to path
+        """
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(self._object_path(digest), tmp)
+        os.replace(tmp, path)
+
+    def has(self, digest):
+        return os.path.exists(self._object_path(digest))
+
+    def manifest(self, key):
+
+        path = self._manifest_path(key)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as f:
+            return json.load(f)
+
+    def save_manifest(self, key, outputs):
+
+        path = self._manifest_path(key)
+
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(outputs, f, indent=2, sort_keys=True)
+
+        os.replace(f"{path}.tmp", path)
+
+    def flush(self):
+        """
+        Persist memoized file digests
+        """
+
+        with open(f"{self._stat_path}.tmp", "w") as f:
+            json.dump(self._digests, f)
+
+        os.replace(f"{self._stat_path}.tmp", self._stat_path)
+
+
+def run_module(stage, root="."):
+    """
+    Default runner: `python -m <module>` in the repo root, or call the
+    stage's function
+    """
+
+    if callable(stage.action):
+        stage.action()
+        return
+
+    subprocess.run([sys.executable, "-m", stage.action], cwd=root, check=True)
+
+
+class Pipeline:
+    """
+    DAG of stages connected by their input and output files
+
+    A stage depends on the stage that produces each of its inputs;
+    inputs no stage produces are treated as external files.
+    """
+
+    def __init__(self, stages, cache_dir=CACHE_DIR, root=".", runner=run_module):
+
+        self.stages = {}
+        self.producers = {}
+
+        for stage in stages:
+
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+
+            self.stages[stage.name] = stage
+
+            for path in stage.outputs:
+
+                if path in self.producers:
+                    raise ValueError(
+                        f"{path} is produced by both "
+                        f"{self.producers[path]} and {stage.name}"
+                    )
+
+                self.producers[path] = stage.name
+
+        self.dependencies = {
+            name: {
+                self.producers[path]
+                for path in stage.inputs
+                if path in self.producers and self.producers[path] != name
+            }
+            for name, stage in self.stages.items()
+        }
+
+        self.order = self._topological_order()
+
+        self.cache_dir = cache_dir
+        self.root = root
+        self.runner = runner
+
+        self.errors = {}
+
+    def _topological_order(self):
+
+        order = []
+        state = {}
+
+        def visit(name, path):
+
+            if state.get(name) == "done":
+                return
+
+            if state.get(name) == "active":
+                cycle = " -> ".join(path + [name])
+                raise ValueError(f"Pipeline has a cycle: {cycle}")
+
+            state[name] = "active"
+
+            for dependency in sorted(self.dependencies[name]):
+                visit(dependency, path + [name])
+
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+        return order
+
+    def upstream(self, targets):
+        """
+        Names of the targets and every stage they depend on
+        """
+
+        selected = set()
+        pending = list(targets)
+
+        while pending:
+
+            name = pending.pop()
+
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: {name}")
+
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.dependencies[name])
+
+        return selected
+
+    def stage_key(self, stage, cache):
+        """
+        Cache key of a stage from its input contents, code and params
+        """
+
+        inputs = {}
+
+        for path in stage.inputs:
+
+            digest = cache.digest(path)
+
+            if digest is None:
+                raise FileNotFoundError(f"{stage.name}: missing input {path}")
+
+            inputs[path] = digest
+
+        source = stage.source_file(self.root)
+
+        payload = {
+            "stage": stage.name,
+            "action": stage.action if isinstance(stage.action, str) else stage.action.__qualname__,
+            "code": code_digest(source, self.root) if source else None,
+            "inputs": inputs,
+            "outputs": sorted(stage.outputs),
+            "params": stage.params
+        }
+
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _check_cache(self, stage, key, cache):
+        """
+        "cached" if the outputs are current, "restored" if they were
+        copied back from the store, or None if the stage must run
+        """
+
+        manifest = cache.manifest(key)
+
+        if manifest is None or set(manifest) != set(stage.outputs):
+            return None
+
+        stale = [
+            path for path, digest in manifest.items()
+            if cache.digest(path) != digest
+        ]
+
+        if not stale:
+            return "cached"
+
+        if not all(cache.has(manifest[path]) for path in stale):
+            return None
+
+        for path in stale:
+            cache.restore(manifest[path], path)
+
+        return "restored"
+
+    def _record(self, stage, key, cache):
+
+        missing = [path for path in stage.outputs if cache.digest(path) is None]
+
+        if missing:
+            raise FileNotFoundError(
+                f"{stage.name} did not write {', '.join(missing)}"
+            )
+
+        cache.save_manifest(
+            key, {path: cache.store(path) for path in stage.outputs}
+        )
+
+    def run(self, targets=None, force=False, max_workers=None, dry_run=False):
+        """
+        Bring the targets (default: every stage) up to date
+
+        Parameters:
+        targets: stage names; their upstream stages are included
+        force: True, or a collection of stage names, to run regardless of
+               the cache
+        max_workers: stages running at the same time (default: CPU count)
+        dry_run: report what would run without running anything; stages
+                 below one that would run are reported as "pending"
+
+        Returns:
+        dict: stage name -> "cached", "restored", "ran", "failed",
+              "skipped" (an upstream stage failed) or, in a dry run,
+              "would run" / "pending"
+        """
+
+        selected = self.upstream(targets) if targets else set(self.stages)
+
+        if force is True:
+            forced = selected
+        else:
+            forced = set(force or ())
+
+        cache = ArtifactCache(self.cache_dir)
+
+        status = {}
+        errors = {}
+        running = {}
+
+        remaining = [name for name in self.order if name in selected]
+
+        def ready(name):
+            return all(dep in status for dep in self.dependencies[name])
+
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+
+            while remaining or running:
+
+                for name in [n for n in remaining if ready(n)]:
+
+                    remaining.remove(name)
+
+                    stage = self.stages[name]
+
+                    upstream = [status[d] for d in self.dependencies[name]]
+
+                    if any(s in ("failed", "skipped") for s in upstream):
+                        status[name] = "skipped"
+                        continue
+
+                    if any(s in ("would run", "pending") for s in upstream):
+                        status[name] = "pending"
+                        continue
+
+                    try:
+                        key = self.stage_key(stage, cache)
+                    except FileNotFoundError as error:
+                        status[name] = "failed"
+                        errors[name] = error
+                        continue
+
+                    hit = None
+
+                    if name not in forced and not stage.always_run:
+                        hit = self._check_cache(stage, key, cache)
+
+                    if hit:
+                        status[name] = hit
+                    elif dry_run:
+                        status[name] = "would run"
+                    else:
+                        future = executor.submit(self.runner, stage, self.root)
+                        running[future] = (name, key)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+
+                    name, key = running.pop(future)
+
+                    try:
+                        future.result()
+                        self._record(self.stages[name], key, cache)
+                        status[name] = "ran"
+                    except Exception as error:
+                        status[name] = "failed"
+                        errors[name] = error
+
+        cache.flush()
+
+        self.errors = errors
+
+        return {name: status[name] for name in self.order if name in status}
@@ -2,72 +2,125 @@
 
 import pandas as pd
 import numpy as np
-from pypfopt.efficient_frontier import EfficientFrontier
-from pypfopt.risk_models import sample_cov
 from pypfopt import expected_returns
 import warnings
 
+from src.closed_form import ClosedFormFrontier, fast_path_applies
+from src.frontier import NO_EXCESS_RETURN, ParametricFrontier
+from src.risk_models import FactorCovariance, estimate_risk_model
 
-def optimize_portfolio(returns, risk_free_rate=0.02):
+
+def optimize_portfolio(
+    returns=None,
+    risk_free_rate=0.02,
+    mu=None,
+    S=None,
+    risk_model="sample",
+    weight_bounds=(0, 1),
+    solver="auto",
+    **risk_model_kwargs
+):
     """
     Optimize portfolio weights using mean-variance optimization
     
     Parameters:
     returns: DataFrame of asset returns
     risk_free_rate: annual risk-free rate (default 2%)
+    mu: precomputed annualized expected returns (Series)
+    S: precomputed annualized covariance matrix (DataFrame or
+       FactorCovariance)
+    risk_model: covariance estimator used when S is not given: "sample",
+                "ledoit_wolf", "constant_correlation" or "pca" (see
+                src.risk_models; extra keyword arguments go to it)
+    weight_bounds: (lower, upper) bound on each weight
+    solver: "auto" (closed-form / active-set fast path for small dense
+            long-only or unconstrained problems, src.closed_form) or
+            "conic" (always the cvxpy problem)
+    
+    When both mu and S are given (e.g. from src.rolling_moments) returns
+    is not needed and no estimation is done. A FactorCovariance is
+    optimized in factor form, without building the dense matrix.
+    
+    The max-Sharpe problem and its min-volatility fallback share one
+    ParametricFrontier (src.frontier), so the fallback is a re-solve,
+    not a rebuild.
     
     Returns:
     dict: Optimal weights
     """
-    # Drop any NaN values
-    returns = returns.dropna()
+    precomputed = mu is not None and S is not None
+    
+    if returns is None and not precomputed:
+        if mu is not None:
+            raise ValueError("S is required when mu is given without returns")
+        if S is not None:
+            raise ValueError("mu is required when S is given without returns")
+        raise ValueError("optimize_portfolio needs returns, or both mu and S")
+    
+    if precomputed:
+        assets = list(mu.index)
+    else:
+        # Drop any NaN values
+        returns = returns.dropna()
+        assets = list(returns.columns)
     
-    if returns.empty or len(returns.columns) < 2:
+    if len(assets) < 2 or (not precomputed and returns.empty):
         warnings.warn("Insufficient data for optimization. Returning equal weights.")
-        return {col: 1/len(returns.columns) for col in returns.columns}
+        return {col: 1/len(assets) for col in assets}
     
     # Calculate expected returns and covariance
     try:
-        mu = expected_returns.mean_historical_return(returns)
-        S = sample_cov(returns)
+        if not precomputed:
+            # Inputs are returns, not prices
+            mu = expected_returns.mean_historical_return(returns, returns_data=True)
+            S = estimate_risk_model(returns, risk_model, **risk_model_kwargs)
         
         # Check for invalid values
-        if mu.isnull().any() or np.isinf(mu).any():
+        if not np.isfinite(mu.to_numpy(dtype=float)).all():
             raise ValueError("Expected returns contain NaN or Inf")
         
-        if S.isnull().any().any() or np.isinf(S).any().any():
+        if isinstance(S, FactorCovariance):
+            if not S.is_finite():
+                raise ValueError("Factor model contains NaN or Inf")
+        elif not np.isfinite(np.asarray(S, dtype=float)).all():
             raise ValueError("Covariance matrix contains NaN or Inf")
         
     except Exception as e:
         warnings.warn(f"Error calculating statistics: {e}. Using equal weights.")
-        return {col: 1/len(returns.columns) for col in returns.columns}
+        return {col: 1/len(assets) for col in assets}
+    
+    try:
+        if solver == "auto" and fast_path_applies(S, weight_bounds, len(assets)):
+            ef = ClosedFormFrontier(mu, S, weight_bounds)
+        else:
+            ef = ParametricFrontier(mu, S, weight_bounds)
+    except Exception as e:
+        warnings.warn(f"Optimization failed ({str(e)}). Using equal weights.")
+        return {col: 1/len(assets) for col in assets}
     
     try:
         # Try max Sharpe ratio
-        ef = EfficientFrontier(mu, S)
         weights = ef.max_sharpe(risk_free_rate=risk_free_rate)
         
     except Exception as e:
-        if "at least one of the assets must have an expected return exceeding the risk-free rate" in str(e):
+        if NO_EXCESS_RETURN in str(e):
             # Fall back to min variance portfolio
             warnings.warn("No asset exceeds risk-free rate. Using minimum variance portfolio.")
             try:
-                ef = EfficientFrontier(mu, S)
                 weights = ef.min_volatility()
             except:
                 # If all else fails, use equal weights
                 warnings.warn("Optimization failed. Using equal weights.")
-                return {col: 1/len(returns.columns) for col in returns.columns}
+                return {col: 1/len(assets) for col in assets}
         else:
             # Try min variance as fallback for any other error
             warnings.warn(f"Max Sharpe failed ({str(e)}). Trying min variance.")
             try:
-                ef = EfficientFrontier(mu, S)
                 weights = ef.min_volatility()
             except:
                 # Ultimate fallback: equal weights
                 warnings.warn("Optimization failed. Using equal weights.")
-                return {col: 1/len(returns.columns) for col in returns.columns}
+                return {col: 1/len(assets) for col in assets}
     
     # Clean weights (round small values to zero)
     cleaned_weights = ef.clean_weights()
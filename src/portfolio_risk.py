@@ -0,0 +1,229 @@
+"""
+Portfolio-level Value at Risk and Conditional VaR
+
+VaR follows the sign convention of compute_risk_metrics' "VaR 95%": the
+return quantile itself (negative for a loss). CVaR is the mean return
+in the tail at or below it.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+
+METHODS = ("parametric", "historical", "cornish_fisher", "monte_carlo")
+
+
+def portfolio_returns(returns: pd.DataFrame, weights) -> pd.Series:
+    """
+    Daily portfolio returns for a weights dict (e.g. from optimize_portfolio)
+    """
+
+    w = np.array([weights.get(col, 0.0) for col in returns.columns])
+
+    return returns.dot(w)
+
+
+def _horizon_returns(r, horizon):
+    """
+    Overlapping compounded returns over `horizon` days
+    """
+
+    if horizon == 1:
+        return r
+
+    log_wealth = np.concatenate([[0.0], np.cumsum(np.log1p(r))])
+
+    return np.expm1(log_wealth[horizon:] - log_wealth[:-horizon])
+
+
+def tail_quantiles(x, levels):
+    """
+    Lower-tail quantiles and tail means of x for each level (e.g. 0.05)
+
+    Quantiles use linear interpolation like np.quantile, but order
+    statistics come from a single np.partition call instead of a sort.
+
+    Returns:
+    tuple: (quantiles, tail means), arrays aligned with levels
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+
+    levels = np.asarray(levels, dtype=np.float64)
+
+    position = (len(x) - 1) * levels
+
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, len(x) - 1)
+
+    part = np.partition(x, np.unique(np.concatenate([lower, upper])))
+
+    quantiles = part[lower] + (position - lower) * (part[upper] - part[lower])
+
+    # Everything left of a kth position is no larger than it
+    tail_means = np.array([part[:k + 1].mean() for k in lower])
+
+    return quantiles, tail_means
+
+
+def _parametric(mean, std, levels):
+
+    z = norm.ppf(levels)
+
+    return mean + z * std, mean - std * norm.pdf(z) / levels
+
+
+def _cornish_fisher_z(z, skew, excess_kurt):
+
+    return (
+        z
+        + (z ** 2 - 1) * skew / 6
+        + (z ** 3 - 3 * z) * excess_kurt / 24
+        - (2 * z ** 3 - 5 * z) * skew ** 2 / 36
+    )
+
+
+def _cornish_fisher(mean, std, skew, excess_kurt, levels, grid=2000):
+
+    var = mean + std * _cornish_fisher_z(norm.ppf(levels), skew, excess_kurt)
+
+    # CVaR: average of the adjusted quantile function over the tail
+    cvar = np.array([
+        mean + std * _cornish_fisher_z(
+            norm.ppf(level * (np.arange(grid) + 0.5) / grid), skew, excess_kurt
+        ).mean()
+        for level in levels
+    ])
+
+    return var, cvar
+
+
+def monte_carlo_returns(
+    mu,
+    cov,
+    weights,
+    n_paths=100_000,
+    horizon=1,
+    batch_size=20_000,
+    random_state=None
+):
+    """
+    Simulated horizon returns of a daily-rebalanced portfolio
+
+    Asset returns are drawn as mu + Z L' with L the Cholesky factor of
+    the daily covariance (a clipped eigendecomposition square root when
+    it is only positive semidefinite), batch_size paths at a time so
+    memory stays at batch_size x horizon x n_assets.
+    """
+
+    rng = np.random.default_rng(random_state)
+
+    mu = np.asarray(mu, dtype=np.float64)
+    w = np.asarray(weights, dtype=np.float64)
+
+    cov = np.asarray(cov, dtype=np.float64)
+
+    try:
+        L = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        # Positive semidefinite: symmetric square root with clipped eigenvalues
+        eigenvalues, eigenvectors = np.linalg.eigh(cov)
+        L = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+    out = np.empty(n_paths)
+
+    for start in range(0, n_paths, batch_size):
+
+        size = min(batch_size, n_paths - start)
+
+        Z = rng.standard_normal((size, horizon, len(mu)))
+
+        daily = (Z @ L.T + mu) @ w
+
+        out[start:start + size] = np.expm1(np.log1p(daily).sum(axis=1))
+
+    return out
+
+
+def portfolio_var(
+    returns: pd.DataFrame,
+    weights,
+    confidence_levels=(0.95, 0.99),
+    methods=METHODS,
+    horizon=1,
+    n_paths=100_000,
+    batch_size=20_000,
+    random_state=None
+) -> pd.DataFrame:
+    """
+    Portfolio VaR and CVaR by several methods and confidence levels
+
+    Parameters:
+    returns: DataFrame of daily asset returns
+    weights: dict of asset weights (e.g. from optimize_portfolio)
+    confidence_levels: e.g. (0.95, 0.99)
+    methods: any of "parametric", "historical", "cornish_fisher",
+             "monte_carlo"
+    horizon: holding period in days; historical uses overlapping
+             compounded returns, parametric / Cornish-Fisher scale the
+             daily moments assuming i.i.d. returns
+    n_paths, batch_size, random_state: Monte Carlo settings
+
+    Returns:
+    DataFrame: one row per method, columns "VaR 95%", "CVaR 95%", ...
+    """
+
+    returns = returns.dropna()
+
+    w = np.array([weights.get(col, 0.0) for col in returns.columns])
+
+    daily = returns.to_numpy(dtype=np.float64) @ w
+
+    levels = 1 - np.asarray(confidence_levels, dtype=np.float64)
+
+    mean = daily.mean() * horizon
+    std = daily.std(ddof=1) * np.sqrt(horizon)
+
+    centered = daily - daily.mean()
+    skew = (centered ** 3).mean() / daily.std() ** 3 / np.sqrt(horizon)
+    excess_kurt = ((centered ** 4).mean() / daily.var() ** 2 - 3) / horizon
+
+    rows = {}
+
+    for method in methods:
+
+        if method == "parametric":
+            var, cvar = _parametric(mean, std, levels)
+
+        elif method == "historical":
+            var, cvar = tail_quantiles(_horizon_returns(daily, horizon), levels)
+
+        elif method == "cornish_fisher":
+            var, cvar = _cornish_fisher(mean, std, skew, excess_kurt, levels)
+
+        elif method == "monte_carlo":
+            simulated = monte_carlo_returns(
+                returns.mean().to_numpy(),
+                returns.cov().to_numpy(),
+                w,
+                n_paths=n_paths,
+                horizon=horizon,
+                batch_size=batch_size,
+                random_state=random_state
+            )
+            var, cvar = tail_quantiles(simulated, levels)
+
+        else:
+            raise ValueError(f"Unknown VaR method: {method}")
+
+        row = {}
+
+        for confidence, v, c in zip(confidence_levels, var, cvar):
+            label = f"{confidence * 100:g}%"
+            row[f"VaR {label}"] = v
+            row[f"CVaR {label}"] = c
+
+        rows[method] = row
+
+    return pd.DataFrame.from_dict(rows, orient="index")
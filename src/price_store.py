@@ -0,0 +1,295 @@
+import os
+import sqlite3
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import download_price_data
+
+
+def yfinance_fetcher(tickers, start, end):
+    """
+    Default fetcher: wide DataFrame of close prices, one column per ticker
+
+    Any callable with this signature can stand in for yfinance, e.g. a
+    local fixture in tests or offline runs.
+    """
+
+    # Keep partial rows: tickers fetched together may have different
+    # histories, and each one is trimmed to its own missing range
+    return download_price_data(tickers, start, end, dropna=False)
+
+
+class PriceStore:
+    """
+    Local SQLite store of daily close prices keyed by (ticker, date)
+
+    update() fetches only the dates each ticker is missing (after its
+    last stored date, and before its first one when `start` is earlier)
+    in batched fetcher calls, and merges the new rows in one transaction.
+
+    Closes are dividend/split adjusted, so a corporate action rescales a
+    ticker's whole history. Each forward fetch re-reads the last stored
+    date; if that close no longer matches, the ticker's full history is
+    fetched again and replaces the stored rows.
+    """
+
+    # Relative change of an already stored close that signals new
+    # adjustment factors
+    ADJUSTMENT_RTOL = 1e-6
+
+    def __init__(self, path="data/prices.sqlite", fetcher=yfinance_fetcher):
+
+        self.path = path
+        self.fetcher = fetcher
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prices (
+                    ticker TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    close REAL NOT NULL,
+                    PRIMARY KEY (ticker, date)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """
+        Connection that commits on success, rolls back on error and closes
+        """
+
+        conn = sqlite3.connect(self.path)
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def date_bounds(self, tickers=None):
+        """
+        (first, last) stored date per ticker (tickers with no rows are
+        omitted)
+        """
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, MIN(date), MAX(date) FROM prices GROUP BY ticker"
+            ).fetchall()
+
+        bounds = {
+            ticker: (pd.Timestamp(first), pd.Timestamp(last))
+            for ticker, first, last in rows
+        }
+
+        if tickers is not None:
+            bounds = {t: bounds[t] for t in tickers if t in bounds}
+
+        return bounds
+
+    def last_dates(self, tickers=None):
+        """
+        Last stored date per ticker (tickers with no rows are omitted)
+        """
+
+        return {t: last for t, (_, last) in self.date_bounds(tickers).items()}
+
+    def _fetch(self, tickers, start, end):
+        """
+        One fetcher call; warns about tickers it returned nothing for
+        """
+
+        if not tickers:
+            return pd.DataFrame()
+
+        data = self.fetcher(
+            list(tickers), start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+        )
+
+        data.index = pd.to_datetime(data.index)
+
+        missing = [t for t in tickers if t not in data.columns]
+
+        if missing:
+            warnings.warn(
+                f"No prices returned for {', '.join(missing)}; "
+                "their stored rows were not updated",
+                RuntimeWarning
+            )
+
+        return data
+
+    def _stored_closes(self, dates):
+        """
+        Stored close per ticker at the given {ticker: date}
+        """
+
+        with self._connect() as conn:
+            return {
+                ticker: conn.execute(
+                    "SELECT close FROM prices WHERE ticker = ? AND date = ?",
+                    (ticker, date.strftime("%Y-%m-%d"))
+                ).fetchone()[0]
+                for ticker, date in dates.items()
+            }
+
+    def update(self, tickers, start, end):
+        """
+        Fetch and store missing prices in [start, end)
+
+        Returns the number of rows written
+        """
+
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+
+        bounds = self.date_bounds(tickers)
+
+        rows = []
+
+        refetch = [t for t in tickers if t not in bounds]
+
+        # -----------------------------------
+        # Forward: from the last stored date (re-read as a check) to end
+        # -----------------------------------
+        forward = [
+            t for t in bounds if bounds[t][1] + pd.Timedelta(days=1) < end
+        ]
+
+        if forward:
+
+            data = self._fetch(forward, min(bounds[t][1] for t in forward), end)
+
+            stored = self._stored_closes({t: bounds[t][1] for t in forward})
+
+            for ticker in forward:
+
+                if ticker not in data.columns:
+                    continue
+
+                last = bounds[ticker][1]
+
+                fetched = data[ticker].get(last, np.nan)
+
+                if not np.isnan(fetched) and not np.isclose(
+                    fetched, stored[ticker], rtol=self.ADJUSTMENT_RTOL, atol=0.0
+                ):
+                    refetch.append(ticker)
+                    continue
+
+                rows.extend(
+                    _rows(data, ticker, last + pd.Timedelta(days=1), end)
+                )
+
+        # -----------------------------------
+        # Backward: dates before the first stored one
+        # -----------------------------------
+        backfill = [
+            t for t in bounds if t not in refetch and start < bounds[t][0]
+        ]
+
+        if backfill:
+
+            data = self._fetch(
+                backfill, start, max(bounds[t][0] for t in backfill)
+            )
+
+            for ticker in backfill:
+                rows.extend(_rows(data, ticker, start, bounds[ticker][0]))
+
+        # -----------------------------------
+        # New tickers and rescaled histories: everything
+        # -----------------------------------
+        replaced = []
+
+        if refetch:
+
+            full_start = min(
+                [start] + [bounds[t][0] for t in refetch if t in bounds]
+            )
+
+            data = self._fetch(refetch, full_start, end)
+
+            for ticker in refetch:
+
+                if ticker not in data.columns:
+                    continue
+
+                if ticker in bounds:
+                    replaced.append(ticker)
+
+                rows.extend(_rows(data, ticker, full_start, end))
+
+        # Committed as a single transaction: all rows or none
+        with self._connect() as conn:
+
+            conn.executemany(
+                "DELETE FROM prices WHERE ticker = ?", [(t,) for t in replaced]
+            )
+
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices (ticker, date, close) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+
+        return len(rows)
+
+    def load(self, tickers=None, start=None, end=None):
+        """
+        Wide DataFrame of stored close prices for dates in [start, end)
+        """
+
+        query = "SELECT date, ticker, close FROM prices WHERE 1 = 1"
+        params = []
+
+        if tickers is not None:
+            query += f" AND ticker IN ({', '.join('?' * len(tickers))})"
+            params.extend(tickers)
+
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+
+        if end is not None:
+            query += " AND date < ?"
+            params.append(pd.Timestamp(end).strftime("%Y-%m-%d"))
+
+        with self._connect() as conn:
+            long_df = pd.read_sql_query(query, conn, params=params)
+
+        df = long_df.pivot(index="date", columns="ticker", values="close")
+
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "Date"
+        df.columns.name = None
+
+        if tickers is not None:
+            df = df.reindex(columns=list(tickers))
+
+        return df
+
+
+def _rows(data, ticker, start, end):
+    """
+    (ticker, date, close) rows of one fetched column in [start, end)
+    """
+
+    prices = data[ticker].dropna()
+
+    prices = prices[(prices.index >= start) & (prices.index < end)]
+
+    return [
+        (ticker, date.strftime("%Y-%m-%d"), float(close))
+        for date, close in prices.items()
+    ]
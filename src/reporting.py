@@ -0,0 +1,173 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+FIGURE_HASH_KEY = "Source-Hash"
+
+
+def _curves_hash(curves):
+    """
+    Content hash of the plotted curves (labels, index and values)
+    """
+
+    digest = hashlib.sha256()
+
+    for label, series in curves.items():
+        digest.update(str(label).encode())
+        digest.update(pd.util.hash_pandas_object(series, index=True).values.tobytes())
+
+    return digest.hexdigest()
+
+
+def _stored_figure_hash(path):
+
+    if not os.path.exists(path):
+        return None
+
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            return image.text.get(FIGURE_HASH_KEY)
+    except (OSError, AttributeError):
+        return None
+
+
+def render_cumulative_figure(curves, path, title="Portfolio Backtest"):
+    """
+    Plot cumulative performance curves to a PNG, skipping unchanged input
+
+    curves = dict of label -> cumulative value Series
+
+    The hash of the input data is embedded in the PNG metadata; when it
+    matches, the existing file is kept and matplotlib is never touched.
+    Returns True if the figure was (re)rendered.
+    """
+
+    source_hash = _curves_hash(curves)
+
+    if _stored_figure_hash(path) == source_hash:
+        return False
+
+    # Object-oriented API: no pyplot global state, safe off the main thread
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 6))
+
+    ax = fig.add_subplot()
+
+    for label, series in curves.items():
+        ax.plot(series, label=label)
+
+    ax.set_title(title)
+
+    ax.set_xlabel("Date")
+
+    ax.set_ylabel("Portfolio Value")
+
+    ax.legend()
+
+    ax.grid(True)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    fig.savefig(
+        path,
+        dpi=300,
+        bbox_inches="tight",
+        metadata={FIGURE_HASH_KEY: source_hash}
+    )
+
+    return True
+
+
+class BacktestReporter:
+    """
+    Writes backtest results (CSVs and the cumulative figure)
+
+    mode = "sync" (write before submit returns), "background" (write on a
+           single worker thread) or "off" (discard)
+    """
+
+    def __init__(
+        self,
+        mode="sync",
+        data_dir="data/processed",
+        figure_dir="reports/figures"
+    ):
+
+        if mode not in ("sync", "background", "off"):
+            raise ValueError(f"Unknown reporter mode: {mode}")
+
+        self.mode = mode
+        self.data_dir = data_dir
+        self.figure_dir = figure_dir
+
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1) if mode == "background" else None
+        )
+        self._pending = []
+
+    def submit(self, results):
+        """
+        Report one backtest result dict (as returned by backtest())
+        """
+
+        if self.mode == "off":
+            return None
+
+        if self._executor is None:
+            return self._write(results)
+
+        future = self._executor.submit(self._write, results)
+
+        self._pending.append(future)
+
+        return future
+
+    def flush(self):
+        """
+        Wait for queued background writes; re-raises the first error
+        """
+
+        pending, self._pending = self._pending, []
+
+        for future in pending:
+            future.result()
+
+    def close(self):
+
+        self.flush()
+
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _write(self, results):
+
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        results["strategy_cumulative"].to_csv(
+            os.path.join(self.data_dir, "backtest_strategy.csv")
+        )
+
+        curves = {"Strategy": results["strategy_cumulative"]}
+
+        if "benchmark_cumulative" in results:
+
+            results["benchmark_cumulative"].to_csv(
+                os.path.join(self.data_dir, "backtest_benchmark.csv")
+            )
+
+            curves["Benchmark"] = results["benchmark_cumulative"]
+
+        results["metrics"].to_csv(
+            os.path.join(self.data_dir, "backtest_metrics.csv")
+        )
+
+        render_cumulative_figure(
+            curves,
+            os.path.join(self.figure_dir, "backtest_cumulative.png")
+        )
@@ -0,0 +1,140 @@
+"""
+Resampled (Michaud) portfolio optimization
+
+Block-bootstrap samples of the returns are optimized independently and
+the weights averaged, which smooths the sensitivity of a single
+max-Sharpe estimate to noise in the expected returns.
+"""
+
+import multiprocessing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import block_bootstrap_indices
+from src.portfolio import optimize_portfolio
+
+
+def _bootstrap_moments(samples, frequency=252):
+    """
+    Annualized mu (compounded) and sample covariance of each sample
+
+    samples = (k, T, n) array of returns
+    """
+
+    mu = np.expm1(np.log1p(samples).mean(axis=1) * frequency)
+
+    centered = samples - samples.mean(axis=1, keepdims=True)
+
+    S = np.einsum("ktn,ktm->knm", centered, centered) / (samples.shape[1] - 1)
+
+    return mu, S * frequency
+
+
+def _optimize_chunk(values, assets, n_samples, block_size, risk_free_rate, seed):
+
+    rng = np.random.default_rng(seed)
+
+    indices = block_bootstrap_indices(len(values), n_samples, block_size, rng)
+
+    mu, S = _bootstrap_moments(values[indices])
+
+    weights = np.empty((n_samples, len(assets)))
+
+    # Per-sample fallback warnings are expected noise here
+    with warnings.catch_warnings():
+
+        warnings.simplefilter("ignore")
+
+        for i in range(n_samples):
+
+            sample_weights = optimize_portfolio(
+                mu=pd.Series(mu[i], index=assets),
+                S=pd.DataFrame(S[i], index=assets, columns=assets),
+                risk_free_rate=risk_free_rate
+            )
+
+            weights[i] = [sample_weights[a] for a in assets]
+
+    return weights
+
+
+def resampled_optimize(
+    returns: pd.DataFrame,
+    n_resamples: int = 1000,
+    block_size: int = 21,
+    risk_free_rate: float = 0.02,
+    confidence: float = 0.9,
+    chunk_size: int = 100,
+    max_workers: int = None,
+    random_state=None
+):
+    """
+    Resampled max-Sharpe weights with bootstrap confidence intervals
+
+    Parameters:
+    returns: DataFrame of asset returns
+    n_resamples: number of bootstrap samples to optimize
+    block_size: rows per bootstrap block
+    risk_free_rate: passed to optimize_portfolio
+    confidence: coverage of the reported weight intervals
+    chunk_size: resamples per task
+    max_workers: worker processes (1 = run in this process)
+    random_state: seed; chunk seeds are spawned from it, so results do
+                  not depend on max_workers
+
+    Returns:
+    dict: weights (mean weights, Series), lower / upper (interval bounds,
+          Series) and samples (DataFrame, one row per resample)
+    """
+
+    returns = returns.dropna()
+
+    assets = list(returns.columns)
+
+    values = returns.to_numpy(dtype=np.float64)
+
+    sizes = [
+        min(chunk_size, n_resamples - start)
+        for start in range(0, n_resamples, chunk_size)
+    ]
+
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    args = (
+        repeat(values),
+        repeat(assets),
+        sizes,
+        repeat(block_size),
+        repeat(risk_free_rate),
+        seeds
+    )
+
+    if max_workers == 1:
+
+        chunks = list(map(_optimize_chunk, *args))
+
+    else:
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+
+            chunks = list(executor.map(_optimize_chunk, *args))
+
+    samples = pd.DataFrame(np.vstack(chunks), columns=assets)
+
+    tail = (1 - confidence) / 2
+
+    mean_weights = samples.mean()
+
+    return {
+        "weights": mean_weights / mean_weights.sum(),
+        "lower": samples.quantile(tail),
+        "upper": samples.quantile(1 - tail),
+        "samples": samples
+    }
@@ -1,5 +1,332 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.jit import njit
+
+
+METRIC_COLUMNS = [
+    "Annual Return",
+    "Volatility",
+    "Sharpe Ratio",
+    "Sortino Ratio",
+    "VaR 95%",
+    "Max Drawdown"
+]
+
+# Elements per chunk of sliding windows when computing rolling VaR
+_VAR_CHUNK_ELEMENTS = 1 << 22
+
+
+def _prefix_sums(R):
+    """
+    Cumulative sums shared by every window length
+
+    Moments are accumulated on column-centered values (variance is
+    shift-invariant), which keeps the differences of large prefix sums
+    accurate. P is the log wealth path with a leading zero.
+    """
+
+    T, n = R.shape
+
+    def prefix(x):
+        out = np.zeros((T + 1, n))
+        np.cumsum(x, axis=0, out=out[1:])
+        return out
+
+    downside = np.minimum(R, 0.0)
+
+    r_shift = R.mean(axis=0)
+    d_shift = downside.mean(axis=0)
+
+    centered = R - r_shift
+    d_centered = downside - d_shift
+
+    return {
+        "r_shift": r_shift,
+        "S1": prefix(centered),
+        "S2": prefix(centered ** 2),
+        "D1": prefix(d_centered),
+        "D2": prefix(d_centered ** 2),
+        "P": prefix(np.log1p(R))
+    }
+
+
+def _window_moments(S1, S2, window):
+    """
+    Rolling sum and ddof=1 variance for each complete window
+    """
+
+    total = S1[window:] - S1[:-window]
+
+    squares = S2[window:] - S2[:-window]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.maximum(squares - total ** 2 / window, 0.0) / (window - 1)
+
+    return total / window, var
+
+
+@njit
+def _combine(a_max, a_min, a_mdd, b_max, b_min, b_mdd):
+    """
+    Summary of segment A followed by segment B: (max, min, max drop)
+    """
+
+    return max(a_max, b_max), min(a_min, b_min), min(a_mdd, b_mdd, b_min - a_max)
+
+
+@njit
+def _rolling_drawdowns(P, window):
+    """
+    Max drawdown within, and drawdown from the high of, each window
+
+    P = (T + 1, n) log wealth path. The window ending at return t spans
+    wealth points t - window + 1 .. t + 1 (its starting value included).
+    Max drawdown uses two-stack sliding aggregation of (max, min, max
+    drop) summaries; the trailing high uses a monotone deque. Both are
+    amortized O(1) per step.
+    """
+
+    T = P.shape[0] - 1
+    n = P.shape[1]
+
+    rows = T - window + 1
+
+    mdd = np.empty((rows, n))
+    current = np.empty((rows, n))
+
+    front_max = np.empty(T + 1)
+    front_min = np.empty(T + 1)
+    front_mdd = np.empty(T + 1)
+
+    deque = np.empty(T + 1, dtype=np.int64)
+
+    for c in range(n):
+
+        # Front stack holds suffix summaries of [front_pos, front_end)
+        front_pos = 0
+        front_end = 0
+
+        # Back stack summary of [back_start, k]
+        back_start = 0
+        back_count = 0
+        back_max = 0.0
+        back_min = 0.0
+        back_mdd = 0.0
+
+        head = 0
+        tail = 0
+
+        for k in range(T + 1):
+
+            p = P[k, c]
+
+            # Push k
+            if back_count == 0:
+                back_max, back_min, back_mdd = p, p, 0.0
+            else:
+                back_max, back_min, back_mdd = _combine(
+                    back_max, back_min, back_mdd, p, p, 0.0
+                )
+            back_count += 1
+
+            while tail > head and P[deque[tail - 1], c] <= p:
+                tail -= 1
+            deque[tail] = k
+            tail += 1
+
+            # Pop the oldest point once the window holds window + 1 points
+            if k > window:
+
+                if front_pos == front_end:
+
+                    # Move the back stack to the front as suffix summaries
+                    last = back_start + back_count - 1
+                    front_max[last] = P[last, c]
+                    front_min[last] = P[last, c]
+                    front_mdd[last] = 0.0
+
+                    for j in range(last - 1, back_start - 1, -1):
+                        front_max[j], front_min[j], front_mdd[j] = _combine(
+                            P[j, c], P[j, c], 0.0,
+                            front_max[j + 1], front_min[j + 1], front_mdd[j + 1]
+                        )
+
+                    front_pos = back_start
+                    front_end = last + 1
+                    back_start = front_end
+                    back_count = 0
+
+                front_pos += 1
+
+            while deque[head] < k - window:
+                head += 1
+
+            if k >= window:
+
+                row = k - window
+
+                if front_pos == front_end:
+                    mdd[row, c] = back_mdd
+                elif back_count == 0:
+                    mdd[row, c] = front_mdd[front_pos]
+                else:
+                    mdd[row, c] = _combine(
+                        front_max[front_pos], front_min[front_pos],
+                        front_mdd[front_pos],
+                        back_max, back_min, back_mdd
+                    )[2]
+
+                current[row, c] = p - P[deque[head], c]
+
+    return np.expm1(mdd), np.expm1(current)
+
+
+def _rolling_quantile(R, window, q):
+    """
+    Linear-interpolated q-quantile of each complete window
+
+    Windows are sliding views of R processed in chunks so the partitioned
+    copy stays bounded in memory.
+    """
+
+    views = sliding_window_view(R, window, axis=0)
+
+    rows = views.shape[0]
+
+    out = np.empty((rows, R.shape[1]))
+
+    step = max(1, _VAR_CHUNK_ELEMENTS // (window * R.shape[1]))
+
+    for start in range(0, rows, step):
+        out[start:start + step] = np.quantile(views[start:start + step], q, axis=-1)
+
+    return out
+
+
+def _window_metrics(R, prefix, window, risk_free_rate, var_level, frequency):
+    """
+    Metric arrays (rows = complete windows, columns = assets)
+    """
+
+    mean, var = _window_moments(prefix["S1"], prefix["S2"], window)
+
+    _, downside_var = _window_moments(prefix["D1"], prefix["D2"], window)
+
+    annual_return = (mean + prefix["r_shift"]) * frequency
+
+    volatility = np.sqrt(var * frequency)
+
+    downside_vol = np.sqrt(downside_var * frequency)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = (annual_return - risk_free_rate) / volatility
+        sortino = (annual_return - risk_free_rate) / downside_vol
+
+    max_drawdown, drawdown = _rolling_drawdowns(prefix["P"], window)
+
+    return {
+        "Annual Return": annual_return,
+        "Volatility": volatility,
+        "Sharpe Ratio": sharpe,
+        "Sortino Ratio": sortino,
+        "VaR 95%": _rolling_quantile(R, window, var_level),
+        "Max Drawdown": max_drawdown,
+        "Drawdown": drawdown
+    }
+
+
+def risk_metrics_array(
+    R,
+    risk_free_rate=0.0,
+    var_level=0.05,
+    frequency=252
+):
+    """
+    Full-sample metrics for each column of a (T, n) returns array
+
+    With no observations every metric is NaN; with one, the
+    variance-based ones (Volatility, Sharpe and Sortino) are.
+
+    Returns:
+    dict: metric name -> (n,) array
+    """
+
+    R = np.ascontiguousarray(R, dtype=np.float64)
+
+    if R.ndim == 1:
+        R = R[:, np.newaxis]
+
+    if len(R) < 1:
+        return {
+            name: np.full(R.shape[1], np.nan)
+            for name in METRIC_COLUMNS + ["Drawdown"]
+        }
+
+    metrics = _window_metrics(
+        R, _prefix_sums(R), len(R), risk_free_rate, var_level, frequency
+    )
+
+    metrics = {name: values[0] for name, values in metrics.items()}
+
+    if len(R) < 2:
+        for name in ("Volatility", "Sharpe Ratio", "Sortino Ratio"):
+            metrics[name] = np.full(R.shape[1], np.nan)
+
+    return metrics
+
+
+def rolling_risk_metrics(
+    returns: pd.DataFrame,
+    windows=(21, 63, 252),
+    risk_free_rate: float = 0.0,
+    var_level: float = 0.05,
+    frequency: int = 252
+) -> pd.DataFrame:
+    """
+    Rolling risk metrics for several window lengths in one pass
+
+    Prefix sums of the returns, downside returns and log wealth are built
+    once and shared by every window, so each window length costs O(T n)
+    (VaR: one partition per window). Windows longer than the sample are
+    all NaN.
+
+    Returns:
+    DataFrame indexed like returns with columns (window, metric, asset);
+    rows before a window is complete are NaN. Metrics are those of
+    compute_risk_metrics plus "Drawdown" (from the trailing-window high).
+    """
+
+    R = np.ascontiguousarray(returns.to_numpy(dtype=np.float64))
+
+    T, n = R.shape
+
+    prefix = _prefix_sums(R)
+
+    blocks = {}
+
+    for window in windows:
+
+        if window > T:
+            metrics = {name: np.empty((0, n)) for name in METRIC_COLUMNS + ["Drawdown"]}
+        else:
+            metrics = _window_metrics(
+                R, prefix, window, risk_free_rate, var_level, frequency
+            )
+
+        for name, values in metrics.items():
+
+            padded = np.full((T, n), np.nan)
+
+            if len(values):
+                padded[window - 1:] = values
+
+            blocks[(window, name)] = pd.DataFrame(
+                padded, index=returns.index, columns=returns.columns
+            )
+
+    return pd.concat(blocks, axis=1, names=["window", "metric", "asset"])
 
 
 def compute_risk_metrics(
@@ -7,40 +334,312 @@ def compute_risk_metrics(
     risk_free_rate: float = 0.0
 ) -> pd.DataFrame:
 
-    mean_returns = returns.mean() * 252
+    # Columns with gaps are measured over their own observations
+    if returns.isna().to_numpy().any():
 
-    volatility = returns.std() * np.sqrt(252)
+        metrics = {
+            col: risk_metrics_array(returns[col].dropna().to_numpy(), risk_free_rate)
+            for col in returns.columns
+        }
 
-    sharpe_ratio = (mean_returns - risk_free_rate) / volatility
+        return pd.DataFrame({
+            name: pd.Series({col: metrics[col][name][0] for col in returns.columns})
+            for name in METRIC_COLUMNS
+        })
 
-    # Downside deviation
-    downside = returns.copy()
-    downside[downside > 0] = 0
+    metrics = risk_metrics_array(returns.to_numpy(), risk_free_rate)
 
-    downside_vol = downside.std() * np.sqrt(252)
+    return pd.DataFrame(
+        {name: metrics[name] for name in METRIC_COLUMNS},
+        index=returns.columns
+    )
 
-    sortino_ratio = (mean_returns - risk_free_rate) / downside_vol
 
-    # VaR
-    var_95 = returns.quantile(0.05)
+class OnlineRiskMetrics:
+    """
+    Streaming risk metrics with O(1) state and update cost per asset
 
-    # Max Drawdown
-    cumulative = (1 + returns).cumprod()
-    max_drawdown = (cumulative / cumulative.cummax() - 1).min()
+    Keeps, per asset, Welford mean/variance of returns and of downside
+    returns, the log wealth with its running peak and max drawdown, and a
+    P-squared quantile sketch (five markers) for VaR. metrics() returns
+    the columns of compute_risk_metrics; all but VaR match it exactly.
+    VaR is exact over the first `warmup` returns, which are kept, and the
+    P-squared estimate after that (the sketch needs many returns in the
+    tail before it settles).
 
-    metrics = pd.DataFrame({
+    The state round-trips through to_dict / from_dict (JSON-safe), so an
+    accumulator can be persisted and resumed.
+    """
 
-        "Annual Return": mean_returns,
+    def __init__(
+        self,
+        assets,
+        risk_free_rate=0.0,
+        var_level=0.05,
+        frequency=252,
+        warmup=100
+    ):
 
-        "Volatility": volatility,
+        if warmup < 5:
+            raise ValueError("warmup must cover the five P-squared markers")
 
-        "Sharpe Ratio": sharpe_ratio,
+        self.assets = list(assets)
+        self.risk_free_rate = risk_free_rate
+        self.var_level = var_level
+        self.frequency = frequency
+        self.warmup = warmup
 
-        "Sortino Ratio": sortino_ratio,
+        n = len(self.assets)
+        p = var_level
 
-        "VaR 95%": var_95,
+        self.count = np.zeros(n, dtype=np.int64)
 
-        "Max Drawdown": max_drawdown
-    })
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
 
-    return metrics
+        self.down_mean = np.zeros(n)
+        self.down_m2 = np.zeros(n)
+
+        self.log_wealth = np.zeros(n)
+        self.log_peak = np.zeros(n)
+        self.log_mdd = np.zeros(n)
+
+        # First returns, for the exact quantile during warm-up
+        self.warmup_returns = np.zeros((warmup, n))
+
+        # P-squared markers: heights, positions (1-based), desired positions
+        self.heights = np.zeros((5, n))
+        self.positions = np.tile(np.arange(1.0, 6.0)[:, None], (1, n))
+        self.desired = np.tile(
+            np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5])[:, None], (1, n)
+        )
+        self._increments = np.array([0, p / 2, p, (1 + p) / 2, 1])[:, None]
+
+    def update(self, returns):
+        """
+        Add one return per asset (array-like or Series; NaN = no update)
+        """
+
+        if isinstance(returns, pd.Series):
+            returns = returns.reindex(self.assets)
+
+        x = np.asarray(returns, dtype=np.float64)
+
+        seen = ~np.isnan(x)
+
+        x = np.where(seen, x, 0.0)
+
+        self.count += seen
+
+        count = np.maximum(self.count, 1)
+
+        # Welford for returns and for downside (clipped at zero) returns
+        delta = np.where(seen, x - self.mean, 0.0)
+        self.mean += delta / count
+        self.m2 += delta * (x - self.mean)
+
+        down = np.minimum(x, 0.0)
+        delta = np.where(seen, down - self.down_mean, 0.0)
+        self.down_mean += delta / count
+        self.down_m2 += delta * (down - self.down_mean)
+
+        # Drawdown from the running peak, starting value included
+        self.log_wealth += np.where(seen, np.log1p(x), 0.0)
+        self.log_peak = np.maximum(self.log_peak, self.log_wealth)
+        self.log_mdd = np.minimum(self.log_mdd, self.log_wealth - self.log_peak)
+
+        self._update_quantile(x, seen)
+
+        return self
+
+    def update_many(self, returns):
+        """
+        Add rows of returns in order (DataFrame or (T, n) array)
+        """
+
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.assets)
+
+        for row in np.asarray(returns, dtype=np.float64):
+            self.update(row)
+
+        return self
+
+    def _update_quantile(self, x, seen):
+
+        q = self.heights
+        pos = self.positions
+        cols = np.arange(len(x))
+
+        keep = seen & (self.count <= self.warmup)
+
+        self.warmup_returns[self.count[keep] - 1, cols[keep]] = x[keep]
+
+        # First five returns fill the markers, then they are sorted
+        filling = seen & (self.count <= 5)
+
+        if filling.any():
+
+            q[self.count[filling] - 1, cols[filling]] = x[filling]
+
+            ready = filling & (self.count == 5)
+
+            q[:, ready] = np.sort(q[:, ready], axis=0)
+
+        active = seen & (self.count > 5)
+
+        if not active.any():
+            return
+
+        # Cell of x among the markers; the extremes absorb new min / max
+        k = np.clip((q[1:4] <= x).sum(axis=0), 0, 3)
+
+        q[0] = np.where(active, np.minimum(q[0], x), q[0])
+        q[4] = np.where(active, np.maximum(q[4], x), q[4])
+
+        pos += (np.arange(5)[:, None] > k) & active
+        self.desired += self._increments * active
+
+        for i in range(1, 4):
+
+            d = self.desired[i] - pos[i]
+
+            move = active & (
+                ((d >= 1) & (pos[i + 1] - pos[i] > 1))
+                | ((d <= -1) & (pos[i - 1] - pos[i] < -1))
+            )
+
+            if not move.any():
+                continue
+
+            d = np.sign(d)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+
+                parabolic = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+
+                neighbour = np.where(d > 0, i + 1, i - 1)
+
+                linear = q[i] + d * (
+                    (q[neighbour, cols] - q[i]) / (pos[neighbour, cols] - pos[i])
+                )
+
+            inside = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+
+            q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+            pos[i] = np.where(move, pos[i] + d, pos[i])
+
+        self._seed_markers(seen & (self.count == self.warmup))
+
+    def _seed_markers(self, done):
+        """
+        Restart the markers from the warm-up sample's order statistics, so
+        the P-squared estimate continues from the exact quantile
+        """
+
+        if not done.any():
+            return
+
+        n = self.warmup
+
+        desired = 1 + (n - 1) * self._increments[:, 0]
+
+        self.desired[:, done] = desired[:, None]
+
+        # Integer marker positions, strictly increasing within 1..n
+        positions = np.round(desired)
+
+        for i in range(1, 4):
+            positions[i] = min(max(positions[i], positions[i - 1] + 1), n - 4 + i)
+
+        self.positions[:, done] = positions[:, None]
+
+        ordered = np.sort(self.warmup_returns[:, done], axis=0)
+
+        rows = self.positions[:, done].astype(np.int64) - 1
+
+        self.heights[:, done] = np.take_along_axis(ordered, rows, axis=0)
+
+    def value_at_risk(self):
+
+        var = np.full(len(self.assets), np.nan)
+
+        for j, count in enumerate(self.count):
+
+            if count > self.warmup:
+                var[j] = self.heights[2, j]
+            elif count > 0:
+                var[j] = np.quantile(
+                    self.warmup_returns[:count, j], self.var_level
+                )
+
+        return var
+
+    def metrics(self):
+        """
+        Current metrics, same columns as compute_risk_metrics
+        """
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            variance = self.m2 / (self.count - 1)
+            down_variance = self.down_m2 / (self.count - 1)
+
+            annual_return = self.mean * self.frequency
+            volatility = np.sqrt(variance * self.frequency)
+            downside_vol = np.sqrt(down_variance * self.frequency)
+
+            sharpe = (annual_return - self.risk_free_rate) / volatility
+            sortino = (annual_return - self.risk_free_rate) / downside_vol
+
+        return pd.DataFrame({
+            "Annual Return": annual_return,
+            "Volatility": volatility,
+            "Sharpe Ratio": sharpe,
+            "Sortino Ratio": sortino,
+            "VaR 95%": self.value_at_risk(),
+            "Max Drawdown": np.expm1(self.log_mdd)
+        }, index=self.assets)
+
+    _STATE = (
+        "count", "mean", "m2", "down_mean", "down_m2", "log_wealth",
+        "log_peak", "log_mdd", "warmup_returns", "heights", "positions",
+        "desired"
+    )
+
+    def to_dict(self):
+        """
+        JSON-serializable snapshot of the accumulator
+        """
+
+        state = {name: getattr(self, name).tolist() for name in self._STATE}
+
+        state.update(
+            assets=self.assets,
+            risk_free_rate=self.risk_free_rate,
+            var_level=self.var_level,
+            frequency=self.frequency,
+            warmup=self.warmup
+        )
+
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+
+        online = cls(
+            state["assets"],
+            risk_free_rate=state["risk_free_rate"],
+            var_level=state["var_level"],
+            frequency=state["frequency"],
+            warmup=state["warmup"]
+        )
+
+        for name in cls._STATE:
+            current = getattr(online, name)
+            setattr(online, name, np.asarray(state[name], dtype=current.dtype))
+
+        return online
@@ -0,0 +1,136 @@
+"""
+Covariance (risk model) backends for the optimizer
+
+All estimates are annualized. Dense models are returned as DataFrames,
+the statistical factor model as a FactorCovariance (low rank plus
+diagonal) so large universes never need the full n x n matrix.
+"""
+
+import numpy as np
+import pandas as pd
+from pypfopt.risk_models import CovarianceShrinkage, sample_cov
+
+
+RISK_MODELS = ("sample", "ledoit_wolf", "constant_correlation", "pca")
+
+
+class FactorCovariance:
+    """
+    Covariance in factor form: S = B B' + diag(d)
+
+    loadings = DataFrame (assets x factors), B
+    specific_var = Series (assets), d
+    """
+
+    def __init__(self, loadings, specific_var):
+
+        self.loadings = loadings
+        self.specific_var = specific_var
+
+    @property
+    def assets(self):
+        return self.loadings.index
+
+    @property
+    def n_factors(self):
+        return self.loadings.shape[1]
+
+    def is_finite(self):
+
+        return bool(
+            np.isfinite(self.loadings.to_numpy()).all()
+            and np.isfinite(self.specific_var.to_numpy()).all()
+        )
+
+    def portfolio_variance(self, weights):
+        """
+        w' S w in O(n k), without forming S
+        """
+
+        w = np.asarray(weights, dtype=np.float64)
+
+        factor_exposure = self.loadings.to_numpy().T @ w
+
+        return float(
+            factor_exposure @ factor_exposure
+            + (self.specific_var.to_numpy() * w) @ w
+        )
+
+    def to_dense(self):
+
+        B = self.loadings.to_numpy()
+
+        S = B @ B.T + np.diag(self.specific_var.to_numpy())
+
+        return pd.DataFrame(S, index=self.assets, columns=self.assets)
+
+
+def pca_factor_model(returns, n_factors=5, frequency=252, min_specific_var=1e-10):
+    """
+    Statistical factor model from the leading principal components
+
+    The first n_factors components of the sample covariance become the
+    factor loadings; the rest of each asset's sample variance is its
+    specific variance (floored at min_specific_var so S stays positive
+    definite).
+    """
+
+    X = returns.dropna(how="all").fillna(0.0).to_numpy(dtype=np.float64)
+
+    X = X - X.mean(axis=0)
+
+    scale = np.sqrt(frequency / (len(X) - 1))
+
+    # Economy SVD of the T x n data matrix: O(T n min(T, n)), no n x n matrix
+    _, singular_values, Vt = np.linalg.svd(X, full_matrices=False)
+
+    k = min(n_factors, len(singular_values))
+
+    B = Vt[:k].T * (singular_values[:k] * scale)
+
+    total_var = (X ** 2).sum(axis=0) * scale ** 2
+
+    specific_var = np.maximum(total_var - (B ** 2).sum(axis=1), min_specific_var)
+
+    return FactorCovariance(
+        pd.DataFrame(
+            B,
+            index=returns.columns,
+            columns=[f"PC{i + 1}" for i in range(k)]
+        ),
+        pd.Series(specific_var, index=returns.columns)
+    )
+
+
+def estimate_risk_model(returns, method="sample", frequency=252, **kwargs):
+    """
+    Annualized covariance estimate from asset returns
+
+    Parameters:
+    returns: DataFrame of asset returns
+    method: "sample", "ledoit_wolf" (shrink towards constant variance),
+            "constant_correlation" (Ledoit-Wolf towards constant
+            correlation) or "pca" (statistical factor model)
+    kwargs: passed to pca_factor_model (e.g. n_factors)
+
+    Returns:
+    DataFrame, or FactorCovariance for method="pca"
+    """
+
+    if method == "sample":
+        return sample_cov(returns, returns_data=True, frequency=frequency)
+
+    if method == "ledoit_wolf":
+        return CovarianceShrinkage(
+            returns, returns_data=True, frequency=frequency
+        ).ledoit_wolf()
+
+    if method == "constant_correlation":
+        return CovarianceShrinkage(
+            returns, returns_data=True, frequency=frequency
+        ).ledoit_wolf(shrinkage_target="constant_correlation")
+
+    if method == "pca":
+        return pca_factor_model(returns, frequency=frequency, **kwargs)
+
+    raise ValueError(f"Unknown risk model: {method}")
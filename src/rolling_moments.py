@@ -0,0 +1,206 @@
+"""
+Incremental rolling mean/covariance estimates
+
+One pass over the returns matrix yields the annualized mu/S inputs of
+optimize_portfolio at every requested rebalance point, instead of
+re-estimating each window from scratch.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.jit import njit
+
+
+@njit
+def _welford_kernel(X, L, window, ends):
+    """
+    Rolling (or expanding, window <= 0) moments at each end position
+
+    X = simple returns, L = log1p(X); ends = ascending exclusive row
+    positions. Returns (mean log return, sample covariance) per end.
+    """
+
+    T, n = X.shape
+    k = ends.shape[0]
+
+    log_means = np.empty((k, n))
+    covs = np.empty((k, n, n))
+
+    mean = np.zeros(n)
+    M2 = np.zeros((n, n))
+    log_sum = np.zeros(n)
+
+    count = 0
+    start = 0
+    pos = 0
+
+    for j in range(k):
+
+        while pos < ends[j]:
+
+            # Welford add
+            x = X[pos]
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            M2 += np.outer(delta, x - mean)
+            log_sum += L[pos]
+            pos += 1
+
+            if window > 0 and count > window:
+
+                # Welford remove of the oldest row
+                x = X[start]
+                count -= 1
+                delta = x - mean
+                mean -= delta / count
+                M2 -= np.outer(delta, x - mean)
+                log_sum -= L[start]
+                start += 1
+
+        log_means[j] = log_sum / count
+        covs[j] = M2 / (count - 1)
+
+    return log_means, covs
+
+
+@njit
+def _ewma_kernel(X, alpha, ends):
+    """
+    Exponentially weighted moments at each end position
+
+    Weighted Welford update with old weights decayed by (1 - alpha);
+    equals pandas ewm(alpha=alpha).mean() and .cov(bias=True).
+    """
+
+    T, n = X.shape
+    k = ends.shape[0]
+
+    means = np.empty((k, n))
+    covs = np.empty((k, n, n))
+
+    decay = 1.0 - alpha
+
+    mean = np.zeros(n)
+    S = np.zeros((n, n))
+    weight = 0.0
+
+    pos = 0
+
+    for j in range(k):
+
+        while pos < ends[j]:
+
+            x = X[pos]
+            weight = decay * weight + 1.0
+            delta = x - mean
+            mean += delta / weight
+            S = decay * S + np.outer(delta, x - mean)
+            pos += 1
+
+        means[j] = mean
+        covs[j] = S / weight
+
+    return means, covs
+
+
+def rolling_moments(
+    values,
+    ends,
+    window=252,
+    method="sample",
+    span=180,
+    frequency=252
+):
+    """
+    Annualized mu and S estimated from the rows before each end position
+
+    Parameters:
+    values: (T, n) array of returns without missing values
+    ends: exclusive row positions, e.g. the first row of each test period
+    window: rows per estimate for method="sample" (None = expanding)
+    method: "sample" (rolling window) or "ewma"
+    span: EWMA span for method="ewma"
+    frequency: periods per year
+
+    "sample" matches pypfopt's mean_historical_return (compounded) and
+    sample_cov on the same window; "ewma" matches ema_historical_return.
+
+    Returns:
+    tuple: mu array (k, n) and S array (k, n, n)
+    """
+
+    X = np.ascontiguousarray(values, dtype=np.float64)
+
+    ends = np.asarray(ends, dtype=np.int64)
+
+    order = np.argsort(ends, kind="stable")
+
+    sorted_ends = np.ascontiguousarray(ends[order])
+
+    if len(ends) and (sorted_ends[0] < 2 or sorted_ends[-1] > len(X)):
+        raise ValueError("End positions must lie in [2, len(values)]")
+
+    if method == "sample":
+
+        lookback = 0 if window is None else int(window)
+
+        if window is not None and lookback < 2:
+            raise ValueError("window must be at least 2")
+
+        log_means, covs = _welford_kernel(X, np.log1p(X), lookback, sorted_ends)
+
+        mu = np.expm1(log_means * frequency)
+
+    elif method == "ewma":
+
+        means, covs = _ewma_kernel(X, 2.0 / (span + 1.0), sorted_ends)
+
+        mu = (1 + means) ** frequency - 1
+
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    # Back to the caller's order
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+
+    return mu[inverse], covs[inverse] * frequency
+
+
+def rolling_mu_cov(
+    returns: pd.DataFrame,
+    dates,
+    window=252,
+    method="sample",
+    span=180,
+    frequency=252
+):
+    """
+    mu/S inputs of optimize_portfolio for every rebalance date
+
+    Each estimate uses only the rows strictly before its date, so it can
+    be traded on that date without look-ahead.
+
+    Returns:
+    dict: date -> (mu Series, S DataFrame)
+    """
+
+    dates = pd.DatetimeIndex(dates)
+
+    ends = returns.index.searchsorted(dates, side="left")
+
+    mu, S = rolling_moments(
+        returns.to_numpy(), ends, window, method, span, frequency
+    )
+
+    assets = returns.columns
+
+    return {
+        date: (
+            pd.Series(mu[i], index=assets),
+            pd.DataFrame(S[i], index=assets, columns=assets)
+        )
+        for i, date in enumerate(dates)
+    }
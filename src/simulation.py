@@ -0,0 +1,261 @@
+"""
+Bootstrap Monte Carlo simulation of portfolio wealth
+
+Paths resample historical days (block or stationary bootstrap) of the
+daily-rebalanced portfolio, in fixed-size chunks. Each chunk reduces its
+paths to mergeable histograms, so memory is bounded by the chunk size
+and chunks can run in worker processes.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import block_bootstrap_indices, stationary_bootstrap_indices
+
+
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+_INDEX_GENERATORS = {
+    "stationary": stationary_bootstrap_indices,
+    "block": block_bootstrap_indices
+}
+
+
+class StreamingHistogram:
+    """
+    Fixed-bin histogram reducer: add() chunks, merge() partial results
+
+    Values outside [lo, hi) are counted in under/overflow bins and the
+    exact minimum and maximum are tracked, so quantiles in the outer bins
+    interpolate towards the true extremes. Counts are integers, so merged
+    results do not depend on how values were split into chunks.
+    """
+
+    def __init__(self, lo, hi, bins=4096):
+
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = bins
+
+        # [underflow, bins..., overflow]
+        self.counts = np.zeros(bins + 2, dtype=np.int64)
+
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def add(self, values):
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        if not len(values):
+            return self
+
+        position = np.floor(
+            (values - self.lo) / (self.hi - self.lo) * self.bins
+        )
+
+        cells = np.clip(position, -1, self.bins).astype(np.int64) + 1
+
+        self.counts += np.bincount(cells, minlength=self.bins + 2)
+
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+        return self
+
+    def merge(self, other):
+
+        self.counts += other.counts
+
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def cdf(self, value):
+        """
+        Fraction of values below `value` (interpolated within its bin)
+        """
+
+        return float(np.interp(value, *self._cdf_points()))
+
+    def quantile(self, q):
+
+        edges, cumulative = self._cdf_points()
+
+        return np.interp(q, cumulative, edges)
+
+    def _cdf_points(self):
+
+        inner = np.linspace(self.lo, self.hi, self.bins + 1)
+
+        low = min(self.minimum, self.lo)
+        high = max(self.maximum, self.hi)
+
+        edges = np.concatenate([[low], inner, [high]])
+
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)]) / self.count
+
+        return edges, cumulative
+
+
+def _simulate_chunk(
+    daily,
+    n_paths,
+    horizon,
+    method,
+    block_size,
+    log_range,
+    bins,
+    seed
+):
+    """
+    Simulate one chunk of paths and reduce it to histograms
+    """
+
+    rng = np.random.default_rng(seed)
+
+    indices = _INDEX_GENERATORS[method](
+        len(daily), n_paths, block_size, rng, length=horizon
+    )
+
+    log_paths = np.cumsum(np.log1p(daily)[indices], axis=1)
+
+    # Drawdowns from the running peak, starting value included
+    peaks = np.maximum(np.maximum.accumulate(log_paths, axis=1), 0.0)
+
+    max_drawdown = np.expm1((log_paths - peaks).min(axis=1))
+
+    terminal = StreamingHistogram(*log_range, bins).add(log_paths[:, -1])
+
+    drawdown = StreamingHistogram(-1.0, 0.0, bins).add(max_drawdown)
+
+    return terminal, drawdown
+
+
+def simulate_portfolio(
+    returns: pd.DataFrame,
+    weights,
+    n_paths: int = 10_000,
+    horizon: int = 252,
+    method: str = "stationary",
+    block_size: int = 21,
+    chunk_size: int = 1_000,
+    quantiles=DEFAULT_QUANTILES,
+    initial_value: float = 1.0,
+    bins: int = 4096,
+    max_workers: int = None,
+    random_state=None
+):
+    """
+    Distribution of terminal wealth and max drawdown over `horizon` days
+
+    Parameters:
+    returns: DataFrame of daily asset returns
+    weights: dict of asset weights (e.g. portfolio_weights.csv)
+    n_paths: number of simulated paths
+    horizon: days per path
+    method: "stationary" (geometric block lengths) or "block" (fixed)
+    block_size: (mean) block length in days
+    chunk_size: paths per chunk; memory is O(chunk_size x horizon)
+    quantiles: levels to report
+    initial_value: starting wealth
+    bins: histogram resolution of the streaming reducers
+    max_workers: worker processes (1 = run in this process)
+    random_state: seed; chunk seeds are spawned from it, so results do
+                  not depend on max_workers
+
+    Returns:
+    dict: terminal_wealth and max_drawdown (quantile Series) and summary
+          (Series: median terminal wealth, probability of loss, paths)
+    """
+
+    if method not in _INDEX_GENERATORS:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    returns = returns.dropna()
+
+    w = np.array([weights.get(col, 0.0) for col in returns.columns])
+
+    daily = returns.to_numpy(dtype=np.float64) @ w
+
+    # Terminal log wealth range: +/- 8 standard deviations of the horizon sum
+    log_daily = np.log1p(daily)
+
+    center = log_daily.mean() * horizon
+    spread = 8 * log_daily.std() * np.sqrt(horizon) + 1e-12
+
+    log_range = (center - spread, center + spread)
+
+    sizes = [
+        min(chunk_size, n_paths - start)
+        for start in range(0, n_paths, chunk_size)
+    ]
+
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    args = (
+        repeat(daily),
+        sizes,
+        repeat(horizon),
+        repeat(method),
+        repeat(block_size),
+        repeat(log_range),
+        repeat(bins),
+        seeds
+    )
+
+    if max_workers == 1:
+
+        results = map(_simulate_chunk, *args)
+
+        terminal, drawdown = _merge(results)
+
+    else:
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+
+            terminal, drawdown = _merge(executor.map(_simulate_chunk, *args))
+
+    levels = np.asarray(quantiles, dtype=np.float64)
+
+    return {
+        "terminal_wealth": pd.Series(
+            initial_value * np.exp(terminal.quantile(levels)), index=levels
+        ),
+        "max_drawdown": pd.Series(drawdown.quantile(levels), index=levels),
+        "summary": pd.Series({
+            "Median Terminal Wealth": initial_value * np.exp(terminal.quantile(0.5)),
+            "Probability of Loss": terminal.cdf(0.0),
+            "Paths": terminal.count
+        })
+    }
+
+
+def _merge(chunk_results):
+    """
+    Fold chunk histograms in submission order as they arrive
+    """
+
+    terminal = drawdown = None
+
+    for chunk_terminal, chunk_drawdown in chunk_results:
+
+        if terminal is None:
+            terminal, drawdown = chunk_terminal, chunk_drawdown
+        else:
+            terminal.merge(chunk_terminal)
+            drawdown.merge(chunk_drawdown)
+
+    return terminal, drawdown
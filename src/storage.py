@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+
+
+PROCESSED_DIR = "data/processed"
+
+
+def dataset_path(name, fmt="parquet", base_dir=PROCESSED_DIR):
+    """
+    File path of a processed dataset, e.g. historical_prices.parquet
+    """
+
+    return os.path.join(base_dir, f"{name}.{fmt}")
+
+
+def save_frame(
+    df,
+    name,
+    base_dir=PROCESSED_DIR,
+    fmt="parquet",
+    csv_export=False,
+    datetime_index=True
+):
+    """
+    Write a processed dataset
+
+    Parameters:
+    df: DataFrame (or Series) to store
+    name: dataset name without extension
+    fmt: "parquet" (default) or "csv"
+    csv_export: also write a CSV copy next to the Parquet file
+    datetime_index: store the index as datetime64
+
+    Numeric columns are stored as float64 so readers never re-parse them.
+    """
+
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    os.makedirs(base_dir, exist_ok=True)
+
+    if fmt == "parquet":
+
+        numeric = df.select_dtypes("number").columns
+
+        df = df.astype({col: "float64" for col in numeric})
+
+        if datetime_index:
+            df.index = pd.to_datetime(df.index)
+
+        df.to_parquet(dataset_path(name, "parquet", base_dir), engine="pyarrow")
+
+    elif fmt != "csv":
+        raise ValueError(f"Unknown format: {fmt}")
+
+    if fmt == "csv" or csv_export:
+        df.to_csv(dataset_path(name, "csv", base_dir))
+
+
+def load_frame(name, columns=None, base_dir=PROCESSED_DIR):
+    """
+    Read a processed dataset, optionally only the given columns
+
+    Reads the Parquet file whenever it exists, so a stray CSV copy never
+    shadows it; the CSV file is only read when there is no Parquet file.
+    """
+
+    parquet_path = dataset_path(name, "parquet", base_dir)
+    csv_path = dataset_path(name, "csv", base_dir)
+
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, columns=columns, engine="pyarrow")
+
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"No parquet or csv file for dataset '{name}'")
+
+    usecols = None
+
+    if columns is not None:
+        header = pd.read_csv(csv_path, nrows=0).columns
+        usecols = [header[0]] + list(columns)
+
+    df = pd.read_csv(csv_path, index_col=0, usecols=usecols)
+
+    if df.index.dtype == object:
+        try:
+            df.index = pd.to_datetime(df.index)
+        except (ValueError, TypeError):
+            pass
+
+    return df.apply(pd.to_numeric, errors="coerce")
@@ -1,11 +1,17 @@
 from statsmodels.tsa.arima.model import ARIMA 
 import pickle
 
-def train_arima(train): 
-    model = ARIMA(train, order=(5,1,0)) 
+from src.arima_selection import select_arima_order
+
+def train_arima(train, order=(5,1,0)): 
+    # order="auto" picks (p, d, q) by AIC grid search
+    if order == "auto":
+        order, _ = select_arima_order(train)
+    model = ARIMA(train, order=order) 
     fitted = model.fit() 
+    fitted.estimated_nobs = fitted.nobs
     return fitted 
 
-def save_arima(model): 
-    with open("models/arima_model.pkl", "wb") as f:
+def save_arima(model, path="models/arima_model.pkl"): 
+    with open(path, "wb") as f:
        pickle.dump(model, f)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import numpy as np
 
+import tensorflow as tf
+
 from tensorflow.keras.models import Sequential
 
 from tensorflow.keras.layers import LSTM, Dense
@@ -8,6 +10,8 @@ from sklearn.preprocessing import MinMaxScaler
 
 import joblib
 
+from src.windowing import iter_window_batches, sliding_windows
+
 
 def prepare_data(series, window=60):
 
@@ -15,16 +19,73 @@ def prepare_data(series, window=60):
 
     scaled = scaler.fit_transform(series.values.reshape(-1,1))
 
-    X = []
-    y = []
+    # Read-only views into `scaled`, no per-window copies
+    X = sliding_windows(scaled, window)
+
+    y = scaled[window:]
+
+    return X, y, scaler
+
+
+def prepare_data_batches(series, window=60, batch_size=1024):
+    """
+    Chunked variant of prepare_data for long histories
+
+    Returns a generator of fixed-size (X, y) batches and the fitted scaler
+    """
+
+    scaler = MinMaxScaler()
+
+    scaled = scaler.fit_transform(series.values.reshape(-1,1))
+
+    batches = iter_window_batches(scaled, window, batch_size=batch_size)
+
+    return batches, scaler
+
+
+def prepare_dataset(
+    series,
+    window=60,
+    batch_size=32,
+    shuffle_buffer=None,
+    cache=False,
+    seed=None
+):
+    """
+    Streaming tf.data pipeline of (window, next value) training pairs
+
+    Windows are cut lazily from the scaled series, so memory stays flat
+    regardless of history length.
+
+    shuffle_buffer = size of the bounded shuffle buffer (None = no shuffle)
+    cache = False, True (in memory) or a file path for an on-disk cache
+    seed = shuffle seed
+
+    Returns the batched, prefetched dataset and the fitted scaler
+    """
+
+    scaler = MinMaxScaler()
+
+    scaled = scaler.fit_transform(
+        series.values.reshape(-1,1)
+    ).astype(np.float32)
+
+    dataset = tf.keras.utils.timeseries_dataset_from_array(
+        scaled,
+        targets=scaled[window:],
+        sequence_length=window,
+        batch_size=None
+    )
 
-    for i in range(window, len(scaled)):
+    if cache:
+        dataset = dataset.cache("" if cache is True else cache)
 
-        X.append(scaled[i-window:i])
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed)
 
-        y.append(scaled[i])
+    dataset = dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
 
-    return np.array(X), np.array(y), scaler
+    return dataset, scaler
 
 
 def build_model():
@@ -0,0 +1,187 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from threadpoolctl import threadpool_limits
+
+
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS"
+)
+
+
+def _limit_worker_threads(n_threads):
+    """
+    Cap BLAS and TensorFlow thread pools inside a worker process
+
+    TensorFlow reads its thread settings when it is first imported, which
+    happens lazily inside train_ticker after this initializer has run.
+    """
+
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(n_threads)
+
+    threadpool_limits(limits=n_threads)
+
+
+def train_ticker(
+    ticker,
+    series,
+    output_dir="models",
+    models=("arima", "lstm"),
+    window=60,
+    epochs=10,
+    batch_size=64
+):
+    """
+    Fit the ARIMA and/or LSTM model for one ticker and save the artifacts
+
+    Returns a dict mapping artifact name to file path
+    """
+
+    ticker_dir = os.path.join(output_dir, ticker)
+
+    os.makedirs(ticker_dir, exist_ok=True)
+
+    artifacts = {}
+
+    if "arima" in models:
+
+        from src.train_arima import train_arima, save_arima
+
+        arima = train_arima(series)
+
+        arima_path = os.path.join(ticker_dir, "arima_model.pkl")
+
+        save_arima(arima, arima_path)
+
+        artifacts["arima"] = arima_path
+
+    if "lstm" in models:
+
+        # Imported here so worker processes load TensorFlow only after
+        # their thread limits are in place
+        from src.train_lstm import (
+            prepare_dataset,
+            build_model,
+            save_model_and_info
+        )
+
+        dataset, scaler = prepare_dataset(
+            series,
+            window=window,
+            batch_size=batch_size,
+            shuffle_buffer=1024,
+            seed=42
+        )
+
+        lstm = build_model()
+
+        lstm.fit(dataset, epochs=epochs, verbose=0)
+
+        lstm_path = os.path.join(ticker_dir, "lstm_model")
+
+        save_model_and_info(lstm, scaler, window, filepath=lstm_path)
+
+        artifacts["lstm"] = f"{lstm_path}.h5"
+        artifacts["lstm_scaler"] = f"{lstm_path}_scaler.pkl"
+        artifacts["lstm_info"] = f"{lstm_path}_info.pkl"
+
+    return artifacts
+
+
+def _train_ticker_safe(ticker, series, kwargs):
+
+    try:
+        return ticker, {"status": "ok", **train_ticker(ticker, series, **kwargs)}
+    except Exception as e:
+        return ticker, {"status": "failed", "error": str(e)}
+
+
+def load_registry(output_dir="models"):
+    """
+    Load the per-ticker model artifact registry (empty if none yet)
+    """
+
+    path = os.path.join(output_dir, "registry.json")
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as f:
+        return json.load(f)
+
+
+def train_universe(
+    prices,
+    tickers=None,
+    output_dir="models",
+    max_workers=None,
+    threads_per_worker=1,
+    **train_kwargs
+):
+    """
+    Train models for many tickers in parallel worker processes
+
+    Parameters:
+    prices: DataFrame of close prices, one column per ticker
+    tickers: tickers to train (default: every column)
+    output_dir: root folder for per-ticker artifacts and registry.json
+    max_workers: number of worker processes (1 = train in this process)
+    threads_per_worker: BLAS/TensorFlow thread cap per worker
+    train_kwargs: forwarded to train_ticker
+
+    Returns:
+    dict: ticker -> artifact entry, also merged into registry.json
+    """
+
+    tickers = list(prices.columns if tickers is None else tickers)
+
+    jobs = [
+        (ticker, prices[ticker].dropna().astype(float))
+        for ticker in tickers
+    ]
+
+    train_kwargs["output_dir"] = output_dir
+
+    if max_workers == 1:
+
+        results = [
+            _train_ticker_safe(ticker, series, train_kwargs)
+            for ticker, series in jobs
+        ]
+
+    else:
+
+        # Spawn fresh workers: forking a parent that already loaded
+        # TensorFlow or a BLAS thread pool is unsafe
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_worker_threads,
+            initargs=(threads_per_worker,)
+        ) as executor:
+
+            futures = [
+                executor.submit(_train_ticker_safe, ticker, series, train_kwargs)
+                for ticker, series in jobs
+            ]
+
+            results = [future.result() for future in futures]
+
+    registry = load_registry(output_dir)
+
+    registry.update(dict(results))
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(os.path.join(output_dir, "registry.json"), "w") as f:
+        json.dump(registry, f, indent=2)
+
+    return dict(results)
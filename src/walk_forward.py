@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import pandas as pd
+
+from src.backtest import performance_metrics, rebalance_backtest
+from src.portfolio import optimize_portfolio
+from src.rolling_moments import rolling_moments
+
+
+def walk_forward_splits(n_obs, train_window=252, test_window=21, expanding=False):
+    """
+    Positional (train_start, test_start, test_end) bounds of each fold
+
+    Estimation windows slide by test_window rows (or grow from row 0 when
+    expanding=True); each fold is tested on the rows that follow it.
+    """
+
+    splits = []
+
+    test_start = train_window
+
+    while test_start < n_obs:
+
+        train_start = 0 if expanding else test_start - train_window
+
+        splits.append(
+            (train_start, test_start, min(test_start + test_window, n_obs))
+        )
+
+        test_start += test_window
+
+    return splits
+
+
+def _optimize_fold(moments, risk_free_rate):
+
+    mu, S = moments
+
+    # Fallback warnings from hundreds of refits are noise here
+    with warnings.catch_warnings():
+
+        warnings.simplefilter("ignore")
+
+        return dict(
+            optimize_portfolio(mu=mu, S=S, risk_free_rate=risk_free_rate)
+        )
+
+
+def walk_forward_backtest(
+    returns: pd.DataFrame,
+    train_window: int = 252,
+    test_window: int = 21,
+    expanding: bool = False,
+    risk_free_rate: float = 0.02,
+    transaction_cost: float = 0.001,
+    estimator: str = "sample",
+    span: int = 180,
+    max_workers: int = None
+):
+    """
+    Walk-forward optimize-and-backtest
+
+    Parameters:
+    returns: DataFrame of asset returns (rows = days)
+    train_window: estimation window length (initial length if expanding)
+    test_window: out-of-sample rows per fold (the refit interval)
+    expanding: grow the estimation window instead of sliding it
+    risk_free_rate: passed to optimize_portfolio
+    transaction_cost: cost per unit of traded weight at each refit
+    estimator: "sample" (window moments, as optimize_portfolio would
+               estimate them) or "ewma" (exponentially weighted)
+    span: EWMA span for estimator="ewma"
+    max_workers: worker processes for the fold optimizations
+                 (1 = optimize in this process)
+
+    Each fold's weights are estimated only from data before its test
+    period; mu/S for all folds come from one rolling pass over the
+    returns (src.rolling_moments). The out-of-sample periods are stitched
+    into one equity curve by rebalance_backtest, with holdings drifting
+    inside a fold and costs charged on the turnover at each refit.
+
+    Returns:
+    dict: rebalance_backtest outputs for the out-of-sample period, plus
+          fold_weights (one row per fold start date) and metrics
+    """
+
+    returns = returns.dropna()
+
+    splits = walk_forward_splits(
+        len(returns), train_window, test_window, expanding
+    )
+
+    if not splits:
+        raise ValueError("Not enough observations for a single fold")
+
+    mu, S = rolling_moments(
+        returns.to_numpy(),
+        [test_start for _, test_start, _ in splits],
+        window=None if expanding else train_window,
+        method=estimator,
+        span=span
+    )
+
+    assets = returns.columns
+
+    fold_moments = [
+        (
+            pd.Series(mu[i], index=assets),
+            pd.DataFrame(S[i], index=assets, columns=assets)
+        )
+        for i in range(len(splits))
+    ]
+
+    if max_workers == 1:
+
+        fold_weights = [
+            _optimize_fold(moments, risk_free_rate) for moments in fold_moments
+        ]
+
+    else:
+
+        n_workers = max_workers or os.cpu_count() or 1
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+
+            fold_weights = list(executor.map(
+                _optimize_fold,
+                fold_moments,
+                repeat(risk_free_rate),
+                chunksize=max(1, len(fold_moments) // (4 * n_workers))
+            ))
+
+    fold_weights = pd.DataFrame(
+        fold_weights,
+        index=returns.index[[test_start for _, test_start, _ in splits]]
+    ).reindex(columns=returns.columns).fillna(0.0)
+
+    out_of_sample = returns.iloc[splits[0][1]:]
+
+    results = rebalance_backtest(
+        out_of_sample,
+        fold_weights,
+        rebalance=None,
+        transaction_cost=transaction_cost
+    )
+
+    results["fold_weights"] = fold_weights
+
+    results["metrics"] = performance_metrics(
+        results["strategy_cumulative"].to_numpy(),
+        names=["Walk-Forward"]
+    )
+
+    return results
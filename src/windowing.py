@@ -0,0 +1,94 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class RollingWindow:
+    """
+    Preallocated rolling window over the latest `window_size` values
+
+    Each value is written twice into a buffer of length 2 * window_size,
+    so the current window is always a contiguous slice of the buffer and
+    can be returned as a view. Pushing a value costs O(1) per series
+    instead of reallocating and copying the whole window.
+
+    initial = array of shape (window_size,) or (n_series, window_size)
+    """
+
+    def __init__(self, initial, dtype=np.float32):
+
+        initial = np.asarray(initial, dtype=dtype)
+
+        # A (window_size, 1) column would read as window_size series of
+        # length 1; callers flatten it first
+        if initial.ndim not in (1, 2) or (initial.ndim == 2 and initial.shape[-1] == 1):
+            raise ValueError(
+                "initial must have shape (window_size,) or "
+                f"(n_series, window_size), got {initial.shape}"
+            )
+
+        self.window_size = initial.shape[-1]
+
+        self._buffer = np.concatenate([initial, initial], axis=-1)
+
+        self._start = 0
+
+    @property
+    def values(self):
+        """
+        Read-only view of the current window, oldest value first
+        """
+
+        view = self._buffer[
+            ..., self._start:self._start + self.window_size
+        ]
+        view.flags.writeable = False
+
+        return view
+
+    def push(self, value):
+        """
+        Drop the oldest value and append `value` (scalar or one per series)
+        """
+
+        start = self._start
+
+        self._buffer[..., start] = value
+        self._buffer[..., start + self.window_size] = value
+
+        self._start = (start + 1) % self.window_size
+
+
+def sliding_windows(data, window_size):
+    """
+    Read-only view of every window that has a next-step target
+
+    data = array of shape (n,) or (n, n_features)
+
+    Returns an array of shape (n - window_size, window_size, ...) that
+    shares memory with `data`; window i covers data[i:i + window_size].
+    """
+
+    data = np.asarray(data)
+
+    windows = sliding_window_view(data, window_size, axis=0)[:-1]
+
+    # sliding_window_view appends the window axis last
+    return np.moveaxis(windows, -1, 1)
+
+
+def iter_window_batches(data, window_size, batch_size=1024):
+    """
+    Yield (X, y) batches of windows and next-step targets
+
+    Batches are views into `data`, so the full 3D window array is never
+    materialised.
+    """
+
+    data = np.asarray(data)
+
+    X = sliding_windows(data, window_size)
+    y = data[window_size:]
+
+    for start in range(0, len(X), batch_size):
+
+        yield X[start:start + batch_size], y[start:start + batch_size]
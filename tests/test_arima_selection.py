@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from src import arima_selection
+from src.arima_selection import select_arima_order
+
+
+def test_select_arima_order_ranks_and_prunes():
+
+    np.random.seed(0)
+
+    series = pd.Series(100 + np.random.randn(200).cumsum())
+
+    best, results = select_arima_order(
+        series,
+        p_values=(0, 1),
+        d_values=(1,),
+        q_values=(0, 1),
+        test_size=10,
+        max_workers=1
+    )
+
+    assert best in [(0, 1, 0), (0, 1, 1), (1, 1, 0), (1, 1, 1)]
+    assert len(results) == 4
+    assert results.loc[0, "aic"] == results.loc[~results["pruned"], "aic"].min()
+    assert results.loc[~results["pruned"], "rmse"].notna().all()
+
+
+def test_select_arima_order_memoizes_fits(tmp_path, monkeypatch):
+
+    series = pd.Series(np.random.randn(150).cumsum())
+
+    cache_path = str(tmp_path / "arima_cache.json")
+
+    select_arima_order(
+        series,
+        p_values=(0, 1),
+        d_values=(1,),
+        q_values=(0,),
+        max_workers=1,
+        cache_path=cache_path
+    )
+
+    arima_selection._FIT_CACHE.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached fit was recomputed")
+
+    monkeypatch.setattr(arima_selection, "_fit_information_criteria", fail)
+
+    best, _ = select_arima_order(
+        series,
+        p_values=(0, 1),
+        d_values=(1,),
+        q_values=(0,),
+        max_workers=1,
+        cache_path=cache_path
+    )
+
+    assert best in [(0, 1, 0), (1, 1, 0)]
+
+
+def test_select_arima_order_skips_orders_behind_running_best(monkeypatch):
+
+    fitted = []
+
+    def fake_fit(values, order):
+        fitted.append(order)
+        p, d, q = order
+        return {
+            "aic": 100.0 + 50 * (p + q), "bic": 100.0, "converged": True,
+            "error": None
+        }
+
+    monkeypatch.setattr(arima_selection, "_fit_information_criteria", fake_fit)
+
+    series = pd.Series(np.arange(50.0) + 1.234)
+
+    best, results = select_arima_order(
+        series,
+        p_values=(0, 1, 2),
+        d_values=(1,),
+        q_values=(0, 1),
+        prune_delta=10.0,
+        max_workers=1
+    )
+
+    # Both p + q = 1 orders trail by 50, so nothing more complex is fitted
+    assert best == (0, 1, 0)
+    assert sorted(fitted) == [(0, 1, 0), (0, 1, 1), (1, 1, 0)]
+    assert len(results) == 6
+    assert results.loc[~results["fitted"], "pruned"].all()
+
+    fitted.clear()
+
+    select_arima_order(
+        series + 1.0,
+        p_values=(0, 1, 2),
+        d_values=(1,),
+        q_values=(0, 1),
+        prune_delta=np.inf,
+        max_workers=1
+    )
+
+    assert len(fitted) == 6
@@ -2,7 +2,12 @@ import numpy as np
 import pandas as pd
 import os
 
-from src.backtest import backtest
+from src.backtest import (
+    backtest,
+    batch_backtest,
+    rebalance_backtest,
+    _rebalance_kernel
+)
 
 
 def test_backtest_with_saving():
@@ -47,3 +52,171 @@ def test_backtest_full_pipeline():
 
     # Verify metrics exist
     assert "strategy_cumulative" in result
+
+
+def test_rebalance_backtest_tracks_drift_and_turnover():
+
+    dates = pd.bdate_range("2024-01-01", periods=130)
+
+    returns = pd.DataFrame(
+        np.random.normal(0.001, 0.02, (130, 3)),
+        index=dates,
+        columns=["A", "B", "C"]
+    )
+
+    weights = {"A": 0.5, "B": 0.3, "C": 0.2}
+
+    result = rebalance_backtest(returns, weights, rebalance="monthly")
+
+    rebalance_days = result["turnover"].index[result["turnover"] > 0]
+
+    # Initial allocation plus the first trading day of each later month
+    assert len(rebalance_days) == dates.to_period("M").nunique()
+    assert np.isclose(result["turnover"].iloc[0], 1.0)
+
+    # Holdings drift between rebalances
+    assert not np.allclose(result["weights"].iloc[5], result["weights"].iloc[0])
+
+    # Daily rebalancing without costs equals the static portfolio
+    daily = rebalance_backtest(
+        returns, weights, rebalance="daily", transaction_cost=0.0
+    )
+
+    static = returns.dot(np.array([0.5, 0.3, 0.2]))
+
+    assert np.allclose(daily["strategy_returns"], static)
+
+
+def test_rebalance_backtest_threshold_and_time_varying_weights():
+
+    dates = pd.bdate_range("2024-01-01", periods=60)
+
+    returns = pd.DataFrame(
+        np.random.normal(0.0, 0.03, (60, 2)),
+        index=dates,
+        columns=["A", "B"]
+    )
+
+    result = rebalance_backtest(
+        returns, {"A": 0.5, "B": 0.5}, rebalance=None, threshold=0.05
+    )
+
+    drift = (result["weights"] - 0.5).abs().max(axis=1)
+
+    # Any drift beyond the threshold is traded away before the day starts
+    assert (drift <= 0.05 + 1e-12).all()
+    assert 1 < (result["turnover"] > 0).sum() < 60
+
+    targets = pd.DataFrame(
+        {"A": [1.0, 0.0], "B": [0.0, 1.0]},
+        index=[dates[0], dates[30]]
+    )
+
+    switched = rebalance_backtest(returns, targets, rebalance=None)
+
+    assert switched["weights"].iloc[29]["A"] == 1.0
+    assert switched["weights"].iloc[30]["B"] == 1.0
+    assert switched["turnover"].iloc[30] == 2.0
+
+
+def test_rebalance_kernel_matches_numpy_fallback():
+
+    R = np.random.normal(0.0, 0.02, (200, 4))
+    targets = np.full((200, 4), 0.25)
+    scheduled = np.zeros(200, dtype=bool)
+    scheduled[::21] = True
+
+    args = (R, targets, scheduled, 0.05, 0.001, 0.1, 0.1, 0.5)
+
+    compiled = _rebalance_kernel(*args)
+
+    # Plain NumPy version of the same kernel (identity when numba is absent)
+    fallback = getattr(_rebalance_kernel, "py_func", _rebalance_kernel)(*args)
+
+    for a, b in zip(compiled, fallback):
+        assert np.allclose(a, b)
+
+
+def test_rebalance_backtest_stop_loss_and_derisking():
+
+    returns = pd.DataFrame(
+        {"A": [0.0, -0.2, 0.1, 0.1], "B": [0.0, 0.0, 0.0, 0.0]}
+    )
+
+    stopped = rebalance_backtest(
+        returns, {"A": 0.5, "B": 0.5}, rebalance=None, stop_loss=0.15
+    )
+
+    # A is sold after its 20% loss and stays out until the next rebalance
+    assert stopped["weights"]["A"].iloc[2] == 0.0
+    assert stopped["weights"]["A"].iloc[3] == 0.0
+    assert stopped["turnover"].iloc[2] > 0
+
+    derisked = rebalance_backtest(
+        returns,
+        {"A": 1.0, "B": 0.0},
+        rebalance=None,
+        drawdown_limit=0.1,
+        derisk_fraction=0.5
+    )
+
+    # Exposure is halved the day after the drawdown breaches 10%
+    assert np.isclose(derisked["weights"]["A"].iloc[2], 0.5)
+    assert np.isclose(derisked["turnover"].iloc[2], 0.5)
+
+
+def test_batch_backtest_matches_single_backtests():
+
+    returns = pd.DataFrame(
+        np.random.normal(0.0005, 0.01, (252, 3)),
+        columns=["A", "B", "C"]
+    )
+
+    W = np.random.dirichlet(np.ones(3), size=50)
+
+    batch = batch_backtest(returns, W)
+
+    assert batch["returns"].shape == (252, 50)
+    assert batch["metrics"].shape == (50, 5)
+
+    for k in (0, 49):
+
+        single = backtest(
+            returns,
+            dict(zip(returns.columns, W[k])),
+            save_results=False
+        )
+
+        values = single["strategy_cumulative"]
+
+        assert np.allclose(batch["cumulative"][:, k], values)
+
+        metrics = batch["metrics"].iloc[k]
+
+        assert np.isclose(metrics["Total Return"], values.iloc[-1] - 1)
+        assert np.isclose(
+            metrics["Annualized Volatility"],
+            values.pct_change().dropna().std() * np.sqrt(252)
+        )
+        assert np.isclose(
+            metrics["Max Drawdown"],
+            (values / values.cummax() - 1).min()
+        )
+
+
+def test_batch_backtest_accepts_named_weight_frame():
+
+    returns = pd.DataFrame(
+        np.random.normal(0.0005, 0.01, (100, 2)),
+        columns=["A", "B"]
+    )
+
+    weights = pd.DataFrame(
+        {"B": [0.0, 0.5], "A": [1.0, 0.5]},
+        index=["all_a", "balanced"]
+    )
+
+    batch = batch_backtest(returns, weights, transaction_cost=0.0)
+
+    assert list(batch["metrics"].index) == ["all_a", "balanced"]
+    assert np.allclose(batch["returns"][:, 0], returns["A"])
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt.efficient_frontier import EfficientFrontier
+
+from src.closed_form import (
+    ClosedFormFrontier,
+    active_set_qp,
+    fast_path_applies,
+    min_variance_weights,
+    tangency_weights
+)
+from src.portfolio import optimize_portfolio
+from src.risk_models import pca_factor_model
+
+
+def _problem(n, rng):
+
+    A = rng.normal(size=(n, n))
+
+    S = A @ A.T / n * 0.04 + np.eye(n) * 0.001
+    mu = rng.normal(0.06, 0.1, n)
+
+    assets = [f"A{i}" for i in range(n)]
+
+    return (
+        pd.Series(mu, index=assets),
+        pd.DataFrame(S, index=assets, columns=assets)
+    )
+
+
+def test_long_only_matches_pypfopt():
+
+    rng = np.random.default_rng(0)
+
+    for _ in range(40):
+
+        mu, S = _problem(int(rng.integers(2, 10)), rng)
+
+        def sharpe(w):
+            return (mu.to_numpy() @ w - 0.02) / np.sqrt(w @ S.to_numpy() @ w)
+
+        w = min_variance_weights(S.to_numpy())
+
+        ef = EfficientFrontier(mu, S)
+        ef.min_volatility()
+
+        assert w.min() >= 0 and np.isclose(w.sum(), 1.0)
+        assert np.allclose(w, list(ef.weights), atol=1e-4)
+
+        if (mu > 0.02).any():
+
+            w = tangency_weights(mu.to_numpy(), S.to_numpy(), 0.02)
+
+            ef = EfficientFrontier(mu, S)
+            ef.max_sharpe(risk_free_rate=0.02)
+
+            # pypfopt's OSQP solution may sit ~1e-6 outside the bounds
+            assert w.min() >= 0 and np.isclose(w.sum(), 1.0)
+            assert sharpe(w) >= sharpe(np.array(list(ef.weights))) - 1e-4
+
+
+def test_unconstrained_closed_form():
+
+    _, S = _problem(5, np.random.default_rng(1))
+
+    mu = pd.Series([0.12, 0.08, 0.05, 0.1, 0.03], index=S.index)
+
+    S_inv = np.linalg.inv(S.to_numpy())
+
+    w = min_variance_weights(S.to_numpy(), long_only=False)
+
+    assert np.allclose(w, S_inv.sum(axis=1) / S_inv.sum())
+
+    w = tangency_weights(mu.to_numpy(), S.to_numpy(), 0.02, long_only=False)
+
+    tangency = S_inv @ (mu.to_numpy() - 0.02)
+
+    assert np.allclose(w, tangency / tangency.sum())
+
+
+def test_active_set_kkt():
+
+    S = np.array([[0.04, 0.01, 0.0], [0.01, 0.09, 0.02], [0.0, 0.02, 0.01]])
+    a = np.array([0.2, -0.05, 0.01])
+
+    y = active_set_qp(S, a)
+
+    assert np.isclose(a @ y, 1.0)
+    assert (y >= 0).all()
+
+    # Free assets: S y = gamma a; fixed assets: (S y)_i >= gamma a_i
+    gradient = S @ y
+    free = y > 0
+    gamma = gradient[free][0] / a[free][0]
+
+    assert np.allclose(gradient[free], gamma * a[free])
+    assert (gradient[~free] >= gamma * a[~free] - 1e-12).all()
+
+    with pytest.raises(ValueError):
+        active_set_qp(S, -np.abs(a))
+
+
+def test_fast_path_selection():
+
+    mu, S = _problem(3, np.random.default_rng(2))
+
+    assert fast_path_applies(S, (0, 1), 3)
+    assert fast_path_applies(S, (None, None), 3)
+    assert not fast_path_applies(S, (-1, 1), 3)
+    assert not fast_path_applies(S, (0, 1), 100)
+    assert not fast_path_applies(np.zeros((3, 3)), (0, 1), 3)
+
+    returns = pd.DataFrame(np.random.default_rng(2).normal(0, 0.01, (200, 4)))
+
+    assert not fast_path_applies(pca_factor_model(returns, n_factors=2), (0, 1), 4)
+
+
+def test_optimize_portfolio_fast_path_matches_conic():
+
+    rng = np.random.default_rng(3)
+
+    returns = pd.DataFrame(
+        rng.normal([0.001, 0.0005, 0.0002], [0.03, 0.012, 0.004], (500, 3)),
+        columns=["TSLA", "SPY", "BND"]
+    )
+
+    fast = optimize_portfolio(returns)
+    conic = optimize_portfolio(returns, solver="conic")
+
+    assert np.allclose(list(fast.values()), list(conic.values()), atol=1e-4)
+
+
+def test_closed_form_frontier_falls_back_to_conic():
+
+    mu, S = _problem(3, np.random.default_rng(4))
+
+    # Singular covariance: the linear solves fail, the conic problem does not
+    singular = pd.DataFrame(np.ones((3, 3)) * 0.04, index=S.index, columns=S.columns)
+
+    frontier = ClosedFormFrontier(mu, singular)
+
+    weights = frontier.min_volatility()
+
+    assert np.isclose(sum(weights.values()), 1.0, atol=1e-4)
+
+
+def test_closed_form_frontier_aligns_mu_to_covariance():
+
+    mu = pd.Series([0.15, 0.05, 0.08], index=["A", "B", "C"])
+    S = pd.DataFrame(
+        np.diag([0.09, 0.01, 0.04]), index=["A", "B", "C"], columns=["A", "B", "C"]
+    )
+
+    aligned = ClosedFormFrontier(mu, S).max_sharpe()
+
+    assert ClosedFormFrontier(mu.iloc[::-1], S).max_sharpe() == aligned
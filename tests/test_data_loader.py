@@ -10,7 +10,10 @@ from src.data_loader import (
 )
 
 
-def test_load_data():
+def test_load_data(tmp_path, monkeypatch):
+
+    # Keep the fixture out of the real data/processed
+    monkeypatch.chdir(tmp_path)
 
     os.makedirs("data/processed", exist_ok=True)
 
@@ -27,6 +30,10 @@ def test_load_data():
     assert isinstance(loaded, pd.DataFrame)
     assert "TSLA" in loaded.columns
 
+    tsla_only = load_data(columns=["TSLA"])
+
+    assert list(tsla_only.columns) == ["TSLA"]
+
 
 def test_get_tsla_close():
 
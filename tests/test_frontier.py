@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import expected_returns
+from pypfopt.efficient_frontier import EfficientFrontier
+from pypfopt.risk_models import sample_cov
+
+from src.frontier import ParametricFrontier
+
+
+def _inputs(n=8, seed=1):
+
+    rng = np.random.default_rng(seed)
+
+    returns = pd.DataFrame(
+        rng.normal(0.0006, 0.012, (400, n)) + rng.normal(0, 0.006, (400, 1)),
+        columns=[f"A{i}" for i in range(n)]
+    )
+
+    return (
+        expected_returns.mean_historical_return(returns, returns_data=True),
+        sample_cov(returns, returns_data=True)
+    )
+
+
+def _sharpe(w, mu, S, rf=0.02):
+    return (mu.to_numpy() @ w - rf) / np.sqrt(w @ S.to_numpy() @ w)
+
+
+def test_max_sharpe_and_min_volatility_match_pypfopt():
+
+    mu, S = _inputs()
+
+    frontier = ParametricFrontier(mu, S)
+
+    frontier.max_sharpe(risk_free_rate=0.02)
+
+    ef = EfficientFrontier(mu, S)
+    ef.max_sharpe(risk_free_rate=0.02)
+
+    assert np.isclose(
+        _sharpe(frontier.weights, mu, S),
+        _sharpe(np.array(list(ef.weights)), mu, S),
+        atol=1e-6
+    )
+
+    # Same problem object, re-solved for the other objective
+    frontier.min_volatility()
+
+    ef = EfficientFrontier(mu, S)
+    ef.min_volatility()
+
+    assert np.allclose(frontier.weights, ef.weights, atol=1e-4)
+
+
+def test_frontier_sweep():
+
+    mu, S = _inputs()
+
+    frontier = ParametricFrontier(mu, S)
+
+    result = frontier.frontier(n_points=20)
+
+    assert result["weights"].shape == (20, 8)
+    assert np.allclose(result["weights"].sum(axis=1), 1.0)
+    assert (result["weights"].to_numpy() > -1e-6).all()
+
+    # Return rises and risk rises along the efficient frontier
+    assert np.all(np.diff(result["returns"]) > 0)
+    assert np.all(np.diff(result["volatility"]) > -1e-9)
+
+    # Points agree with pypfopt's efficient_return
+    target = result["returns"][10]
+
+    ef = EfficientFrontier(mu, S)
+    ef.efficient_return(target)
+
+    assert np.isclose(
+        result["volatility"][10], ef.portfolio_performance()[1], rtol=1e-5
+    )
+
+
+def test_max_sharpe_requires_excess_return():
+
+    mu, S = _inputs()
+
+    frontier = ParametricFrontier(mu, S)
+
+    with pytest.raises(ValueError, match="risk-free rate"):
+        frontier.max_sharpe(risk_free_rate=10.0)
+
+
+def test_weight_bounds_with_shorting():
+
+    mu, S = _inputs()
+
+    frontier = ParametricFrontier(mu, S, weight_bounds=(-1, 1))
+
+    weights = frontier.min_volatility()
+
+    assert np.isclose(sum(weights.values()), 1.0, atol=1e-4)
+
+    # Unconstrained-by-sign min variance: S^-1 1 / 1' S^-1 1
+    inv = np.linalg.solve(S.to_numpy(), np.ones(8))
+
+    assert np.allclose(frontier.weights, inv / inv.sum(), atol=1e-4)
+
+
+def test_expected_returns_aligned_to_covariance():
+
+    mu, S = _inputs()
+
+    aligned = ParametricFrontier(mu, S).max_sharpe()
+
+    # Same data, mu listed in a different order than S
+    shuffled = ParametricFrontier(mu.iloc[::-1], S).max_sharpe()
+
+    assert shuffled == aligned
+
+    with pytest.raises(ValueError, match="different assets"):
+        ParametricFrontier(mu.drop("A0"), S)
+
+    with pytest.raises(ValueError, match="different assets"):
+        ParametricFrontier(mu.rename({"A0": "B0"}), S)
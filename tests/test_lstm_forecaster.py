@@ -46,3 +46,103 @@ def test_bootstrap_lstm_forecast():
 
     assert len(forecast_df) == 5
     assert "forecast" in forecast_df.columns
+
+
+def test_bootstrap_lstm_forecast_column_input():
+
+    inputs = []
+
+    def predict(x, verbose=0):
+        inputs.append(x.ravel().copy())
+        return np.array([[0.5]])
+
+    mock_model = MagicMock()
+    mock_model.predict.side_effect = predict
+
+    # MinMaxScaler.fit_transform returns a (n, 1) column
+    scaled_data = np.random.rand(100).reshape(-1, 1)
+
+    class DummyScaler:
+        def inverse_transform(self, x):
+            return x
+
+    with patch(
+        "src.lstm_forecaster.load_model",
+        return_value=mock_model
+    ):
+
+        bootstrap_lstm_forecast(
+            model_path="dummy",
+            scaled_data=scaled_data,
+            scaler=DummyScaler(),
+            steps=3,
+            window_size=10,
+            n_simulations=1,
+            noise_std=0.0
+        )
+
+    tail = scaled_data[-10:, 0].astype(np.float32)
+
+    assert np.array_equal(inputs[0], tail)
+    assert np.array_equal(inputs[1], np.append(tail[1:], np.float32(0.5)))
+
+
+def test_bootstrap_lstm_forecast_batched():
+
+    calls = []
+
+    def fake_model(x, training=False):
+        calls.append(tuple(x.shape))
+        return x[:, -1, :] * 0.5
+
+    scaled_data = np.random.rand(100)
+
+    class DummyScaler:
+        def inverse_transform(self, x):
+            return x
+
+    with patch(
+        "src.lstm_forecaster.load_model",
+        return_value=fake_model
+    ):
+
+        forecast_a = bootstrap_lstm_forecast(
+            model_path="dummy",
+            scaled_data=scaled_data,
+            scaler=DummyScaler(),
+            steps=5,
+            window_size=10,
+            n_simulations=50,
+            batched=True,
+            random_state=42
+        )
+
+        forecast_b = bootstrap_lstm_forecast(
+            model_path="dummy",
+            scaled_data=scaled_data,
+            scaler=DummyScaler(),
+            steps=5,
+            window_size=10,
+            n_simulations=50,
+            batched=True,
+            random_state=42
+        )
+
+        # A (n, 1) column, as returned by MinMaxScaler.fit_transform
+        forecast_column = bootstrap_lstm_forecast(
+            model_path="dummy",
+            scaled_data=scaled_data.reshape(-1, 1),
+            scaler=DummyScaler(),
+            steps=5,
+            window_size=10,
+            n_simulations=50,
+            batched=True,
+            random_state=42
+        )
+
+    # Every simulation is advanced in a single batch
+    assert calls[0] == (50, 10, 1)
+    assert len(forecast_a) == 5
+    assert (forecast_a["lower_bound"] <= forecast_a["upper_bound"]).all()
+    assert np.allclose(forecast_a.values, forecast_b.values)
+    assert np.allclose(forecast_a.values, forecast_column.values)
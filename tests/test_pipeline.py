@@ -0,0 +1,251 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.pipeline import ArtifactCache, Pipeline, Stage, code_digest
+
+
+class Recorder:
+    """Stage actions that append to their output files and log each call"""
+
+    def __init__(self, base):
+        self.base = base
+        self.calls = []
+
+    def path(self, name):
+        return os.path.join(self.base, name)
+
+    def action(self, name, inputs, outputs, transform=str.upper):
+
+        def run():
+            self.calls.append(name)
+            text = "".join(open(self.path(i)).read() for i in inputs)
+            for output in outputs:
+                with open(self.path(output), "w") as f:
+                    f.write(transform(text) or name)
+
+        return run
+
+    def stage(self, name, inputs, outputs, **kwargs):
+        return Stage(
+            name,
+            self.action(name, inputs, outputs, **kwargs),
+            inputs=[self.path(i) for i in inputs],
+            outputs=[self.path(o) for o in outputs]
+        )
+
+
+def _pipeline(tmp_path, recorder):
+
+    stages = [
+        recorder.stage("prices", ["raw.txt"], ["prices.txt"]),
+        recorder.stage("returns", ["prices.txt"], ["returns.txt"]),
+        recorder.stage("weights", ["config.txt"], ["weights.txt"]),
+        recorder.stage("backtest", ["returns.txt", "weights.txt"], ["backtest.txt"])
+    ]
+
+    return Pipeline(stages, cache_dir=str(tmp_path / "cache"))
+
+
+def test_pipeline_skips_up_to_date_stages(tmp_path):
+
+    recorder = Recorder(str(tmp_path))
+
+    (tmp_path / "raw.txt").write_text("abc")
+    (tmp_path / "config.txt").write_text("w")
+
+    status = _pipeline(tmp_path, recorder).run()
+
+    assert set(status.values()) == {"ran"}
+    assert recorder.calls.index("backtest") == 3
+
+    recorder.calls.clear()
+
+    status = _pipeline(tmp_path, recorder).run()
+
+    assert set(status.values()) == {"cached"}
+    assert recorder.calls == []
+
+    # Only the stages downstream of the changed input rerun
+    (tmp_path / "raw.txt").write_text("abd")
+
+    status = _pipeline(tmp_path, recorder).run()
+
+    assert status == {
+        "prices": "ran", "returns": "ran", "weights": "cached", "backtest": "ran"
+    }
+
+    assert (tmp_path / "backtest.txt").read_text() == "ABDW"
+
+
+def test_pipeline_early_cutoff_on_identical_outputs(tmp_path):
+
+    recorder = Recorder(str(tmp_path))
+
+    stages = [
+        recorder.stage("clean", ["raw.txt"], ["clean.txt"], transform=str.strip),
+        recorder.stage("report", ["clean.txt"], ["report.txt"])
+    ]
+
+    (tmp_path / "raw.txt").write_text("abc")
+
+    Pipeline(stages, cache_dir=str(tmp_path / "cache")).run()
+
+    # Changed input, but the cleaned output is byte-identical
+    (tmp_path / "raw.txt").write_text("abc  ")
+
+    status = Pipeline(stages, cache_dir=str(tmp_path / "cache")).run()
+
+    assert status == {"clean": "ran", "report": "cached"}
+
+
+def test_pipeline_restores_outputs_from_cache(tmp_path):
+
+    recorder = Recorder(str(tmp_path))
+
+    (tmp_path / "raw.txt").write_text("abc")
+    (tmp_path / "config.txt").write_text("w")
+
+    _pipeline(tmp_path, recorder).run()
+
+    (tmp_path / "returns.txt").unlink()
+
+    recorder.calls.clear()
+
+    status = _pipeline(tmp_path, recorder).run(targets=["returns"])
+
+    assert status == {"prices": "cached", "returns": "restored"}
+    assert recorder.calls == []
+    assert (tmp_path / "returns.txt").read_text() == "ABC"
+
+    # Returning to earlier inputs reuses the earlier outputs
+    (tmp_path / "raw.txt").write_text("xyz")
+    _pipeline(tmp_path, recorder).run()
+
+    (tmp_path / "raw.txt").write_text("abc")
+    recorder.calls.clear()
+
+    status = _pipeline(tmp_path, recorder).run()
+
+    assert recorder.calls == []
+    assert status["backtest"] == "restored"
+    assert (tmp_path / "backtest.txt").read_text() == "ABCW"
+
+
+def test_pipeline_runs_independent_stages_concurrently(tmp_path):
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch(name):
+
+        def run():
+            barrier.wait()
+            (tmp_path / name).write_text(name)
+
+        return run
+
+    stages = [
+        Stage("a", branch("a.txt"), outputs=[str(tmp_path / "a.txt")]),
+        Stage("b", branch("b.txt"), outputs=[str(tmp_path / "b.txt")])
+    ]
+
+    status = Pipeline(stages, cache_dir=str(tmp_path / "cache")).run(max_workers=2)
+
+    assert status == {"a": "ran", "b": "ran"}
+
+
+def test_pipeline_failures_skip_downstream(tmp_path):
+
+    recorder = Recorder(str(tmp_path))
+
+    def fail():
+        time.sleep(0.01)
+        raise RuntimeError("download failed")
+
+    stages = [
+        Stage("prices", fail, outputs=[str(tmp_path / "prices.txt")]),
+        recorder.stage("returns", ["prices.txt"], ["returns.txt"]),
+        recorder.stage("weights", ["config.txt"], ["weights.txt"])
+    ]
+
+    (tmp_path / "config.txt").write_text("w")
+
+    pipeline = Pipeline(stages, cache_dir=str(tmp_path / "cache"))
+
+    status = pipeline.run()
+
+    assert status == {"prices": "failed", "returns": "skipped", "weights": "ran"}
+    assert isinstance(pipeline.errors["prices"], RuntimeError)
+
+
+def test_pipeline_force_dry_run_and_params(tmp_path):
+
+    recorder = Recorder(str(tmp_path))
+
+    (tmp_path / "raw.txt").write_text("abc")
+    (tmp_path / "config.txt").write_text("w")
+
+    _pipeline(tmp_path, recorder).run()
+
+    status = _pipeline(tmp_path, recorder).run(force=["returns"], dry_run=True)
+
+    assert status == {
+        "prices": "cached", "returns": "would run", "weights": "cached",
+        "backtest": "pending"
+    }
+
+    pipeline = _pipeline(tmp_path, recorder)
+    pipeline.stages["weights"].params = {"risk_free_rate": 0.03}
+
+    assert pipeline.run(dry_run=True)["weights"] == "would run"
+
+
+def test_pipeline_validates_graph(tmp_path):
+
+    def noop():
+        pass
+
+    with pytest.raises(ValueError, match="produced by both"):
+        Pipeline([
+            Stage("a", noop, outputs=["x"]),
+            Stage("b", noop, outputs=["x"])
+        ])
+
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([
+            Stage("a", noop, inputs=["y"], outputs=["x"]),
+            Stage("b", noop, inputs=["x"], outputs=["y"])
+        ])
+
+
+def test_artifact_cache_and_code_digest(tmp_path):
+
+    cache = ArtifactCache(str(tmp_path / "cache"))
+
+    path = tmp_path / "out.txt"
+    path.write_text("v1")
+
+    digest = cache.store(str(path))
+
+    path.write_text("v2")
+
+    assert cache.digest(str(path)) != digest
+
+    cache.restore(digest, str(path))
+
+    assert path.read_text() == "v1"
+
+    # A script's code hash covers the src modules it imports
+    assert code_digest("scripts/run_risk_metrics.py") != code_digest("src/risk_metrics.py")
+
+
+def test_repo_stages_form_a_dag():
+
+    from scripts.run_pipeline import STAGES
+
+    pipeline = Pipeline(STAGES)
+
+    assert pipeline.dependencies["backtest"] == {"data", "optimize_portfolio"}
+    assert pipeline.order.index("data") < pipeline.order.index("risk_metrics")
@@ -103,4 +103,19 @@ def test_optimize_portfolio_equal_fallback():
     
     # Should return some weights (equal weights fallback)
     assert len(weights) == 3
-    assert all(w > 0 for w in weights.values())
\ No newline at end of file
+    assert all(w > 0 for w in weights.values())
+
+
+def test_optimize_portfolio_requires_returns_or_both_moments():
+
+    mu = pd.Series([0.1, 0.05], index=["A", "B"])
+    S = pd.DataFrame(np.eye(2) * 0.04, index=["A", "B"], columns=["A", "B"])
+
+    with pytest.raises(ValueError, match="S is required"):
+        optimize_portfolio(mu=mu)
+
+    with pytest.raises(ValueError, match="mu is required"):
+        optimize_portfolio(S=S)
+
+    with pytest.raises(ValueError, match="returns"):
+        optimize_portfolio()
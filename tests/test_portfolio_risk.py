@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+from src.portfolio_risk import (
+    _cornish_fisher_z,
+    monte_carlo_returns,
+    portfolio_returns,
+    portfolio_var,
+    tail_quantiles
+)
+
+
+def _returns(n=3000):
+
+    rng = np.random.default_rng(0)
+
+    cov = np.array([[1, 0.5, 0.1], [0.5, 1, 0.2], [0.1, 0.2, 1]]) * np.outer(
+        [0.03, 0.012, 0.004], [0.03, 0.012, 0.004]
+    )
+
+    return pd.DataFrame(
+        rng.multivariate_normal([0.001, 0.0004, 0.0001], cov, n),
+        columns=["TSLA", "SPY", "BND"]
+    )
+
+
+WEIGHTS = {"TSLA": 0.2, "SPY": 0.5, "BND": 0.3}
+
+
+def test_tail_quantiles_match_numpy():
+
+    x = np.random.default_rng(1).normal(size=1001)
+
+    quantiles, tail_means = tail_quantiles(x, [0.05, 0.01, 0.5])
+
+    assert np.allclose(quantiles, np.quantile(x, [0.05, 0.01, 0.5]))
+
+    worst = np.sort(x)[:51]
+
+    assert np.isclose(tail_means[0], worst.mean())
+
+
+def test_parametric_and_historical():
+
+    returns = _returns()
+
+    result = portfolio_var(
+        returns, WEIGHTS, methods=("parametric", "historical")
+    )
+
+    daily = portfolio_returns(returns, WEIGHTS)
+
+    assert np.isclose(
+        result.loc["parametric", "VaR 95%"],
+        daily.mean() + norm.ppf(0.05) * daily.std()
+    )
+    assert np.isclose(
+        result.loc["historical", "VaR 95%"], daily.quantile(0.05)
+    )
+
+    for level in ("95%", "99%"):
+        assert (result[f"CVaR {level}"] <= result[f"VaR {level}"]).all()
+
+    assert (result["VaR 99%"] < result["VaR 95%"]).all()
+
+
+def test_cornish_fisher_reduces_to_normal():
+
+    z = norm.ppf([0.05, 0.01])
+
+    assert np.allclose(_cornish_fisher_z(z, 0.0, 0.0), z)
+
+    # Negative skew fattens the left tail
+    assert (_cornish_fisher_z(z, -1.0, 0.0) < z).all()
+
+
+def test_monte_carlo_matches_parametric_for_normal_returns():
+
+    result = portfolio_var(
+        _returns(),
+        WEIGHTS,
+        methods=("parametric", "monte_carlo"),
+        n_paths=200_000,
+        random_state=0
+    )
+
+    assert np.allclose(
+        result.loc["monte_carlo"], result.loc["parametric"], rtol=0.03
+    )
+
+
+def test_monte_carlo_batches_and_horizon():
+
+    mu = np.array([0.001, 0.0])
+    cov = np.array([[1e-4, 0.0], [0.0, 4e-4]])
+
+    simulated = monte_carlo_returns(
+        mu, cov, [0.5, 0.5], n_paths=50_001, horizon=5,
+        batch_size=7_000, random_state=3
+    )
+
+    assert simulated.shape == (50_001,)
+
+    # 5-day portfolio variance ~ 5 * w'Sw
+    assert np.isclose(simulated.var(), 5 * 1.25e-4, rtol=0.05)
+
+
+def test_monte_carlo_rank_deficient_covariance():
+
+    # Third asset is a copy of the first: singular, so Cholesky fails
+    base = np.array([[4e-4, 1e-4], [1e-4, 1e-4]])
+
+    cov = np.empty((3, 3))
+    cov[:2, :2] = base
+    cov[2, :2] = cov[:2, 2] = base[0]
+    cov[2, 2] = base[0, 0]
+
+    with pytest.raises(np.linalg.LinAlgError):
+        np.linalg.cholesky(cov)
+
+    w = np.array([0.3, 0.4, 0.3])
+
+    simulated = monte_carlo_returns(
+        np.zeros(3), cov, w, n_paths=100_000, random_state=4
+    )
+
+    assert np.isfinite(simulated).all()
+    assert np.isclose(simulated.var(), w @ cov @ w, rtol=0.03)
+
+
+def test_unknown_method():
+
+    with pytest.raises(ValueError):
+        portfolio_var(_returns(), WEIGHTS, methods=("garch",))
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.price_store import PriceStore
+
+
+class FixtureFetcher:
+    """Serves prices from a local frame and records every call"""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((list(tickers), start, end))
+        rows = (self.prices.index >= start) & (self.prices.index < end)
+        return self.prices.loc[rows, list(tickers)]
+
+
+def test_price_store_fetches_only_missing_dates(tmp_path):
+
+    dates = pd.bdate_range("2024-01-01", periods=40)
+
+    prices = pd.DataFrame(
+        100 + np.random.randn(40, 2).cumsum(axis=0),
+        index=dates,
+        columns=["TSLA", "SPY"]
+    )
+
+    fetcher = FixtureFetcher(prices)
+
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetcher=fetcher)
+
+    written = store.update(["TSLA", "SPY"], "2024-01-01", dates[20])
+
+    assert written == 40
+
+    written = store.update(["TSLA", "SPY"], "2024-01-01", "2024-12-31")
+
+    # Second run is a single batched call for the missing range only,
+    # starting at the last stored date to check its close is unchanged
+    assert written == 40
+    assert len(fetcher.calls) == 2
+    assert fetcher.calls[1][1] == dates[19].strftime("%Y-%m-%d")
+
+    assert store.update(["TSLA", "SPY"], "2024-01-01", dates[30]) == 0
+    assert len(fetcher.calls) == 2
+
+    loaded = store.load(["TSLA", "SPY"])
+
+    assert list(loaded.columns) == ["TSLA", "SPY"]
+    assert np.allclose(loaded.values, prices.values)
+    assert store.last_dates()["SPY"] == dates[-1]
+
+
+def _prices(n=40):
+
+    dates = pd.bdate_range("2024-01-01", periods=n)
+
+    return pd.DataFrame(
+        100 + np.random.randn(n, 2).cumsum(axis=0),
+        index=dates,
+        columns=["TSLA", "SPY"]
+    )
+
+
+def test_price_store_refetches_history_after_corporate_action(tmp_path):
+
+    prices = _prices()
+
+    fetcher = FixtureFetcher(prices)
+
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetcher=fetcher)
+
+    store.update(["TSLA", "SPY"], "2024-01-01", prices.index[20])
+
+    # A dividend on day 30 rescales every earlier adjusted TSLA close
+    adjusted = prices.copy()
+    adjusted.loc[adjusted.index < prices.index[30], "TSLA"] *= 0.98
+
+    fetcher.prices = adjusted
+
+    store.update(["TSLA", "SPY"], "2024-01-01", "2024-12-31")
+
+    loaded = store.load(["TSLA", "SPY"])
+
+    assert np.allclose(loaded.values, adjusted.values)
+
+    # TSLA was fetched again from its first stored date, SPY was not
+    assert fetcher.calls[-1][0] == ["TSLA"]
+    assert fetcher.calls[-1][1] == "2024-01-01"
+
+
+def test_price_store_backfills_earlier_start(tmp_path):
+
+    prices = _prices()
+
+    fetcher = FixtureFetcher(prices)
+
+    store = PriceStore(str(tmp_path / "prices.sqlite"), fetcher=fetcher)
+
+    end = prices.index[-1] + pd.Timedelta(days=1)
+
+    store.update(["TSLA", "SPY"], prices.index[10], end)
+
+    written = store.update(["TSLA", "SPY"], "2024-01-01", end)
+
+    assert written == 20
+    assert fetcher.calls[-1][2] == prices.index[10].strftime("%Y-%m-%d")
+    assert np.allclose(store.load(["TSLA", "SPY"]).values, prices.values)
+
+
+def test_price_store_warns_on_failed_ticker(tmp_path):
+
+    prices = _prices()
+
+    store = PriceStore(
+        str(tmp_path / "prices.sqlite"),
+        fetcher=lambda tickers, start, end: prices.loc[start:end, ["SPY"]]
+    )
+
+    with pytest.warns(RuntimeWarning, match="TSLA"):
+        written = store.update(["TSLA", "SPY"], "2024-01-01", "2024-03-01")
+
+    assert written == 40
+    assert list(store.last_dates()) == ["SPY"]
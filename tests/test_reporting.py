@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import backtest
+from src.reporting import BacktestReporter, render_cumulative_figure
+
+
+def test_background_reporter_writes_outputs(tmp_path):
+
+    returns = pd.DataFrame(
+        np.random.normal(0.001, 0.01, (100, 2)),
+        columns=["A", "B"]
+    )
+
+    reporter = BacktestReporter(
+        "background",
+        data_dir=str(tmp_path / "data"),
+        figure_dir=str(tmp_path / "figures")
+    )
+
+    result = backtest(
+        returns,
+        {"A": 0.5, "B": 0.5},
+        benchmark_weights={"A": 1.0, "B": 0.0},
+        reporter=reporter
+    )
+
+    reporter.close()
+
+    assert list(result["metrics"].index) == ["Strategy", "Benchmark"]
+    assert os.path.exists(tmp_path / "data" / "backtest_metrics.csv")
+    assert os.path.exists(tmp_path / "figures" / "backtest_cumulative.png")
+
+
+def test_figure_render_is_cached_on_input_hash(tmp_path):
+
+    curve = pd.Series(np.linspace(1.0, 1.2, 50))
+
+    path = str(tmp_path / "figure.png")
+
+    assert render_cumulative_figure({"Strategy": curve}, path)
+    assert not render_cumulative_figure({"Strategy": curve}, path)
+    assert render_cumulative_figure({"Strategy": curve * 1.01}, path)
+
+
+def test_backtest_without_saving_never_imports_matplotlib():
+
+    code = (
+        "import sys, numpy as np, pandas as pd\n"
+        "from src.backtest import backtest\n"
+        "r = pd.DataFrame(np.random.randn(50, 2) * 0.01, columns=['A', 'B'])\n"
+        "res = backtest(r, {'A': 0.5, 'B': 0.5}, save_results=False)\n"
+        "assert 'Sharpe Ratio' in res['metrics'].columns\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import block_bootstrap_indices, stationary_bootstrap_indices
+from src.resampling import resampled_optimize
+
+
+def _returns():
+
+    rng = np.random.default_rng(1)
+
+    return pd.DataFrame(
+        rng.normal([0.001, 0.0004, 0.0001], [0.03, 0.012, 0.004], (300, 3)),
+        columns=["TSLA", "SPY", "BND"]
+    )
+
+
+def test_block_bootstrap_indices():
+
+    indices = block_bootstrap_indices(100, 50, block_size=10, rng=0)
+
+    assert indices.shape == (50, 100)
+    assert indices.min() >= 0 and indices.max() < 100
+
+    # Rows within a block are consecutive
+    blocks = indices.reshape(50, 10, 10)
+
+    assert (np.diff(blocks, axis=2) == 1).all()
+
+    # Block longer than the series: one block, i.e. the original order
+    assert (block_bootstrap_indices(5, 2, block_size=10, rng=0) == np.arange(5)).all()
+
+    assert block_bootstrap_indices(100, 3, block_size=10, rng=0, length=35).shape == (3, 35)
+
+
+def test_stationary_bootstrap_indices():
+
+    indices = stationary_bootstrap_indices(50, 2000, block_size=10, rng=0, length=40)
+
+    assert indices.shape == (2000, 40)
+    assert indices.min() >= 0 and indices.max() < 50
+
+    # Blocks continue with the next row (wrapping) and restart with
+    # probability 1 / block_size
+    continues = np.diff(indices, axis=1) % 50 == 1
+
+    assert abs(1 - continues.mean() - 0.1) < 0.01
+
+
+def test_resampled_optimize_weights_and_intervals():
+
+    result = resampled_optimize(
+        _returns(), n_resamples=60, chunk_size=25, random_state=0, max_workers=1
+    )
+
+    assert np.isclose(result["weights"].sum(), 1.0)
+    assert result["samples"].shape == (60, 3)
+    assert (result["lower"] <= result["upper"]).all()
+    assert (result["lower"] >= 0).all() and (result["upper"] <= 1).all()
+
+    # Averaged weights are a mix of the resampled corner solutions
+    assert np.allclose(
+        result["weights"], result["samples"].mean() / result["samples"].mean().sum()
+    )
+
+
+def test_resampled_optimize_independent_of_workers():
+
+    serial = resampled_optimize(
+        _returns(), n_resamples=40, chunk_size=10, random_state=7, max_workers=1
+    )
+
+    parallel = resampled_optimize(
+        _returns(), n_resamples=40, chunk_size=10, random_state=7, max_workers=2
+    )
+
+    pd.testing.assert_frame_equal(serial["samples"], parallel["samples"])
@@ -1,6 +1,13 @@
+import json
+
 import pandas as pd
 import numpy as np
-from src.risk_metrics import compute_risk_metrics
+import pytest
+from src.risk_metrics import (
+    OnlineRiskMetrics,
+    compute_risk_metrics,
+    rolling_risk_metrics
+)
 
 def test_compute_risk_metrics_returns_dataframe():
 
@@ -26,3 +33,194 @@ def test_sharpe_ratio_calculation():
     metrics = compute_risk_metrics(returns)
 
     assert "TEST" in metrics.index
+
+
+def test_rolling_risk_metrics_match_window_snapshots():
+
+    rng = np.random.default_rng(0)
+
+    returns = pd.DataFrame(
+        rng.normal(0.0005, 0.02, (300, 2)),
+        index=pd.bdate_range("2020-01-01", periods=300),
+        columns=["A", "B"]
+    )
+
+    rolling = rolling_risk_metrics(returns, windows=(21, 126))
+
+    # Incomplete windows are NaN
+    assert rolling[21]["Volatility"].iloc[:20].isna().all().all()
+    assert rolling[126]["Volatility"].iloc[125:].notna().all().all()
+
+    for window, end in [(21, 20), (21, 250), (126, 299)]:
+
+        snapshot = compute_risk_metrics(returns.iloc[end - window + 1:end + 1])
+
+        for metric in snapshot.columns:
+            assert np.allclose(
+                rolling[window][metric].iloc[end], snapshot[metric]
+            )
+
+    pd.testing.assert_frame_equal(
+        rolling[21]["Volatility"],
+        returns.rolling(21).std() * np.sqrt(252),
+        check_names=False
+    )
+
+
+def test_rolling_drawdowns_brute_force():
+
+    rng = np.random.default_rng(1)
+
+    returns = pd.DataFrame(rng.normal(0, 0.03, (120, 1)), columns=["A"])
+
+    rolling = rolling_risk_metrics(returns, windows=(10,))
+
+    for end in range(9, 120):
+
+        window = returns["A"].iloc[end - 9:end + 1]
+
+        wealth = np.concatenate([[1.0], (1 + window).cumprod()])
+
+        drawdowns = wealth / np.maximum.accumulate(wealth) - 1
+
+        assert np.isclose(rolling[10]["Max Drawdown"]["A"].iloc[end], drawdowns.min())
+        assert np.isclose(rolling[10]["Drawdown"]["A"].iloc[end], drawdowns[-1])
+
+
+def test_max_drawdown_counts_first_day_loss():
+
+    returns = pd.DataFrame({"A": [-0.1, 0.05, 0.05]})
+
+    metrics = compute_risk_metrics(returns)
+
+    assert np.isclose(metrics.loc["A", "Max Drawdown"], -0.1)
+
+
+def test_short_samples_are_nan_not_errors():
+
+    # An all-NaN column has no observations; B has a single one
+    returns = pd.DataFrame({
+        "A": [np.nan, np.nan, np.nan],
+        "B": [np.nan, -0.02, np.nan],
+        "C": [0.01, -0.02, 0.03]
+    })
+
+    metrics = compute_risk_metrics(returns)
+
+    assert metrics.loc["A"].isna().all()
+
+    assert metrics.loc["B", ["Volatility", "Sharpe Ratio", "Sortino Ratio"]].isna().all()
+    assert np.isclose(metrics.loc["B", "Annual Return"], -0.02 * 252)
+    assert np.isclose(metrics.loc["B", "Max Drawdown"], -0.02)
+
+    assert metrics.loc["C"].notna().all()
+
+    empty = compute_risk_metrics(pd.DataFrame(columns=["A", "B"], dtype=float))
+
+    assert list(empty.index) == ["A", "B"]
+    assert empty.isna().all().all()
+
+
+def test_window_longer_than_sample_is_nan():
+
+    returns = pd.DataFrame(np.random.randn(30, 2) * 0.01, columns=["A", "B"])
+
+    rolling = rolling_risk_metrics(returns, windows=(21, 63))
+
+    assert rolling[63].isna().all().all()
+    assert rolling[21].iloc[-1].notna().all()
+
+
+def test_online_risk_metrics_match_batch():
+
+    rng = np.random.default_rng(2)
+
+    returns = pd.DataFrame(
+        rng.standard_t(4, (2000, 3)) * 0.01, columns=["A", "B", "C"]
+    )
+
+    online = OnlineRiskMetrics(returns.columns).update_many(returns)
+
+    streamed = online.metrics()
+    batch = compute_risk_metrics(returns)
+
+    assert list(streamed.columns) == list(batch.columns)
+
+    exact = batch.columns.drop("VaR 95%")
+
+    assert np.allclose(streamed[exact], batch[exact])
+
+    # P-squared sketch: close to the exact quantile, not equal
+    assert np.allclose(streamed["VaR 95%"], batch["VaR 95%"], rtol=0.1)
+
+
+def test_online_risk_metrics_round_trip():
+
+    rng = np.random.default_rng(3)
+
+    returns = pd.DataFrame(rng.normal(0, 0.01, (300, 2)), columns=["A", "B"])
+
+    uninterrupted = OnlineRiskMetrics(returns.columns).update_many(returns)
+
+    first = OnlineRiskMetrics(returns.columns).update_many(returns.iloc[:120])
+
+    state = json.loads(json.dumps(first.to_dict()))
+
+    resumed = OnlineRiskMetrics.from_dict(state).update_many(returns.iloc[120:])
+
+    pd.testing.assert_frame_equal(resumed.metrics(), uninterrupted.metrics())
+
+
+def test_online_risk_metrics_gaps_and_warmup():
+
+    online = OnlineRiskMetrics(["A", "B"])
+
+    online.update(pd.Series({"A": 0.01, "B": np.nan}))
+    online.update(pd.Series({"A": -0.02, "B": 0.03}))
+    online.update(pd.Series({"A": 0.005, "B": -0.01}))
+
+    assert list(online.count) == [3, 2]
+
+    metrics = online.metrics()
+
+    batch = compute_risk_metrics(
+        pd.DataFrame({"A": [0.01, -0.02, 0.005], "B": [np.nan, 0.03, -0.01]})
+    )
+
+    # Under five returns the quantile is exact
+    pd.testing.assert_frame_equal(metrics, batch)
+
+
+def test_online_var_exact_through_warmup():
+
+    online = OnlineRiskMetrics(["A"], warmup=30)
+
+    # Five returns: the P-squared markers are initialised, but VaR must
+    # still be the 5% quantile, not the middle marker (the median)
+    for r in [-0.05, -0.01, 0.0, 0.01, 0.05]:
+        online.update([r])
+
+    assert online.value_at_risk()[0] == pytest.approx(-0.042)
+
+    returns = np.random.default_rng(4).normal(0, 0.01, 40)
+
+    online = OnlineRiskMetrics(["A"], warmup=30)
+
+    for n, r in enumerate(returns, start=1):
+
+        online.update([r])
+
+        if n <= 30:
+            assert online.value_at_risk()[0] == pytest.approx(
+                np.quantile(returns[:n], 0.05)
+            )
+
+        # The sketch restarts from the warm-up sample, without a jump
+        if n == 31:
+            assert online.value_at_risk()[0] == pytest.approx(
+                np.quantile(returns[:n], 0.05), abs=2e-3
+            )
+
+    state = json.loads(json.dumps(online.to_dict(), allow_nan=False))
+
+    assert OnlineRiskMetrics.from_dict(state).warmup == 30
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import expected_returns
+from pypfopt.efficient_frontier import EfficientFrontier
+
+from src.frontier import ParametricFrontier
+from src.portfolio import optimize_portfolio
+from src.risk_models import (
+    FactorCovariance,
+    estimate_risk_model,
+    pca_factor_model
+)
+
+
+def _factor_returns(T=400, n=40, seed=0):
+
+    rng = np.random.default_rng(seed)
+
+    factors = rng.normal(0, 0.01, (T, 3))
+    loadings = rng.normal(0.5, 0.3, (n, 3))
+
+    return pd.DataFrame(
+        factors @ loadings.T + rng.normal(0, 0.01, (T, n)) + 0.0004,
+        columns=[f"A{i}" for i in range(n)]
+    )
+
+
+def test_dense_risk_models_are_symmetric_psd():
+
+    returns = _factor_returns()
+
+    for method in ("sample", "ledoit_wolf", "constant_correlation"):
+
+        S = estimate_risk_model(returns, method)
+
+        assert list(S.columns) == list(returns.columns)
+        assert np.allclose(S, S.T)
+        assert np.linalg.eigvalsh(S.to_numpy()).min() > -1e-10
+
+
+def test_pca_factor_model_structure():
+
+    returns = _factor_returns()
+
+    model = pca_factor_model(returns, n_factors=3)
+
+    assert isinstance(model, FactorCovariance)
+    assert model.loadings.shape == (40, 3)
+    assert (model.specific_var > 0).all()
+
+    # Diagonal reproduces the sample variances
+    assert np.allclose(
+        np.diag(model.to_dense()), returns.var() * 252, rtol=1e-6
+    )
+
+    w = np.full(40, 1 / 40)
+
+    assert np.isclose(
+        model.portfolio_variance(w), w @ model.to_dense().to_numpy() @ w
+    )
+
+
+def test_unknown_risk_model():
+
+    with pytest.raises(ValueError):
+        estimate_risk_model(_factor_returns(), "garch")
+
+
+def test_factor_frontier_matches_dense_optimum():
+
+    returns = _factor_returns()
+
+    model = pca_factor_model(returns, n_factors=3)
+    S = model.to_dense()
+    mu = expected_returns.mean_historical_return(returns, returns_data=True)
+
+    def sharpe(w):
+        return (mu.to_numpy() @ w - 0.02) / np.sqrt(w @ S.to_numpy() @ w)
+
+    factor = ParametricFrontier(mu, model)
+    factor.max_sharpe(risk_free_rate=0.02)
+
+    dense = EfficientFrontier(mu, S)
+    dense.max_sharpe(risk_free_rate=0.02)
+
+    assert np.isclose(factor.weights.sum(), 1.0)
+    assert sharpe(factor.weights) >= sharpe(np.array(list(dense.weights))) - 1e-4
+
+    factor.min_volatility()
+
+    dense = EfficientFrontier(mu, S)
+    dense.min_volatility()
+
+    assert np.isclose(
+        model.portfolio_variance(factor.weights),
+        model.portfolio_variance(np.array(list(dense.weights))),
+        rtol=1e-3
+    )
+
+
+def test_optimize_portfolio_risk_models():
+
+    returns = _factor_returns()
+
+    for method in ("ledoit_wolf", "constant_correlation", "pca"):
+
+        weights = optimize_portfolio(returns, risk_model=method)
+
+        assert list(weights) == list(returns.columns)
+        assert abs(sum(weights.values()) - 1) < 1e-3
+        assert min(weights.values()) >= 0
+
+
+def test_factor_model_falls_back_to_min_volatility():
+
+    returns = _factor_returns() - 0.01
+
+    with pytest.warns(UserWarning, match="minimum variance"):
+        weights = optimize_portfolio(returns, risk_model="pca", n_factors=3)
+
+    assert abs(sum(weights.values()) - 1) < 1e-3
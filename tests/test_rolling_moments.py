@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pypfopt import expected_returns
+from pypfopt.risk_models import sample_cov
+
+from src.portfolio import optimize_portfolio
+from src.rolling_moments import rolling_moments, rolling_mu_cov
+
+
+def _returns(n=300):
+
+    rng = np.random.default_rng(3)
+
+    return pd.DataFrame(
+        rng.normal(0.0005, 0.01, (n, 4)),
+        index=pd.bdate_range("2021-01-01", periods=n),
+        columns=["A", "B", "C", "D"]
+    )
+
+
+def test_rolling_matches_pypfopt():
+
+    returns = _returns()
+
+    ends = [60, 61, 150, 300]
+
+    mu, S = rolling_moments(returns.to_numpy(), ends, window=60)
+
+    for i, end in enumerate(ends):
+
+        window = returns.iloc[end - 60:end]
+
+        assert np.allclose(
+            mu[i],
+            expected_returns.mean_historical_return(window, returns_data=True)
+        )
+        assert np.allclose(S[i], sample_cov(window, returns_data=True))
+
+
+def test_expanding_and_unsorted_ends():
+
+    returns = _returns()
+
+    mu, S = rolling_moments(returns.to_numpy(), [200, 50], window=None)
+
+    assert np.allclose(S[0], returns.iloc[:200].cov() * 252)
+    assert np.allclose(S[1], returns.iloc[:50].cov() * 252)
+
+
+def test_ewma_matches_pandas():
+
+    returns = _returns()
+
+    mu, S = rolling_moments(returns.to_numpy(), [300], method="ewma", span=30)
+
+    assert np.allclose(
+        mu[0],
+        expected_returns.ema_historical_return(returns, returns_data=True, span=30)
+    )
+
+    ewm_cov = returns.ewm(span=30).cov(bias=True).loc[returns.index[-1]]
+
+    assert np.allclose(S[0], ewm_cov * 252)
+
+
+def test_rolling_mu_cov_excludes_rebalance_date():
+
+    returns = _returns()
+
+    date = returns.index[100]
+
+    mu, S = rolling_mu_cov(returns, [date], window=100)[date]
+
+    assert list(mu.index) == list(returns.columns)
+    assert np.allclose(S, returns.iloc[:100].cov() * 252)
+
+
+def test_invalid_arguments():
+
+    values = _returns().to_numpy()
+
+    with pytest.raises(ValueError):
+        rolling_moments(values, [1])
+
+    with pytest.raises(ValueError):
+        rolling_moments(values, [100], method="median")
+
+
+def test_optimize_portfolio_with_precomputed_moments():
+
+    returns = _returns()
+
+    mu = expected_returns.mean_historical_return(returns, returns_data=True)
+    S = sample_cov(returns, returns_data=True)
+
+    assert optimize_portfolio(returns) == optimize_portfolio(mu=mu, S=S)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bootstrap import stationary_bootstrap_indices
+from src.simulation import StreamingHistogram, simulate_portfolio
+
+
+def _returns(n=1000):
+
+    rng = np.random.default_rng(2)
+
+    return pd.DataFrame(
+        rng.normal([0.001, 0.0004, 0.0001], [0.03, 0.012, 0.004], (n, 3)),
+        columns=["TSLA", "SPY", "BND"]
+    )
+
+
+WEIGHTS = {"TSLA": 0.2, "SPY": 0.5, "BND": 0.3}
+
+
+def test_streaming_histogram_merge_and_quantiles():
+
+    x = np.random.default_rng(0).normal(size=20_000)
+
+    whole = StreamingHistogram(-3, 3, bins=2000).add(x)
+
+    merged = StreamingHistogram(-3, 3, bins=2000).add(x[:7000])
+    merged.merge(StreamingHistogram(-3, 3, bins=2000).add(x[7000:]))
+
+    assert (whole.counts == merged.counts).all()
+    assert merged.count == len(x)
+
+    levels = [0.01, 0.05, 0.5, 0.95, 0.99]
+
+    assert np.allclose(whole.quantile(levels), np.quantile(x, levels), atol=0.01)
+
+    assert whole.quantile(0.0) == x.min()
+    assert whole.quantile(1.0) == x.max()
+
+    assert whole.cdf(0.0) == pytest.approx((x < 0).mean(), abs=1e-3)
+
+
+def test_simulate_portfolio_matches_exact_quantiles():
+
+    returns = _returns()
+
+    result = simulate_portfolio(
+        returns, WEIGHTS, n_paths=2000, horizon=63, chunk_size=500,
+        max_workers=1, random_state=3
+    )
+
+    # Rebuild the same paths in full
+    daily = np.log1p(returns.to_numpy() @ np.array([0.2, 0.5, 0.3]))
+
+    terminal, drawdown = [], []
+
+    for seed in np.random.SeedSequence(3).spawn(4):
+
+        indices = stationary_bootstrap_indices(
+            len(daily), 500, 21, np.random.default_rng(seed), length=63
+        )
+
+        paths = np.cumsum(daily[indices], axis=1)
+        peaks = np.maximum(np.maximum.accumulate(paths, axis=1), 0.0)
+
+        terminal.append(np.exp(paths[:, -1]))
+        drawdown.append(np.expm1((paths - peaks).min(axis=1)))
+
+    terminal = np.concatenate(terminal)
+    drawdown = np.concatenate(drawdown)
+
+    levels = result["terminal_wealth"].index
+
+    assert np.allclose(result["terminal_wealth"], np.quantile(terminal, levels), atol=2e-3)
+    assert np.allclose(result["max_drawdown"], np.quantile(drawdown, levels), atol=2e-3)
+
+    summary = result["summary"]
+
+    assert summary["Paths"] == 2000
+    assert summary["Probability of Loss"] == pytest.approx((terminal < 1).mean(), abs=2e-3)
+    assert (drawdown <= 0).all() and (drawdown > -1).all()
+
+
+def test_simulate_portfolio_independent_of_workers():
+
+    kwargs = dict(
+        n_paths=1200, horizon=21, method="block", block_size=5,
+        chunk_size=300, random_state=7
+    )
+
+    serial = simulate_portfolio(_returns(), WEIGHTS, max_workers=1, **kwargs)
+    parallel = simulate_portfolio(_returns(), WEIGHTS, max_workers=2, **kwargs)
+
+    for key in serial:
+        pd.testing.assert_series_equal(serial[key], parallel[key])
+
+
+def test_simulate_portfolio_unknown_method():
+
+    with pytest.raises(ValueError):
+        simulate_portfolio(_returns(), WEIGHTS, method="iid")
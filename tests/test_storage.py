@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.storage import dataset_path, load_frame, save_frame
+
+
+def test_save_frame_parquet_roundtrip_is_typed(tmp_path):
+
+    df = pd.DataFrame(
+        {"TSLA": [100, 101, 102], "SPY": [400.0, 401.0, 402.0]},
+        index=["2024-01-01", "2024-01-02", "2024-01-03"]
+    )
+
+    save_frame(df, "prices", base_dir=str(tmp_path))
+
+    loaded = load_frame("prices", base_dir=str(tmp_path))
+
+    assert isinstance(loaded.index, pd.DatetimeIndex)
+    assert (loaded.dtypes == np.float64).all()
+
+    projected = load_frame("prices", columns=["TSLA"], base_dir=str(tmp_path))
+
+    assert list(projected.columns) == ["TSLA"]
+
+
+def test_load_frame_csv_fallback_and_export(tmp_path):
+
+    df = pd.DataFrame(
+        {"TSLA": [1.0, 2.0], "BND": [3.0, 4.0]},
+        index=pd.to_datetime(["2024-01-01", "2024-01-02"])
+    )
+
+    save_frame(df, "returns", base_dir=str(tmp_path), fmt="csv")
+
+    assert not os.path.exists(dataset_path("returns", "parquet", str(tmp_path)))
+
+    loaded = load_frame("returns", columns=["BND"], base_dir=str(tmp_path))
+
+    assert list(loaded.columns) == ["BND"]
+    assert isinstance(loaded.index, pd.DatetimeIndex)
+
+    save_frame(df, "both", base_dir=str(tmp_path), csv_export=True)
+
+    assert os.path.exists(dataset_path("both", "csv", str(tmp_path)))
+    assert os.path.exists(dataset_path("both", "parquet", str(tmp_path)))
+
+
+def test_load_frame_prefers_parquet_over_newer_csv(tmp_path):
+
+    df = pd.DataFrame(
+        {"TSLA": [1.0, 2.0]},
+        index=pd.to_datetime(["2024-01-02", "2024-01-03"])
+    )
+
+    save_frame(df, "prices", base_dir=str(tmp_path))
+
+    # A stale CSV written later must not shadow the Parquet dataset
+    pd.DataFrame({"TSLA": [9.0]}).to_csv(dataset_path("prices", "csv", str(tmp_path)))
+
+    loaded = load_frame("prices", base_dir=str(tmp_path))
+
+    assert loaded["TSLA"].tolist() == [1.0, 2.0]
@@ -1,11 +1,16 @@
 import numpy as np
 import pandas as pd
 import os
+from statsmodels.tsa.arima.model import ARIMA
 
 from src.arima_forecaster import (
     train_arima,
-    forecast_arima_with_intervals
+    load_arima,
+    update_arima,
+    forecast_arima_with_intervals,
+    FAN_LEVELS
 )
+from src.train_arima import save_arima
 
 
 def test_arima_forecast_with_intervals():
@@ -18,3 +23,61 @@ def test_arima_forecast_with_intervals():
 
     assert "forecast" in forecast_df.columns
     assert len(forecast_df) == 5
+
+
+def test_update_arima_rolls_forward_without_refit(tmp_path):
+
+    series = pd.Series(100 + np.random.randn(305).cumsum())
+
+    model = train_arima(series.iloc[:300])
+
+    path = str(tmp_path / "arima_model.pkl")
+
+    save_arima(model, path)
+
+    updated = update_arima(load_arima(path), series, refit_every=None)
+
+    full = ARIMA(series, order=(5, 1, 0)).filter(model.params)
+
+    assert updated.nobs == 305
+    assert np.allclose(updated.params, model.params)
+    assert np.allclose(updated.forecast(5), full.forecast(5))
+
+
+def test_update_arima_refits_on_cadence():
+
+    series = pd.Series(100 + np.random.randn(310).cumsum())
+
+    model = train_arima(series.iloc[:300])
+
+    rolled = update_arima(model, series.iloc[:305], refit_every=10)
+
+    assert rolled.estimated_nobs == 300
+
+    refit = update_arima(rolled, series, refit_every=10)
+
+    assert refit.estimated_nobs == 310
+    assert not np.allclose(refit.params, model.params)
+
+
+def test_forecast_fan_matches_conf_int():
+
+    series = pd.Series(100 + np.random.randn(300).cumsum())
+
+    model = train_arima(series)
+
+    fan = forecast_arima_with_intervals(
+        model, steps=10, levels=FAN_LEVELS
+    )
+
+    for level in FAN_LEVELS:
+
+        conf_int = model.get_forecast(steps=10).conf_int(alpha=1 - level)
+
+        pct = f"{level * 100:g}"
+
+        assert np.allclose(fan[f"lower_{pct}"], conf_int.iloc[:, 0])
+        assert np.allclose(fan[f"upper_{pct}"], conf_int.iloc[:, 1])
+
+    assert np.allclose(fan["lower_bound"], fan["lower_95"])
+    assert (fan["upper_99"] >= fan["upper_50"]).all()
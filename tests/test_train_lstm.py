@@ -1,7 +1,12 @@
 import numpy as np
 import pandas as pd
 
-from src.train_lstm import prepare_data, build_model
+from src.train_lstm import (
+    prepare_data,
+    prepare_data_batches,
+    prepare_dataset,
+    build_model
+)
 
 
 def test_lstm_training_step():
@@ -17,3 +22,42 @@ def test_lstm_training_step():
     pred = model.predict(X[:5])
 
     assert pred.shape[0] == 5
+
+
+def test_prepare_data_batches_matches_prepare_data():
+
+    series = pd.Series(np.random.randn(300))
+
+    X, y, _ = prepare_data(series, window=10)
+
+    batches, _ = prepare_data_batches(series, window=10, batch_size=64)
+
+    X_batched = np.concatenate([X_b for X_b, _ in batches])
+
+    assert X.shape == (290, 10, 1)
+    assert y.shape == (290, 1)
+    assert np.array_equal(X, X_batched)
+
+
+def test_prepare_dataset_matches_prepare_data():
+
+    series = pd.Series(np.random.randn(300))
+
+    X, y, _ = prepare_data(series, window=10)
+
+    dataset, _ = prepare_dataset(series, window=10, batch_size=64)
+
+    X_ds = np.concatenate([X_b.numpy() for X_b, _ in dataset])
+    y_ds = np.concatenate([y_b.numpy() for _, y_b in dataset])
+
+    assert X_ds.shape == X.shape
+    assert np.allclose(X_ds, X)
+    assert np.allclose(y_ds, y)
+
+    shuffled, _ = prepare_dataset(
+        series, window=10, batch_size=64, shuffle_buffer=32, seed=1
+    )
+
+    model = build_model()
+
+    model.fit(shuffled, epochs=1, verbose=0)
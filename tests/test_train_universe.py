@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.train_universe import load_registry, train_universe
+
+
+def test_train_universe_parallel_registry(tmp_path):
+
+    prices = pd.DataFrame(
+        100 + np.random.randn(200, 2).cumsum(axis=0),
+        columns=["AAA", "BBB"]
+    )
+
+    results = train_universe(
+        prices,
+        output_dir=str(tmp_path),
+        max_workers=2,
+        models=("arima",)
+    )
+
+    registry = load_registry(str(tmp_path))
+
+    assert set(registry) == {"AAA", "BBB"}
+    assert all(entry["status"] == "ok" for entry in results.values())
+    assert os.path.exists(registry["AAA"]["arima"])
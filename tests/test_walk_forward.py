@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from src.walk_forward import walk_forward_backtest, walk_forward_splits
+
+
+def _returns(n=160):
+
+    rng = np.random.default_rng(0)
+
+    return pd.DataFrame(
+        rng.normal([0.001, 0.0005, 0.0002], 0.01, (n, 3)),
+        index=pd.bdate_range("2020-01-01", periods=n),
+        columns=["A", "B", "C"]
+    )
+
+
+def test_walk_forward_splits():
+
+    rolling = walk_forward_splits(100, train_window=60, test_window=15)
+
+    assert rolling == [(0, 60, 75), (15, 75, 90), (30, 90, 100)]
+
+    expanding = walk_forward_splits(
+        100, train_window=60, test_window=15, expanding=True
+    )
+
+    assert [start for start, _, _ in expanding] == [0, 0, 0]
+
+    assert walk_forward_splits(50, train_window=60) == []
+
+
+def test_walk_forward_backtest_out_of_sample():
+
+    returns = _returns()
+
+    result = walk_forward_backtest(
+        returns, train_window=100, test_window=20, max_workers=1
+    )
+
+    # Only the test periods are traded
+    assert result["strategy_returns"].index[0] == returns.index[100]
+    assert len(result["strategy_returns"]) == 60
+
+    fold_weights = result["fold_weights"]
+
+    assert list(fold_weights.index) == list(returns.index[[100, 120, 140]])
+    assert np.allclose(fold_weights.sum(axis=1), 1.0)
+
+    # Each refit date trades into that fold's weights
+    for date, row in fold_weights.iterrows():
+        assert np.allclose(result["weights"].loc[date], row)
+
+    assert result["metrics"].index[0] == "Walk-Forward"
+
+
+def test_walk_forward_parallel_matches_serial():
+
+    returns = _returns()
+
+    serial = walk_forward_backtest(
+        returns, train_window=100, test_window=20, max_workers=1
+    )
+
+    parallel = walk_forward_backtest(
+        returns, train_window=100, test_window=20, max_workers=2
+    )
+
+    pd.testing.assert_frame_equal(serial["fold_weights"], parallel["fold_weights"])
+    pd.testing.assert_series_equal(
+        serial["strategy_cumulative"], parallel["strategy_cumulative"]
+    )
+
+
+def test_walk_forward_ewma_estimator():
+
+    result = walk_forward_backtest(
+        _returns(), train_window=100, test_window=20,
+        estimator="ewma", span=60, max_workers=1
+    )
+
+    assert np.allclose(result["fold_weights"].sum(axis=1), 1.0)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.windowing import (
+    RollingWindow,
+    iter_window_batches,
+    sliding_windows
+)
+
+
+def test_rolling_window_matches_append():
+
+    data = np.random.rand(10)
+
+    window = RollingWindow(data[-4:], dtype=np.float64)
+    reference = data[-4:].copy()
+
+    for value in np.random.rand(11):
+
+        window.push(value)
+        reference = np.append(reference[1:], value)
+
+        assert np.array_equal(window.values, reference)
+
+
+def test_rolling_window_batched_view():
+
+    window = RollingWindow(np.zeros((3, 5)))
+
+    window.push(np.array([1.0, 2.0, 3.0]))
+
+    values = window.values
+
+    assert values.shape == (3, 5)
+    assert np.array_equal(values[:, -1], [1.0, 2.0, 3.0])
+    assert np.shares_memory(values, window._buffer)
+    assert not values.flags.writeable
+
+
+def test_rolling_window_rejects_column_input():
+
+    with pytest.raises(ValueError):
+        RollingWindow(np.zeros((5, 1)))
+
+
+def test_sliding_windows_is_read_only_view():
+
+    data = np.arange(20, dtype=float).reshape(-1, 1)
+
+    X = sliding_windows(data, 5)
+
+    assert X.shape == (15, 5, 1)
+    assert np.array_equal(X[3, :, 0], data[3:8, 0])
+    assert np.shares_memory(X, data)
+    assert not X.flags.writeable
+
+
+def test_iter_window_batches_covers_all_windows():
+
+    data = np.arange(50, dtype=float)
+
+    batches = list(iter_window_batches(data, 10, batch_size=16))
+
+    X = np.concatenate([X for X, _ in batches])
+    y = np.concatenate([y for _, y in batches])
+
+    assert [len(X) for X, _ in batches] == [16, 16, 8]
+    assert np.array_equal(X, sliding_windows(data, 10))
+    assert np.array_equal(y, data[10:])